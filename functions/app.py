@@ -8,11 +8,12 @@ from util.logging import configure_logging
 configure_logging(logging.INFO)
 
 # Function to be called from main.py
-def process_plan(plan, param_full):
+def process_plan(plan, param_full, as_of=None, price_list=None):
     container = Container.get_instance()
-    container.initialize()
-    estimator = container.get('estimator')
-    return estimator.process_plan(plan, param_full)
+    # The catalog loads in the background while the plan is decoded and processed
+    container.initialize(background=True)
+    estimator = container.get_estimator(price_list)
+    return estimator.process_plan(plan, param_full, as_of)
 
 # Command-line interface
 def main():
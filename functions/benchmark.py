@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+import resource
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from model.cost_engine import NumpyCostEngine, PythonCostEngine, has_numpy
+from model.usage import UsageCollector
+from service.pricing import PricingService
+from service.sku_catalog import compile_catalog, load_catalog
+
+def generate_catalog(sku_count, seed=42):
+    """Generate a synthetic catalog shaped like sku.json"""
+    rnd = random.Random(seed)
+    skus = []
+    for _ in range(sku_count):
+        sku_id = "dn2" + "".join(rnd.choices(string.ascii_lowercase + string.digits, k=17))
+        skus.append({
+            "id": sku_id,
+            "name": f"Synthetic SKU {sku_id}",
+            "pricingUnit": "core*hour",
+            "pricingVersions": [
+                {
+                    "effectiveTime": f"202{year}-01-01T00:00:00Z",
+                    "pricingExpressions": [{"rates": [{"unitPrice": f"{rnd.uniform(0.1, 10):.4f}"}]}]
+                }
+                for year in range(3)
+            ]
+        })
+    return {"skus": skus}
+
+def linear_lookup(prices_data, sku_id):
+    """Lookup as done before the SKU index existed"""
+    for sku in prices_data['skus']:
+        if sku['id'] == sku_id:
+            latest_pricing_version = max(sku['pricingVersions'], key=lambda x: x['effectiveTime'])
+            return float(latest_pricing_version['pricingExpressions'][0]['rates'][0]['unitPrice'])
+    return 0
+
+def bench_pricing_index(args):
+    """Compare indexed lookups against the linear scan"""
+    catalog = generate_catalog(args.skus)
+    rnd = random.Random(1)
+    lookups = [rnd.choice(catalog["skus"])["id"] for _ in range(args.lookups)]
+
+    started = time.perf_counter()
+    service = PricingService(catalog)
+    build_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for sku_id in lookups:
+        service.get_latest_price(sku_id)
+        service.get_sku_name(sku_id)
+        service.get_sku_unit(sku_id)
+    indexed_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for sku_id in lookups:
+        linear_lookup(catalog, sku_id)
+    linear_time = time.perf_counter() - started
+
+    print(f"SKUs: {args.skus}, lookups: {args.lookups}")
+    print(f"  Index build:      {build_time * 1000:.2f} ms")
+    print(f"  Indexed lookups:  {indexed_time * 1000:.2f} ms (3 calls per lookup)")
+    print(f"  Linear lookups:   {linear_time * 1000:.2f} ms (price only)")
+
+def peak_rss_kb():
+    """Peak RSS of this process in KiB"""
+    # ru_maxrss survives execve on Linux and would report the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def measure_catalog_load(args):
+    """Load a catalog in this process and print load time and peak RSS as JSON"""
+    started = time.perf_counter()
+    if args.path:
+        service = PricingService(load_catalog(args.path))
+    load_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if args.path:
+        for sku_id in args.lookup:
+            service.get_latest_price(sku_id)
+    lookup_time = time.perf_counter() - started
+
+    print(json.dumps({
+        "load_ms": load_time * 1000,
+        "lookup_ms": lookup_time * 1000,
+        "max_rss_kb": peak_rss_kb()
+    }))
+
+def _run_catalog_load(path, lookups):
+    command = [sys.executable, os.path.abspath(__file__), "_catalog-load"]
+    if path:
+        command += ["--path", path]
+    for sku_id in lookups:
+        command += ["--lookup", sku_id]
+    output = subprocess.run(command, check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(output.stdout.splitlines()[-1])
+
+def bench_catalog_load(args):
+    """Compare cold load of sku.json against the memory-mapped snapshot"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sku_path = args.sku
+        if sku_path is None:
+            sku_path = os.path.join(tmp, "sku.json")
+            with open(sku_path, "w") as f:
+                json.dump(generate_catalog(args.skus), f, indent=4)
+        with open(sku_path) as f:
+            catalog = json.load(f)
+        bin_path = os.path.join(tmp, "sku.bin")
+        compile_catalog(catalog, bin_path)
+
+        rnd = random.Random(1)
+        lookups = [rnd.choice(catalog["skus"])["id"] for _ in range(args.lookups)]
+        del catalog
+
+        baseline = _run_catalog_load(None, [])
+        print(f"Catalog: {sku_path} ({os.path.getsize(sku_path) / 1024:.0f} KiB JSON, {os.path.getsize(bin_path) / 1024:.0f} KiB compiled)")
+        print(f"  Interpreter baseline RSS: {baseline['max_rss_kb'] / 1024:.1f} MiB")
+        for label, path in (("JSON", sku_path), ("mmap", bin_path)):
+            result = _run_catalog_load(path, lookups)
+            rss_delta = (result["max_rss_kb"] - baseline["max_rss_kb"]) / 1024
+            print(f"  {label}: load {result['load_ms']:.2f} ms, {len(lookups)} lookups {result['lookup_ms']:.2f} ms, "
+                  f"peak RSS +{rss_delta:.1f} MiB")
+
+def bench_cost_engine(args):
+    """Compare the pure Python and the NumPy cost engines"""
+    catalog = generate_catalog(args.skus)
+    service = PricingService(catalog)
+    sku_ids = [sku["id"] for sku in catalog["skus"]]
+    rnd = random.Random(1)
+
+    for rows in args.rows:
+        collector = UsageCollector(service)
+        for row in range(rows):
+            collector.add_usage(rnd.choice(sku_ids), rnd.randint(1, 64), f"resource-{row // 5}", "yandex_compute_instance")
+        store = collector.usage
+        used_sku_ids, sku_indices, amounts = store.skus.values, store.sku_ids, store.amounts
+        # Group by resource the way the former per-call aggregation did
+        keys = {}
+        group_ids = array("q", (keys.setdefault(key, len(keys)) for key in zip(sku_indices, store.resource_name_ids, store.resource_type_ids)))
+
+        engines = [("python", PythonCostEngine(service))]
+        if has_numpy():
+            engines.append(("numpy", NumpyCostEngine(service)))
+
+        print(f"Usage rows: {rows}, groups: {len(keys)}")
+        timings = {}
+        for name, engine in engines:
+            started = time.perf_counter()
+            engine.sku_costs(used_sku_ids, sku_indices, amounts)
+            total_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            engine.group_costs(used_sku_ids, sku_indices, amounts, group_ids, len(keys))
+            group_time = time.perf_counter() - started
+            timings[name] = total_time + group_time
+            print(f"  {name:<7} totals {total_time * 1000:9.2f} ms, group-by {group_time * 1000:9.2f} ms")
+
+        if "numpy" in timings:
+            print(f"  speedup {timings['python'] / timings['numpy']:.1f}x")
+        else:
+            print("  NumPy is not installed, vectorized engine skipped")
+
+        started = time.perf_counter()
+        collector.get_usage()
+        collector.calculate_total()
+        print(f"  collector summary + total {(time.perf_counter() - started) * 1000:.2f} ms (running aggregate)")
+
+def generate_plan(resource_count):
+    """Generate a plan with compute instances and disks, no two with the same values"""
+    resources = []
+    for number in range(resource_count):
+        resources.append({
+            "type": "yandex_compute_instance",
+            "name": f"vm-{number}",
+            "values": {
+                "platform_id": "standard-v3",
+                "resources": [{"cores": 2 + number % 4 * 2, "memory": 4 + number % 8, "core_fraction": 100, "gpus": 0}],
+                "network_interface": [{"nat": number % 2 == 0}],
+                "boot_disk": [{"initialize_params": [{"size": 20 + number, "type": "network-ssd"}]}],
+                "labels": {f"label-{label}": "x" * 32 for label in range(20)}
+            }
+        })
+        resources.append({"type": "yandex_compute_disk", "name": f"disk-{number}", "values": {"size": 100 + number, "type": "network-hdd"}})
+    return {"planned_values": {"root_module": {"resources": resources}}}
+
+def measure_cold_start(args):
+    """Import the handler and run one request in this process, print the latency as JSON"""
+    started = time.perf_counter()
+    import main as handler_module
+    with open(args.plan) as f:
+        body = f.read()
+    response = handler_module.handler({"body": body, "queryStringParameters": {}}, None)
+    total_ms = (time.perf_counter() - started) * 1000
+    from util import cold_start
+    print(json.dumps({"status": response["statusCode"], "total_ms": total_ms, "stages": cold_start.stages()}))
+
+def bench_cold_start(args):
+    """Compare cold invocations with the catalog loaded up front and in the background"""
+    from processor import referenced_sku_ids
+    from util.cold_start import BUDGET_MS
+
+    functions_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = generate_catalog(args.skus)
+        template = catalog["skus"][0]
+        catalog["skus"] += [dict(template, id=sku_id) for sku_id in sorted(referenced_sku_ids())]
+        with open(os.path.join(tmp, "sku.json"), "w") as f:
+            json.dump(catalog, f, indent=4)
+        with open(os.path.join(functions_dir, "mdb.json")) as src, open(os.path.join(tmp, "mdb.json"), "w") as dst:
+            dst.write(src.read())
+        plan_path = os.path.join(tmp, "plan.json")
+        with open(plan_path, "w") as f:
+            json.dump(generate_plan(args.resources), f)
+
+        print(f"Catalog: {len(catalog['skus'])} SKUs, plan: {os.path.getsize(plan_path) / 1024:.0f} KiB, {args.runs} runs each")
+        medians = {}
+        over_budget = []
+        for label, background in (("sequential", "0"), ("background", "1")):
+            env = dict(os.environ, PYTHONPATH=functions_dir, CATALOG_BACKGROUND_LOAD=background)
+            timings = []
+            stage_timings = {stage: [] for stage in BUDGET_MS}
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "_cold-start", "--plan", plan_path],
+                    check=True, capture_output=True, text=True, cwd=tmp, env=env
+                )
+                result = json.loads(output.stdout.splitlines()[-1])
+                timings.append(result["total_ms"])
+                for stage, elapsed_ms in result["stages"].items():
+                    stage_timings.setdefault(stage, []).append(elapsed_ms)
+            medians[label] = sorted(timings)[len(timings) // 2]
+            print(f"  {label:<10} median {medians[label]:.1f} ms (min {min(timings):.1f} ms)")
+            for stage, budget in BUDGET_MS.items():
+                if stage_timings[stage]:
+                    median = sorted(stage_timings[stage])[len(stage_timings[stage]) // 2]
+                    print(f"    {stage:<15} median {median:.1f} ms, budget {budget} ms{'  OVER BUDGET' if median > budget else ''}")
+                    if median > budget:
+                        over_budget.append(f"{label} {stage}")
+        print(f"  latency drop {medians['sequential'] - medians['background']:.1f} ms")
+    if over_budget:
+        print(f"Over the cold start budget: {', '.join(over_budget)}")
+        return 1
+
+def bench_parallel(args):
+    """Plan processing time of the serial path and of worker pools of growing size"""
+    from core.estimator import TerraformCostEstimator
+    from processor import referenced_sku_ids
+    from service.resource_spec import ResourceSpecService
+
+    catalog = generate_catalog(1)
+    template = catalog["skus"][0]
+    catalog["skus"] = [dict(template, id=sku_id) for sku_id in sorted(referenced_sku_ids())]
+    functions_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(functions_dir, "mdb.json")) as f:
+        resource_spec_service = ResourceSpecService(json.load(f))
+    # Without the usage cache, every run of every path processes all resources
+    estimator = TerraformCostEstimator(PricingService(catalog), resource_spec_service, cache_size=0)
+    plan = generate_plan(args.resources // 2)
+
+    print(f"Plan: {len(plan['planned_values']['root_module']['resources'])} resources, {os.cpu_count()} CPUs, best of {args.runs} runs")
+    serial_result = None
+    for workers in [0] + args.workers:
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            result = estimator.process_plan(plan, True, workers=workers)
+            timings.append(time.perf_counter() - started)
+        if serial_result is None:
+            serial_result, serial_time = result, min(timings)
+        label = "serial" if workers == 0 else f"{workers} workers"
+        same = "identical" if result == serial_result else "DIFFERENT"
+        print(f"  {label:<10} {min(timings) * 1000:8.1f} ms  speedup {serial_time / min(timings):.2f}x  {same}")
+
+def bench_logging(args):
+    """Plan processing time with records written directly and through a queue, at INFO level"""
+    import logging
+    import logging.handlers
+    import queue
+    from core.estimator import TerraformCostEstimator
+    from processor import referenced_sku_ids
+    from service.resource_spec import ResourceSpecService
+
+    catalog = generate_catalog(1)
+    template = catalog["skus"][0]
+    catalog["skus"] = [dict(template, id=sku_id) for sku_id in sorted(referenced_sku_ids())]
+    functions_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(functions_dir, "mdb.json")) as f:
+        resource_spec_service = ResourceSpecService(json.load(f))
+    # The usage cache would skip processors on repeated runs
+    estimator = TerraformCostEstimator(PricingService(catalog), resource_spec_service, cache_size=0)
+    plan = generate_plan(args.resources // 2)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    # Drop the stderr handler the first logging call installed, only the measured handler writes
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    print(f"Plan: {len(plan['planned_values']['root_module']['resources'])} resources, best of {args.runs} runs")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("direct", "queue"):
+            path = os.path.join(tmp, f"{mode}.log")
+            with open(path, "w") as stream:
+                handler = logging.StreamHandler(stream)
+                handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+                listener = None
+                if mode == "queue":
+                    records = queue.SimpleQueue()
+                    listener = logging.handlers.QueueListener(records, handler)
+                    listener.start()
+                    handler = logging.handlers.QueueHandler(records)
+                root.addHandler(handler)
+                timings = []
+                for _ in range(args.runs):
+                    started = time.perf_counter()
+                    estimator.process_plan(plan, True)
+                    timings.append(time.perf_counter() - started)
+                root.removeHandler(handler)
+                if listener is not None:
+                    listener.stop()
+            with open(path) as f:
+                lines = sum(1 for _ in f)
+            print(f"  {mode:<7} {min(timings) * 1000:8.1f} ms  {lines // args.runs} lines per plan")
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pricing_index = subparsers.add_parser("pricing-index", help="SKU index build and lookup time")
+    pricing_index.add_argument("--skus", type=int, default=5000, help="Number of SKUs in the catalog")
+    pricing_index.add_argument("--lookups", type=int, default=6000, help="Number of lookups")
+    pricing_index.set_defaults(func=bench_pricing_index)
+
+    catalog_load = subparsers.add_parser("catalog-load", help="Cold load time and RSS of JSON vs compiled catalog")
+    catalog_load.add_argument("--sku", help="Path to sku.json (synthetic catalog if omitted)")
+    catalog_load.add_argument("--skus", type=int, default=5000, help="Number of SKUs in the synthetic catalog")
+    catalog_load.add_argument("--lookups", type=int, default=200, help="Number of lookups after load")
+    catalog_load.set_defaults(func=bench_catalog_load)
+
+    cost_engine = subparsers.add_parser("cost-engine", help="Pure Python vs NumPy cost engine")
+    cost_engine.add_argument("--rows", type=int, nargs="+", default=[10000, 1000000], help="Numbers of usage rows")
+    cost_engine.add_argument("--skus", type=int, default=300, help="Number of distinct SKUs")
+    cost_engine.set_defaults(func=bench_cost_engine)
+
+    cold_start = subparsers.add_parser("cold-start", help="Cold invocation latency with and without background catalog loading")
+    cold_start.add_argument("--skus", type=int, default=5000, help="Number of SKUs in the synthetic catalog")
+    cold_start.add_argument("--resources", type=int, default=500, help="Number of instances in the plan")
+    cold_start.add_argument("--runs", type=int, default=7, help="Cold invocations per mode")
+    cold_start.set_defaults(func=bench_cold_start)
+
+    parallel = subparsers.add_parser("parallel", help="Plan processing time with a growing number of worker processes")
+    parallel.add_argument("--resources", type=int, default=40000, help="Number of resources in the plan")
+    parallel.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8], help="Worker pool sizes")
+    parallel.add_argument("--runs", type=int, default=3, help="Runs per pool size")
+    parallel.set_defaults(func=bench_parallel)
+
+    logging_bench = subparsers.add_parser("logging", help="Plan processing time with direct and queued log output")
+    logging_bench.add_argument("--resources", type=int, default=10000, help="Number of resources in the plan")
+    logging_bench.add_argument("--runs", type=int, default=3, help="Runs per mode")
+    logging_bench.set_defaults(func=bench_logging)
+
+    cold_start_child = subparsers.add_parser("_cold-start")
+    cold_start_child.add_argument("--plan")
+    cold_start_child.set_defaults(func=measure_cold_start)
+
+    # Child process of catalog-load, keeps each measurement in a fresh interpreter
+    catalog_load_child = subparsers.add_parser("_catalog-load")
+    catalog_load_child.add_argument("--path")
+    catalog_load_child.add_argument("--lookup", action="append", default=[])
+    catalog_load_child.set_defaults(func=measure_catalog_load)
+
+    args = parser.parse_args()
+    # A non-zero status marks a benchmark that missed its budget
+    sys.exit(args.func(args))
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import json
 import argparse
 import logging
 from core.container import Container
+from service.pricing import parse_timestamp
 from util.logging import configure_logging
 import sys
 
@@ -14,13 +15,29 @@ class Colors:
     BLUE = '\033[94m'
     BOLD = '\033[1m'
 
+def resource_label(item):
+    """Resource name prefixed with the address of its module"""
+    return f"{item['module']}.{item['resource_name']}" if item.get('module') else item['resource_name']
+
 def process_plan_command():
     """Command-line interface for processing Terraform plans"""
     parser = argparse.ArgumentParser(description="Process a Terraform plan JSON file")
     parser.add_argument("json_file", help="Path to the JSON file")
     parser.add_argument("--full", action="store_true", help="Include detailed usage breakdown")
     parser.add_argument("--no-color", action="store_true", help="Disable colored output")
+    parser.add_argument("--price-list", help="Name of the price list to use (price_lists/<name>.bin or .json), the default one if omitted")
+    parser.add_argument("--as-of", help="Use prices effective at this ISO 8601 time (e.g. 2025-06-01T00:00:00Z), now by default")
+    parser.add_argument("--usage-cache", help="File keeping processed resource usage between runs, resources unchanged since are not processed again")
+    parser.add_argument("--workers", type=int, help="Process large plans in this many worker processes (ESTIMATOR_WORKERS by default)")
+    parser.add_argument("--profile", nargs="?", const="estimate-profile", metavar="PREFIX",
+                        help="Profile the estimate, write PREFIX.pstats and PREFIX.folded (collapsed stacks) and log time per processor and pricing call")
     args = parser.parse_args()
+    
+    if args.as_of:
+        try:
+            parse_timestamp(args.as_of)
+        except ValueError:
+            parser.error(f"--as-of: invalid ISO 8601 timestamp '{args.as_of}'")
 
     # Initialize logging
     configure_logging(logging.INFO)
@@ -35,24 +52,41 @@ def process_plan_command():
     
     # Get container and services
     container = Container.get_instance()
-    container.initialize()
-    estimator = container.get('estimator')
+    # The catalog loads in the background while the plan is decoded and processed
+    container.initialize(background=True)
+    try:
+        estimator = container.get_estimator(args.price_list)
+    except (ValueError, FileNotFoundError) as e:
+        parser.error(f"--price-list: {e}")
     
     try:
         with open(args.json_file, 'r') as f:
             data = json.load(f)
-            result = estimator.process_plan(data, args.full)
+            if args.usage_cache and estimator.usage_cache is not None:
+                estimator.usage_cache.load(args.usage_cache)
+            if args.profile:
+                from util.profiling import profile_plan
+                result = profile_plan(estimator, args.profile, data, args.full, args.as_of)
+            else:
+                result = estimator.process_plan(data, args.full, args.as_of, workers=args.workers)
+            if args.usage_cache and estimator.usage_cache is not None:
+                estimator.usage_cache.save(args.usage_cache)
             
             # Print cost comparison
             print("\n=== TERRAFORM COST ESTIMATION ===\n")
             
+            currency = result['currency']
+            
+            if "as_of" in result:
+                print(f"Prices as of {result['as_of']}\n")
+            
             print("CURRENT INFRASTRUCTURE:")
-            print(f"  Hourly:  {result['current']['hourly']} RUB")
-            print(f"  Monthly: {result['current']['monthly']} RUB")
+            print(f"  Hourly:  {result['current']['hourly']} {currency}")
+            print(f"  Monthly: {result['current']['monthly']} {currency}")
             
             print("\nPLANNED INFRASTRUCTURE:")
-            print(f"  Hourly:  {result['planned']['hourly']} RUB")
-            print(f"  Monthly: {result['planned']['monthly']} RUB")
+            print(f"  Hourly:  {result['planned']['hourly']} {currency}")
+            print(f"  Monthly: {result['planned']['monthly']} {currency}")
             
             # Format difference with sign
             diff_hourly = result['difference']['hourly']
@@ -64,8 +98,8 @@ def process_plan_command():
                 sign = ""
             
             print("\nDIFFERENCE:")
-            print(f"  Hourly:  {sign}{diff_hourly} RUB")
-            print(f"  Monthly: {sign}{diff_monthly} RUB")
+            print(f"  Hourly:  {sign}{diff_hourly} {currency}")
+            print(f"  Monthly: {sign}{diff_monthly} {currency}")
             print(f"  Change:  {sign}{diff_percentage}%")
             
             # Print usage details if requested
@@ -73,12 +107,12 @@ def process_plan_command():
                 # Create lookup dictionaries for current and planned usage
                 current_usage_dict = {}
                 for item in result['current_usage']:
-                    key = (item['resource_name'], item['resource_type'], item.get('sku_id', ''))
+                    key = (item.get('module', ''), item['resource_name'], item['resource_type'], item.get('sku_id', ''))
                     current_usage_dict[key] = item
                 
                 planned_usage_dict = {}
                 for item in result['planned_usage']:
-                    key = (item['resource_name'], item['resource_type'], item.get('sku_id', ''))
+                    key = (item.get('module', ''), item['resource_name'], item['resource_type'], item.get('sku_id', ''))
                     planned_usage_dict[key] = item
                 
                 # Find common keys (resources that exist in both current and planned)
@@ -88,12 +122,12 @@ def process_plan_command():
                 print("\n=== CURRENT USAGE DETAILS ===\n")
                 if has_tabulate:
                     # Use tabulate for formatted output
-                    headers = ["Resource", "Type", "Amount", "Unit", "SKU Name", "Cost (RUB/hour)"]
+                    headers = ["Resource", "Type", "Amount", "Unit", "SKU Name", f"Cost ({currency}/hour)"]
                     current_table = []
                     for item in result['current_usage']:
-                        key = (item['resource_name'], item['resource_type'], item.get('sku_id', ''))
+                        key = (item.get('module', ''), item['resource_name'], item['resource_type'], item.get('sku_id', ''))
                         row = [
-                            item['resource_name'],
+                            resource_label(item),
                             item['resource_type'],
                             item['amount'],
                             item['unit'],
@@ -113,8 +147,8 @@ def process_plan_command():
                 else:
                     # Fallback to simple formatting
                     for item in result['current_usage']:
-                        key = (item['resource_name'], item['resource_type'], item.get('sku_id', ''))
-                        line = f"{item['resource_name']} ({item['resource_type']}): {item['amount']} {item['unit']} of {item['sku_name']} = {item['cost']:.2f} RUB/hour"
+                        key = (item.get('module', ''), item['resource_name'], item['resource_type'], item.get('sku_id', ''))
+                        line = f"{resource_label(item)} ({item['resource_type']}): {item['amount']} {item['unit']} of {item['sku_name']} = {item['cost']:.2f} {currency}/hour"
                         
                         # Highlight if this resource exists in both and has changed
                         if key in common_keys and not args.no_color:
@@ -130,9 +164,9 @@ def process_plan_command():
                     # Use tabulate for formatted output
                     planned_table = []
                     for item in result['planned_usage']:
-                        key = (item['resource_name'], item['resource_type'], item.get('sku_id', ''))
+                        key = (item.get('module', ''), item['resource_name'], item['resource_type'], item.get('sku_id', ''))
                         row = [
-                            item['resource_name'],
+                            resource_label(item),
                             item['resource_type'],
                             item['amount'],
                             item['unit'],
@@ -152,8 +186,8 @@ def process_plan_command():
                 else:
                     # Fallback to simple formatting
                     for item in result['planned_usage']:
-                        key = (item['resource_name'], item['resource_type'], item.get('sku_id', ''))
-                        line = f"{item['resource_name']} ({item['resource_type']}): {item['amount']} {item['unit']} of {item['sku_name']} = {item['cost']:.2f} RUB/hour"
+                        key = (item.get('module', ''), item['resource_name'], item['resource_type'], item.get('sku_id', ''))
+                        line = f"{resource_label(item)} ({item['resource_type']}): {item['amount']} {item['unit']} of {item['sku_name']} = {item['cost']:.2f} {currency}/hour"
                         
                         # Highlight if this resource exists in both and has changed
                         if key in common_keys and not args.no_color:
@@ -177,11 +211,11 @@ def process_plan_command():
                     if changes:
                         if has_tabulate:
                             # Use tabulate for formatted output
-                            change_headers = ["Resource", "Type", "Amount Change", "Unit", "Cost Change (RUB/hour)", "Difference"]
+                            change_headers = ["Resource", "Type", "Amount Change", "Unit", f"Cost Change ({currency}/hour)", "Difference"]
                             changes_table = []
                             for current, planned in changes:
                                 changes_table.append([
-                                    current['resource_name'],
+                                    resource_label(current),
                                     current['resource_type'],
                                     f"{current['amount']} → {planned['amount']}",
                                     current['unit'],
@@ -193,7 +227,7 @@ def process_plan_command():
                         else:
                             # Fallback to simple formatting
                             for current, planned in changes:
-                                print(f"{current['resource_name']} ({current['resource_type']}): {current['amount']} → {planned['amount']} {current['unit']}, Cost: {current['cost']:.2f} → {planned['cost']:.2f} RUB/hour (Diff: {planned['cost'] - current['cost']:.2f})")
+                                print(f"{resource_label(current)} ({current['resource_type']}): {current['amount']} → {planned['amount']} {current['unit']}, Cost: {current['cost']:.2f} → {planned['cost']:.2f} {currency}/hour (Diff: {planned['cost'] - current['cost']:.2f})")
                     else:
                         print("No changes in existing resources.")
     except FileNotFoundError:
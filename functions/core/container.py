@@ -1,14 +1,71 @@
+import hashlib
 import json
 import logging
-from service.pricing import PricingService
+import os
+import re
+import threading
+import time
+import processor
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from model.usage_cache import FORMAT_VERSION as USAGE_CACHE_FORMAT
+from service.pricing import DeferredPricingService, PricingService
+from service.sku_catalog import ShardedSkuCatalog, load_catalog
 from service.resource_spec import ResourceSpecService
 from core.estimator import TerraformCostEstimator
+from util import cold_start
+
+# Price list names end up in file paths
+PRICE_LIST_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+# Source of the processors, cached usage rows are only valid for the code that produced them
+PROCESSOR_DIR = os.path.dirname(os.path.abspath(processor.__file__))
+
+def content_digest(paths):
+    """Hash the contents of files, the files of a directory in name order"""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        files = [path]
+        if os.path.isdir(path):
+            # Hidden files are temporary files of writers in progress
+            files = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                     if not name.startswith(".") and os.path.isfile(os.path.join(path, name))]
+        for file_path in files:
+            digest.update(f"{os.path.basename(file_path)}\0".encode("utf-8"))
+            with open(file_path, "rb") as f:
+                while chunk := f.read(1 << 20):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+class PriceList:
+    """A loaded catalog with its own indexed pricing service and estimator"""
+
+    def __init__(self, name, path, catalog, resource_spec_service, catalog_version=""):
+        self.name = name
+        self.path = path
+        self.catalog = catalog
+        self.pricing_service = PricingService(catalog)
+        self.estimator = TerraformCostEstimator(self.pricing_service, resource_spec_service, catalog_version=catalog_version)
+
 
 class Container:
     """Dependency injection container"""
     
     _instance = None
     
+    # The first existing path is used: catalog shards, compiled snapshot, pruned price book, full catalog
+    DEFAULT_SKU_PATHS = ('./catalog_shards', './sku.bin', './price_book.json', './sku.json')
+    
+    # Named price lists are looked up as <dir>/<name>.bin, <dir>/<name>.json
+    PRICE_LISTS_DIR = os.environ.get("PRICE_LISTS_DIR", "./price_lists")
+    PRICE_LIST_EXTENSIONS = ('.bin', '.json')
+    # Named price lists kept loaded at once, least recently used are dropped
+    PRICE_LIST_CACHE_SIZE = int(os.environ.get("PRICE_LIST_CACHE_SIZE", "4"))
+    # Entry points start loading the catalog in the background at import time
+    BACKGROUND_LOAD = os.environ.get("CATALOG_BACKGROUND_LOAD", "1").lower() not in ("0", "false")
+    # Seconds between checks of the catalog files for changes, 0 disables hot reload
+    RELOAD_INTERVAL = float(os.environ.get("CATALOG_RELOAD_INTERVAL", "30"))
+    
     @classmethod
     def get_instance(cls):
         """Get or create the singleton instance"""
@@ -18,44 +75,204 @@ class Container:
     
     def __init__(self):
         self._services = {}
+        self._price_lists = OrderedDict()
         self._initialized = False
+        # Catalog files of the current snapshot and their (mtime, size) signatures
+        self._paths = ()
+        self._signatures = ()
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+    
+    @staticmethod
+    def _signature(path):
+        # Shards are replaced before their manifest, which is written last
+        if os.path.isdir(path):
+            path = os.path.join(path, ShardedSkuCatalog.MANIFEST_NAME)
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    @staticmethod
+    def _catalog_version(paths):
+        """Version of the catalog and preset files and the processor code, part of the usage cache keys
+
+        Built from contents, not timestamps, so a usage cache saved by another
+        checkout of the same files stays valid.
+        """
+        return f"{USAGE_CACHE_FORMAT}:{content_digest(paths)}:{content_digest([PROCESSOR_DIR])}"
+    
+    @staticmethod
+    def _load_pricing_service(sku_path):
+        with cold_start.measure("catalog_load"):
+            return PricingService(load_catalog(sku_path))
     
-    def initialize(self, sku_path='./sku.json', mdb_path='./mdb.json'):
-        """Initialize the container with required services"""
+    @classmethod
+    def _load_pricing_service_async(cls, sku_path):
+        """Load the catalog in a background thread"""
+        future = Future()
+        
+        def load():
+            try:
+                future.set_result(cls._load_pricing_service(sku_path))
+            except BaseException as e:
+                logging.error(f"Failed to load catalog {sku_path}: {e}")
+                future.set_exception(e)
+        
+        threading.Thread(target=load, name="catalog-load", daemon=True).start()
+        return DeferredPricingService(future)
+    
+    @classmethod
+    def _build_services(cls, sku_path, mdb_path, background=False):
+        """Load the data files and create a complete set of services"""
+        if background:
+            pricing_service = cls._load_pricing_service_async(sku_path)
+        else:
+            pricing_service = cls._load_pricing_service(sku_path)
+        
+        with open(mdb_path) as f:
+            mdb = json.load(f)
+            
+        # Create services
+        resource_spec_service = ResourceSpecService(mdb)
+        
+        return {
+            'pricing_service': pricing_service,
+            'resource_spec_service': resource_spec_service,
+            # Hashing the files is left to the first estimate that uses the usage cache
+            'estimator': TerraformCostEstimator(pricing_service, resource_spec_service, catalog_version=partial(cls._catalog_version, (sku_path, mdb_path)))
+        }
+    
+    def initialize(self, sku_path=None, mdb_path='./mdb.json', background=False):
+        """Initialize the container with required services
+
+        With `background` the catalog loads in a separate thread: estimates can
+        start collecting usage and block only on their first price lookup.
+        """
         if self._initialized:
-            return
+            if not self._load_failed():
+                return
+            # The error was reported by the request that waited for the catalog, load it again
+            logging.warning("Background catalog load failed, loading the catalog again")
+            self._initialized = False
+            self._services = {}
+        
+        if sku_path is None and self._paths:
+            # Retries after a failed load use the same files
+            sku_path, mdb_path = self._paths
+        if sku_path is None:
+            sku_path = next((path for path in self.DEFAULT_SKU_PATHS if os.path.exists(path)), self.DEFAULT_SKU_PATHS[-1])
         
         # Load data files
         try:
-            with open(sku_path) as f:
-                prices = json.load(f)
-            
-            with open(mdb_path) as f:
-                mdb = json.load(f)
-                
-            # Create services
-            pricing_service = PricingService(prices)
-            resource_spec_service = ResourceSpecService(mdb)
-            
-            # Register services
-            self._services['pricing_service'] = pricing_service
-            self._services['resource_spec_service'] = resource_spec_service
-            self._services['estimator'] = TerraformCostEstimator(
-                pricing_service, resource_spec_service
-            )
+            self._paths = (sku_path, mdb_path)
+            self._signatures = tuple(self._signature(path) for path in self._paths)
+            self._services = self._build_services(sku_path, mdb_path, background)
             
+            self._last_check = time.monotonic()
             self._initialized = True
             logging.info("Container initialized successfully")
         except Exception as e:
             logging.error(f"Failed to initialize container: {str(e)}")
             raise
     
+    def _load_failed(self):
+        """Check whether the catalog loaded in the background ended with an error"""
+        pricing_service = self._services.get('pricing_service')
+        return isinstance(pricing_service, DeferredPricingService) and pricing_service.failed()
+    
+    def check_for_updates(self, force=False):
+        """Start a background rebuild if a catalog file changed, at most once per RELOAD_INTERVAL
+
+        Returns the rebuild thread if one was started.
+        """
+        if not self._initialized or (self.RELOAD_INTERVAL <= 0 and not force):
+            return None
+        now = time.monotonic()
+        if not force and now - self._last_check < self.RELOAD_INTERVAL:
+            return None
+        self._last_check = now
+        
+        try:
+            signatures = tuple(self._signature(path) for path in self._paths)
+        except OSError as e:
+            # A file being replaced right now, try again on the next check
+            logging.warning(f"Catalog files can't be checked for updates: {e}")
+            return None
+        if signatures == self._signatures:
+            return None
+        
+        with self._reload_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return None
+            self._reload_thread = threading.Thread(target=self._reload, args=(signatures,), name="catalog-reload", daemon=True)
+            self._reload_thread.start()
+            return self._reload_thread
+    
+    def _reload(self, signatures):
+        """Build new services off the request path and swap them in"""
+        started = time.perf_counter()
+        try:
+            services = self._build_services(*self._paths)
+        except Exception as e:
+            # Keep serving the current snapshot, retry on the next check
+            logging.error(f"Failed to reload catalog files: {e}")
+            return
+        
+        # A single reference swap: in-flight estimates keep the services they already hold
+        self._services = services
+        self._signatures = signatures
+        # Named price lists share the resource specs, they are loaded again on next use
+        self._price_lists = OrderedDict()
+        logging.info(f"Catalog files reloaded in {(time.perf_counter() - started) * 1000:.1f} ms")
+    
     def get(self, service_name):
         """Get a service by name"""
-        if not self._initialized:
+        if not self._initialized or self._load_failed():
             self.initialize()
+        else:
+            self.check_for_updates()
         
-        if service_name not in self._services:
+        services = self._services
+        if service_name not in services:
             raise KeyError(f"Service '{service_name}' not found in container")
         
-        return self._services[service_name]
+        return services[service_name]
+    
+    def get_estimator(self, price_list=None):
+        """Get the estimator of a named price list, the default one if no name is given"""
+        if price_list is None:
+            return self.get('estimator')
+        return self.get_price_list(price_list).estimator
+    
+    def get_price_list(self, name):
+        """Get a named price list, loading it on first use
+
+        Raises ValueError for an invalid name and FileNotFoundError for an unknown one.
+        """
+        if not PRICE_LIST_NAME.match(name):
+            raise ValueError(f"Invalid price list name '{name}'")
+        
+        price_list = self._price_lists.get(name)
+        if price_list is not None:
+            self._price_lists.move_to_end(name)
+            return price_list
+        
+        path = next(
+            (path for path in (os.path.join(self.PRICE_LISTS_DIR, name + extension) for extension in self.PRICE_LIST_EXTENSIONS)
+             if os.path.exists(path)),
+            None
+        )
+        if path is None:
+            raise FileNotFoundError(f"Price list '{name}' not found")
+        
+        # Presets are shared with the default catalog, so is their part of the version
+        catalog_version = partial(self._catalog_version, (path,) + self._paths[1:])
+        price_list = PriceList(name, path, load_catalog(path), self.get('resource_spec_service'), catalog_version)
+        self._price_lists[name] = price_list
+        logging.info(f"Price list '{name}' loaded from {path}")
+        
+        while len(self._price_lists) > self.PRICE_LIST_CACHE_SIZE:
+            # Only the reference is dropped, in-flight estimates may still read the catalog
+            evicted_name, _ = self._price_lists.popitem(last=False)
+            logging.info(f"Price list '{evicted_name}' evicted")
+        return price_list
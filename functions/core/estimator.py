@@ -1,50 +1,191 @@
 import logging
-from service.pricing import PricingService
+import time
+from datetime import datetime, timezone
+from service.pricing import DEFAULT_CURRENCY, PricingService, parse_timestamp
 from service.resource_spec import ResourceSpecService
 from model.usage import UsageCollector
 from processor import ProcessorRegistry
+from core import parallel
+from model.usage_cache import DEFAULT_SIZE as USAGE_CACHE_SIZE, UsageCache, UsageRecorder
+
+def module_resources(module):
+    """Yield (module address, resource) for a module and its child modules, depth first in plan order"""
+    # Iterators of child modules still to visit, nesting depth doesn't use the call stack
+    pending = [iter((module,))]
+    while pending:
+        module = next(pending[-1], None)
+        if module is None:
+            pending.pop()
+            continue
+        address = module.get("address", "")
+        for resource in module.get("resources", ()):
+            yield address, resource
+        if module.get("child_modules"):
+            pending.append(iter(module["child_modules"]))
 
 class TerraformCostEstimator:
     """Main application class for estimating Terraform costs"""
     
-    def __init__(self, pricing_service, resource_spec_service):
+    def __init__(self, pricing_service, resource_spec_service, workers=None, catalog_version="", cache_size=None):
         self.pricing_service = pricing_service
         self.resource_spec_service = resource_spec_service
         self.processor_registry = ProcessorRegistry(self.pricing_service, self.resource_spec_service)
+        # Worker processes for large plans, None takes ESTIMATOR_WORKERS
+        self.workers = parallel.DEFAULT_WORKERS if workers is None else workers
+        # Usage of resources seen before, kept across estimates of a warm instance
+        cache_size = USAGE_CACHE_SIZE if cache_size is None else cache_size
+        self.usage_cache = UsageCache(cache_size, catalog_version) if cache_size > 0 else None
+        # Set by util.profiling while a plan is profiled, times resources per processor class
+        self.processor_timings = None
+    
+    def _process_cached(self, processor, resource, collector):
+        """Replay the cached usage of a resource, or process it and cache its usage"""
+        cache = self.usage_cache
+        key = cache.key(resource)
+        rows = cache.get(key)
+        if rows is not None:
+            resource_name = resource["name"]
+            resource_type = resource["type"]
+            for sku, amount in rows:
+                collector.add_usage(sku, amount, resource_name, resource_type)
+            return
+        
+        recorder = UsageRecorder(collector, resource["name"], resource["type"])
+        # Failed resources are processed again, so their errors are logged every time
+        if not processor.process(resource, recorder) and recorder.cacheable:
+            cache.put(key, recorder.rows)
+    
+    def _process_resources(self, resources, collector, label, resource_types):
+        """Process (module address, resource) pairs serially, adding their usage to the collector"""
+        processed = 0
+        ignored_types = set()
+        timings = self.processor_timings
+        for address, resource in resources:
+            resource_type = resource["type"]
+            resource_types.add(resource_type)
+            processor = self.processor_registry.get_processor(resource_type)
+            
+            if processor:
+                collector.module = address
+                started = time.perf_counter() if timings is not None else 0
+                if self.usage_cache is None:
+                    processor.process(resource, collector)
+                else:
+                    self._process_cached(processor, resource, collector)
+                if timings is not None:
+                    timings.add(processor, time.perf_counter() - started)
+                processed += 1
+            else:
+                ignored_types.add(resource_type)
+        collector.module = ""
+        self._log_section(label, processed, ignored_types)
+    
+    @staticmethod
+    def _log_section(label, processed, ignored_types):
+        """Log one summary line per plan section instead of a line per resource"""
+        ignored = f", ignored types: {', '.join(sorted(ignored_types))}" if ignored_types else ""
+        logging.info(f"{label}: {processed} resources processed{ignored}")
+    
+    def _split_cached(self, resources):
+        """Look up resources in the usage cache before the worker pool gets the others
+
+        Returns plan-order (module address, resource, cache key, cached rows)
+        entries, the (module address, resource) pairs to process and the
+        ignored resource types.
+        """
+        cache = self.usage_cache
+        entries = []
+        misses = []
+        ignored_types = set()
+        for address, resource in resources:
+            if self.processor_registry.get_processor(resource["type"]) is None:
+                ignored_types.add(resource["type"])
+                continue
+            key = rows = None
+            if cache is not None:
+                key = cache.key(resource)
+                rows = cache.get(key)
+            if rows is None:
+                misses.append((address, resource))
+            entries.append((address, resource, key, rows))
+        return entries, misses, ignored_types
     
-    def process_plan(self, tf_plan, param_full):
+    def _merge_worker_usage(self, entries, worker_usage, collector):
+        """Add cached rows and rows processed by workers to the collector in plan order, caching the latter"""
+        for address, resource, key, rows in entries:
+            resource_name = resource["name"]
+            resource_type = resource["type"]
+            collector.module = address
+            if rows is not None:
+                for sku, amount in rows:
+                    collector.add_usage(sku, amount, resource_name, resource_type)
+                continue
+            
+            rows, failed = next(worker_usage)
+            for sku, amount, row_name, row_type in rows:
+                collector.add_usage(sku, amount, row_name, row_type)
+            # Same rule as UsageRecorder: failed resources and rows under other names are not cached
+            if key is not None and not failed and all(row[2] == resource_name and row[3] == resource_type for row in rows):
+                self.usage_cache.put(key, [(sku, amount) for sku, amount, _, _ in rows])
+        collector.module = ""
+    
+    def _use_workers(self, workers, resource_count):
+        """Check whether a plan is large enough for the worker pool"""
+        if workers is None:
+            workers = self.workers
+        if workers <= 1 or resource_count < parallel.MIN_PARALLEL_RESOURCES:
+            return 0
+        if self.processor_timings is not None:
+            logging.info("Processor timings are taken in this process only, processing serially")
+            return 0
+        if not parallel.parallel_available():
+            logging.warning("Parallel processing needs the fork start method, processing serially")
+            return 0
+        return workers
+    
+    def process_plan(self, tf_plan, param_full, as_of=None, workers=None):
         """Process a Terraform plan and estimate costs with comparison"""
-        # Process prior state (current infrastructure)
-        prior_collector = UsageCollector(self.pricing_service)
-        prior_collector.clear()
+        # All prices of one estimate are taken at the same instant
+        as_of_timestamp = time.time() if as_of is None else parse_timestamp(as_of)
         
+        # Prior state (current infrastructure) and planned values (future infrastructure)
+        prior_module = {}
         if "prior_state" in tf_plan and "values" in tf_plan["prior_state"] and "root_module" in tf_plan["prior_state"]["values"]:
-            prior_resources = tf_plan["prior_state"]["values"]["root_module"].get("resources", [])
-            for resource in prior_resources:
-                resource_type = resource["type"]
-                processor = self.processor_registry.get_processor(resource_type)
-                
-                if processor:
-                    processor.process(resource, prior_collector)
-                    logging.info(f'Prior state: {resource_type} is processed.')
-                else:
-                    logging.info(f'Prior state: {resource_type} is ignored.')
+            prior_module = tf_plan["prior_state"]["values"]["root_module"]
+        planned_module = {}
+        if "planned_values" in tf_plan and "root_module" in tf_plan["planned_values"]:
+            planned_module = tf_plan["planned_values"]["root_module"]
         
-        # Process planned values (future infrastructure)
-        planned_collector = UsageCollector(self.pricing_service)
-        planned_collector.clear()
+        prior_collector = UsageCollector(self.pricing_service, as_of_timestamp)
+        planned_collector = UsageCollector(self.pricing_service, as_of_timestamp)
+        sections = (("Prior state", prior_module, prior_collector), ("Planned values", planned_module, planned_collector))
         
-        if "planned_values" in tf_plan and "root_module" in tf_plan["planned_values"]:
-            planned_resources = tf_plan["planned_values"]["root_module"].get("resources", [])
-            for resource in planned_resources:
-                resource_type = resource["type"]
-                processor = self.processor_registry.get_processor(resource_type)
-                
-                if processor:
-                    processor.process(resource, planned_collector)
-                    logging.info(f'Planned values: {resource_type} is processed.')
-                else:
-                    logging.info(f'Planned values: {resource_type} is ignored.')
+        workers = self.workers if workers is None else workers
+        if workers > 1:
+            # Counting walks the module tree, skipped unless the pool is configured
+            workers = self._use_workers(workers, sum(1 for _, module, _ in sections for _ in module_resources(module)))
+        cache_stats = self.usage_cache.stats() if self.usage_cache is not None else None
+        if workers > 1:
+            # Workers are forked with the catalog loaded, shards included
+            self.pricing_service.prepare({resource["type"] for _, module, _ in sections for _, resource in module_resources(module)})
+            with parallel.ParallelProcessor(self.pricing_service, self.resource_spec_service, workers) as pool:
+                # Cached resources are replayed here, both sections are queued at once so the pool stays busy
+                pending = []
+                for label, module, collector in sections:
+                    entries, misses, ignored_types = self._split_cached(module_resources(module))
+                    pending.append((label, collector, entries, ignored_types, pool.submit(misses)))
+                for label, collector, entries, ignored_types, futures in pending:
+                    self._merge_worker_usage(entries, pool.resource_usage(futures), collector)
+                    self._log_section(label, len(entries), ignored_types)
+        else:
+            resource_types = set()
+            for label, module, collector in sections:
+                self._process_resources(module_resources(module), collector, label, resource_types)
+            # A sharded catalog loads only the shards of the resource types in the plan
+            self.pricing_service.prepare(resource_types)
+        if cache_stats is not None:
+            logging.info(f"Usage cache: {self.usage_cache.hits - cache_stats['hits']} hits, "
+                         f"{self.usage_cache.misses - cache_stats['misses']} misses, {len(self.usage_cache)} resources cached")
         
         # Calculate costs
         prior_hourly = prior_collector.calculate_total()
@@ -76,10 +217,13 @@ class TerraformCostEstimator:
                 "monthly": round(diff_monthly, 2),
                 "percentage": round(diff_percentage, 2)
             },
-            "currency": "RUB",
+            "currency": self.pricing_service.currency or DEFAULT_CURRENCY,
             "has_changes": has_changes
         }
         
+        if as_of is not None:
+            result["as_of"] = datetime.fromtimestamp(as_of_timestamp, timezone.utc).isoformat()
+        
         # Add usage details if requested
         if param_full:
             result["current_usage"] = prior_collector.get_usage()
@@ -87,6 +231,6 @@ class TerraformCostEstimator:
         
         return result
     
-    def get_usage_collector(self):
+    def get_usage_collector(self, as_of=None):
         """Create and return a new usage collector"""
-        return UsageCollector(self.pricing_service)
+        return UsageCollector(self.pricing_service, as_of)
@@ -0,0 +1,104 @@
+import os
+from itertools import islice
+from model.usage_store import UsageStore
+from processor import ProcessorRegistry
+from util.logging import configure_forked_logging
+
+# Worker processes for plan processing, 0 or 1 keeps it serial
+DEFAULT_WORKERS = int(os.environ.get("ESTIMATOR_WORKERS", "0"))
+# Smaller plans are processed serially, starting the pool would cost more than it saves
+MIN_PARALLEL_RESOURCES = int(os.environ.get("ESTIMATOR_PARALLEL_MIN_RESOURCES", "2000"))
+# Resources sent to a worker at once
+CHUNK_SIZE = int(os.environ.get("ESTIMATOR_CHUNK_SIZE", "500"))
+
+# Processor registry of a worker process, built once by the pool initializer
+_registry = None
+
+def parallel_available():
+    """Workers are forked so they inherit the loaded catalog instead of loading it again"""
+    import multiprocessing
+    return "fork" in multiprocessing.get_all_start_methods()
+
+def _init_worker(pricing_service, resource_spec_service):
+    global _registry
+    # Records put on the inherited logging queue would never be written
+    configure_forked_logging()
+    _registry = ProcessorRegistry(pricing_service, resource_spec_service)
+
+class PartialUsage:
+    """Usage rows of one chunk, in the order processors added them"""
+
+    def __init__(self):
+        self.store = UsageStore()
+        self.module = ""
+
+    def add_usage(self, sku, amount, resource_name, resource_type):
+        self.store.append(sku, amount, resource_name, resource_type, self.module)
+
+def _process_chunk(resources):
+    """Process a chunk of (module address, resource) pairs in a worker
+
+    Returns the usage of the chunk and, per resource, the number of rows it
+    added and whether its processor failed.
+    """
+    usage = PartialUsage()
+    results = []
+    for address, resource in resources:
+        processor = _registry.get_processor(resource["type"])
+        start = len(usage.store)
+        failed = True
+        if processor:
+            usage.module = address
+            failed = bool(processor.process(resource, usage))
+        results.append((len(usage.store) - start, failed))
+    return usage.store, results
+
+def chunks(resources, size):
+    """Split an iterable of resources into consecutive chunks"""
+    resources = iter(resources)
+    while chunk := list(islice(resources, size)):
+        yield chunk
+
+class ParallelProcessor:
+    """Processes plan resources in a pool of forked worker processes"""
+
+    def __init__(self, pricing_service, resource_spec_service, workers, chunk_size=None):
+        # Only needed for large plans, kept out of the handler import path
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        self.workers = workers
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(pricing_service, resource_spec_service),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._executor.shutdown(cancel_futures=True)
+
+    def submit(self, resources):
+        """Start processing resources, chunks are processed concurrently"""
+        return [self._executor.submit(_process_chunk, chunk) for chunk in chunks(resources, self.chunk_size)]
+
+    @staticmethod
+    def resource_usage(futures):
+        """Yield ((sku, amount, resource name, resource type) rows, failed) of each submitted resource in plan order"""
+        for future in futures:
+            store, results = future.result()
+            skus = store.skus.values
+            resource_names = store.resource_names.values
+            resource_types = store.resource_types.values
+            position = 0
+            for row_count, failed in results:
+                rows = [
+                    (skus[store.sku_ids[row]], store.amounts[row], resource_names[store.resource_name_ids[row]], resource_types[store.resource_type_ids[row]])
+                    for row in range(position, position + row_count)
+                ]
+                position += row_count
+                yield rows, failed
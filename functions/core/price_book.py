@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import tempfile
+from processor import builtin_processor_class, plugin_classes, referenced_sku_ids
+from service.sku_catalog import ShardedSkuCatalog
+
+# Catalog shards built by `get-sku.py --shards` and the resource types each one prices
+CATALOG_SHARDS = {
+    "compute": ("yandex_compute_instance", "yandex_compute_disk", "yandex_compute_filesystem", "yandex_compute_instance_group"),
+    "mdb_mysql": ("yandex_mdb_mysql_cluster",),
+    "mdb_postgresql": ("yandex_mdb_postgresql_cluster",),
+    "mdb_clickhouse": ("yandex_mdb_clickhouse_cluster",),
+    "mdb_greenplum": ("yandex_mdb_greenplum_cluster",),
+    "mdb_kafka": ("yandex_mdb_kafka_cluster",),
+    "mdb_redis": ("yandex_mdb_redis_cluster",),
+    "mdb_opensearch": ("yandex_mdb_opensearch_cluster",),
+    "mdb_mongodb": ("yandex_mdb_mongodb_cluster",),
+    "ydb": ("yandex_ydb_database_dedicated",),
+    "kubernetes": ("yandex_kubernetes_cluster", "yandex_kubernetes_node_group"),
+    "vpc": ("yandex_vpc_address",),
+}
+
+def _compact_rate(rate):
+    compact = {"unitPrice": rate["unitPrice"]}
+    if "startPricingQuantity" in rate:
+        compact["startPricingQuantity"] = rate["startPricingQuantity"]
+    if "currency" in rate:
+        compact["currency"] = rate["currency"]
+    return compact
+
+def _compact_sku(sku):
+    """Keep only the fields PricingService reads"""
+    return {
+        "id": sku["id"],
+        "name": sku["name"],
+        "pricingUnit": sku["pricingUnit"],
+        "pricingVersions": [
+            {
+                "effectiveTime": version["effectiveTime"],
+                "pricingExpressions": [
+                    {"rates": [_compact_rate(rate) for rate in expression["rates"]]}
+                    for expression in version["pricingExpressions"]
+                ]
+            }
+            for version in sku.get("pricingVersions", [])
+        ]
+    }
+
+def build_price_book(prices_data, sku_ids=None):
+    """Build a price book holding only the SKUs the processors can emit"""
+    if sku_ids is None:
+        sku_ids = referenced_sku_ids()
+
+    catalog = {}
+    for sku in prices_data["skus"]:
+        catalog.setdefault(sku["id"], sku)
+
+    missing = sorted(set(sku_ids) - catalog.keys())
+    if missing:
+        raise ValueError(f"{len(missing)} SKU(s) referenced by processors are missing from the catalog: {', '.join(missing)}")
+
+    return {"skus": [_compact_sku(catalog[sku_id]) for sku_id in sorted(sku_ids)]}
+
+def _write_json(data, output_path):
+    """Write compact JSON, replacing the target atomically"""
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".price-book-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, output_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+def write_price_book(price_book, output_path):
+    """Write a price book as compact JSON, replacing the target atomically"""
+    _write_json(price_book, output_path)
+    logging.info(f"Price book with {len(price_book['skus'])} SKUs saved to {output_path}")
+
+def resource_type_sku_ids(resource_type, plugins=None):
+    """Get the SKU IDs the processor of a resource type can emit
+
+    Plugin processors are looked up in `plugins` (resource type -> class),
+    the installed entry points are loaded when it is not given.
+    """
+    processor_class = builtin_processor_class(resource_type)
+    if processor_class is None:
+        processor_class = (plugin_classes() if plugins is None else plugins).get(resource_type)
+    if processor_class is None:
+        return set()
+    return processor_class.sku_ids()
+
+def write_shards(prices_data, output_dir, shards=None):
+    """Split the SKUs used by processors into per-family price books with a manifest
+
+    The manifest maps resource types and SKU IDs to shard files and is written
+    last, so a reader never sees it before the shards it lists.
+    """
+    plugins = plugin_classes()
+    if shards is None:
+        shards = dict(CATALOG_SHARDS)
+        if plugins:
+            # Resource types of plugin processors share one shard
+            shards["plugins"] = tuple(sorted(plugins))
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {"shards": {}, "resource_types": {}, "skus": {}}
+    for shard, resource_types in shards.items():
+        sku_ids = set()
+        for resource_type in resource_types:
+            sku_ids |= resource_type_sku_ids(resource_type, plugins)
+            manifest["resource_types"][resource_type] = shard
+
+        file_name = f"{shard}.json"
+        write_price_book(build_price_book(prices_data, sku_ids), os.path.join(output_dir, file_name))
+        manifest["shards"][shard] = file_name
+        for sku_id in sorted(sku_ids):
+            manifest["skus"].setdefault(sku_id, shard)
+
+    _write_json(manifest, os.path.join(output_dir, ShardedSkuCatalog.MANIFEST_NAME))
+    logging.info(f"{len(manifest['shards'])} catalog shards saved to {output_dir}")
+    return manifest
@@ -1,47 +1,431 @@
 import requests
+import hashlib
 import json
 import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class CatalogChanges:
+    """SKU IDs added, removed and repriced between two snapshots"""
+
+    def __init__(self, added=(), removed=(), repriced=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.repriced = list(repriced)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.repriced)
+
+    def to_dict(self):
+        return {"added": self.added, "removed": self.removed, "repriced": self.repriced}
+
+    def summary(self):
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.repriced)} repriced"
+
+
+def pricing_hash(sku):
+    """Content hash of the pricing versions of a SKU"""
+    versions = json.dumps(sku.get("pricingVersions", []), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(versions.encode("utf-8")).hexdigest()
+
+def diff_skus(old_skus, new_skus):
+    """Compare two SKU lists by ID and pricing hash"""
+    return diff_hashes(
+        {sku["id"]: pricing_hash(sku) for sku in old_skus},
+        {sku["id"]: pricing_hash(sku) for sku in new_skus}
+    )
+
+def diff_hashes(old, new):
+    """Compare two ID -> pricing hash maps"""
+    return CatalogChanges(
+        added=sorted(new.keys() - old.keys()),
+        removed=sorted(old.keys() - new.keys()),
+        repriced=sorted(sku_id for sku_id in new.keys() & old.keys() if new[sku_id] != old[sku_id])
+    )
+
+def read_spool(spool_path):
+    """Yield the SKUs of a spool file one at a time"""
+    with open(spool_path, "rb") as f:
+        f.readline()
+        for line in f:
+            line = line.rstrip(b"\n").rstrip(b",")
+            if line:
+                yield json.loads(line)
+
+class SnapshotWriter:
+    """Streams SKUs into a spool file one at a time, moved over the target atomically on commit"""
+
+    HEADER = b'{"skus": ['
+
+    def __init__(self, output_file, spool_path=None, offset=None, count=0):
+        self.output_file = output_file
+        self.spool_path = spool_path or f"{output_file}.partial"
+        self.count = count
+        if offset is None:
+            self._file = open(self.spool_path, "wb")
+            self._file.write(self.HEADER)
+        else:
+            # Resuming: whatever was written after the checkpoint is dropped
+            self._file = open(self.spool_path, "r+b")
+            self._file.truncate(offset)
+            self._file.seek(offset)
+
+    def write(self, sku):
+        # One SKU per line keeps the file diffable without holding the whole list
+        self._file.write(b",\n" if self.count else b"\n")
+        self._file.write(json.dumps(sku, separators=(",", ":")).encode("utf-8"))
+        self.count += 1
+
+    def flush(self):
+        """Make the spooled SKUs durable and return the spool size"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def spooled(self):
+        """Read back the SKUs already in the spool"""
+        self._file.flush()
+        return read_spool(self.spool_path)
+
+    def commit(self):
+        """Finish the document and move it over the target"""
+        self._file.write(b"\n]}\n")
+        self._file.close()
+        os.replace(self.spool_path, self.output_file)
+
+    def close(self):
+        """Close the spool and keep it for a later resume"""
+        self._file.close()
+
+    def abort(self):
+        """Drop the spool, the target is left untouched"""
+        self._file.close()
+        os.unlink(self.spool_path)
+
+
+class FetchCheckpoint:
+    """Last fully spooled page of a download, saved next to the output file"""
+
+    def __init__(self, output_file):
+        self.path = f"{output_file}.checkpoint"
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, state):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class RetryPolicy:
+    """Jittered exponential backoff bounded by attempts and a total time budget per request"""
+
+    # Throttling and server-side errors, anything else fails right away
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, attempts=6, base_delay=0.5, max_delay=15.0, budget=60.0, timeout=30.0, seed=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.timeout = timeout
+        self._random = random.Random(seed)
+
+    def backoff(self, attempt):
+        """Delay before retry number `attempt` (1-based), full jitter"""
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class FetchStats:
+    """Counters of one catalog download"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.skus = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_page(self, sku_count, size):
+        with self._lock:
+            self.pages += 1
+            self.skus += sku_count
+            self.bytes += size
+            self.elapsed = time.perf_counter() - self.started
+
+    def summary(self):
+        elapsed = self.elapsed or 1e-9
+        return (f"{self.pages} pages, {self.skus} SKUs, {self.bytes / 1024:.0f} KiB in {self.elapsed:.2f} s "
+                f"({self.pages / elapsed:.1f} pages/s, {self.bytes / 1024 / elapsed:.0f} KiB/s)")
+
 
 class SkuFetcher:
     """Fetches SKU data from Yandex Cloud Billing API"""
-    
+
     API_URL = "https://billing.api.cloud.yandex.net/billing/v1/skus"
-    
-    def __init__(self, token):
+
+    def __init__(self, token, api_url=None, retry=None, workers=1):
         self.token = token
+        self.api_url = api_url or self.API_URL
+        # Services list lives next to the SKU list, e.g. /billing/v1/services
+        self.services_url = self.api_url.rsplit("/", 1)[0] + "/services"
+        self.retry = retry or RetryPolicy()
+        # More than one worker downloads the catalog partitioned by service
+        self.workers = workers
         self.headers = {
             "Authorization": f"Bearer {token}"
         }
-    
-    def fetch_all_skus(self, output_file="sku.json"):
-        """Fetch all SKUs and save to a file"""
-        all_skus = []
-        next_page_token = None
-        
-        # First request
-        data = self._perform_request()
-        all_skus.extend(data.get("skus", []))
-        next_page_token = data.get("nextPageToken")
-        
-        # Loop through pages
-        while next_page_token:
-            params = {"pageToken": next_page_token}
-            data = self._perform_request(params)
-            all_skus.extend(data.get("skus", []))
-            next_page_token = data.get("nextPageToken")
-            logging.info(f"Fetched page with token: {next_page_token}")
-        
-        # Save the aggregated results to the output file
-        with open(output_file, "w") as f:
-            json.dump({"skus": all_skus}, f, indent=4)
-        
-        logging.info(f"All pages have been fetched and saved to {output_file}.")
-        return all_skus
-    
-    def _perform_request(self, params=None):
-        """Perform a request to the API and process the response"""
-        response = requests.get(self.API_URL, headers=self.headers, params=params)
-        if response.status_code != 200:
-            logging.error(f"API request failed with status code {response.status_code}")
-            response.raise_for_status()
-        return response.json()
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        """Keep-alive session of the current thread, every page reuses its connection"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+        return session
+
+    def list_services(self):
+        """Get the IDs of all billable services"""
+        service_ids = []
+        params = {}
+        while True:
+            data, _ = self._perform_request(params, self.services_url)
+            service_ids.extend(service["id"] for service in data.get("services", []))
+            if not data.get("nextPageToken"):
+                return service_ids
+            params = {"pageToken": data["nextPageToken"]}
+
+    def iter_pages(self, stats=None, page_token=None, service_id=None):
+        """Yield the SKUs of each page as it arrives along with the token of the next page"""
+        while True:
+            params = {}
+            if service_id:
+                params["filter"] = f'serviceId="{service_id}"'
+            if page_token:
+                params["pageToken"] = page_token
+            data, size = self._perform_request(params or None)
+            skus = data.get("skus", [])
+            if stats is not None:
+                stats.add_page(len(skus), size)
+
+            page_token = data.get("nextPageToken")
+            yield skus, page_token
+            if not page_token:
+                break
+            logging.info(f"Fetched page with token: {page_token}")
+
+    def fetch_skus(self):
+        """Fetch all pages of SKUs into a list"""
+        return [sku for page, _ in self.iter_pages() for sku in page]
+
+    def fetch_all_skus(self, output_file="sku.json", resume=True):
+        """Fetch all SKUs and stream them to a file, peak memory is about one page"""
+        writer, stats, checkpoint = self._download(output_file, resume)
+        writer.commit()
+        checkpoint.clear()
+
+        logging.info(f"All pages have been fetched and saved to {output_file}: {stats.summary()}")
+        return stats
+
+    def refresh(self, output_file="sku.json", resume=True):
+        """Fetch all SKUs and replace the snapshot only if anything changed
+
+        Returns the download stats and the changes against the existing snapshot.
+        """
+        old_hashes = {}
+        if os.path.exists(output_file):
+            with open(output_file) as f:
+                old_hashes = {sku["id"]: pricing_hash(sku) for sku in json.load(f).get("skus", [])}
+
+        # Keep only ID -> hash of the new catalog, the SKUs themselves go to the spool
+        new_hashes = {}
+        def on_sku(sku):
+            new_hashes[sku["id"]] = pricing_hash(sku)
+
+        writer, stats, checkpoint = self._download(output_file, resume, on_sku)
+        checkpoint.clear()
+        changes = diff_hashes(old_hashes, new_hashes)
+        if not changes:
+            writer.abort()
+            logging.info(f"SKU catalog is up to date, {output_file} left unchanged: {stats.summary()}")
+            return stats, changes
+
+        writer.commit()
+        logging.info(f"SKU catalog changed ({changes.summary()}), saved to {output_file}: {stats.summary()}")
+        return stats, changes
+
+    def _download(self, output_file, resume=True, on_sku=None):
+        """Spool all pages next to the output file, checkpointing after each page
+
+        A failed download keeps its spool and checkpoint, the next call resumes
+        after the last page that was fully written.
+        """
+        checkpoint = FetchCheckpoint(output_file)
+        if self.workers > 1:
+            checkpoint.clear()
+            return self._download_partitioned(output_file, resume, on_sku) + (checkpoint,)
+
+        stats = FetchStats()
+        writer = self._spool_pages(output_file, self._resume_state(checkpoint, resume), stats, checkpoint, on_sku)
+        return writer, stats, checkpoint
+
+    def _resume_state(self, checkpoint, resume=True, service_id=None):
+        """Get the checkpoint state if the download it belongs to can be resumed"""
+        state = checkpoint.load() if resume else None
+        if state and (state.get("apiUrl") != self.api_url or state.get("serviceId") != service_id
+                      or not os.path.exists(state.get("spool", ""))):
+            return None
+        return state
+
+    def _spool_pages(self, output_file, state, stats, checkpoint, on_sku=None, service_id=None):
+        """Spool the pages of the catalog or of one service, saving the checkpoint after each page"""
+        page_token = None
+        if state:
+            writer = SnapshotWriter(output_file, state["spool"], state["offset"], state["count"])
+            page_token = state["nextPageToken"]
+            logging.info(f"Resuming download after {state['count']} SKUs from page token {page_token}")
+            if on_sku is not None:
+                for sku in writer.spooled():
+                    on_sku(sku)
+        else:
+            checkpoint.clear()
+            writer = SnapshotWriter(output_file)
+
+        try:
+            for page, page_token in self.iter_pages(stats, page_token, service_id):
+                for sku in page:
+                    if on_sku is not None:
+                        on_sku(sku)
+                    writer.write(sku)
+                if page_token:
+                    checkpoint.save({
+                        "apiUrl": self.api_url,
+                        "serviceId": service_id,
+                        "nextPageToken": page_token,
+                        "spool": writer.spool_path,
+                        "offset": writer.flush(),
+                        "count": writer.count
+                    })
+        except BaseException:
+            writer.close()
+            raise
+        return writer
+
+    def _fetch_partition(self, partition_file, service_id, stats, resume=True):
+        """Spool all SKUs of one service to its own file, runs in a worker thread
+
+        Each partition has its own checkpoint, a finished partition is marked
+        done so a resumed download doesn't fetch it again. Returns the spool path.
+        """
+        checkpoint = FetchCheckpoint(partition_file)
+        state = self._resume_state(checkpoint, resume, service_id)
+        if state and state.get("done"):
+            return state["spool"]
+
+        writer = self._spool_pages(partition_file, state, stats, checkpoint, service_id=service_id)
+        offset = writer.flush()
+        writer.close()
+        checkpoint.save({
+            "apiUrl": self.api_url,
+            "serviceId": service_id,
+            "done": True,
+            "spool": writer.spool_path,
+            "offset": offset,
+            "count": writer.count
+        })
+        return writer.spool_path
+
+    def _download_partitioned(self, output_file, resume=True, on_sku=None):
+        """Fetch the SKUs of every service concurrently and merge them into one spool
+
+        Every partition is spooled to disk next to the output file, so memory
+        stays at about one page per worker. Partitions are merged in service
+        order and SKUs listed under several services are kept once, so the
+        snapshot doesn't depend on timing. A failed download keeps the spools
+        and checkpoints of its partitions, the next call fetches only what is missing.
+        """
+        service_ids = self.list_services()
+        logging.info(f"Downloading SKUs of {len(service_ids)} services with {self.workers} workers")
+
+        stats = FetchStats()
+        partition_files = [f"{output_file}.{index}" for index in range(len(service_ids))]
+        writer = SnapshotWriter(output_file)
+        seen = set()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sku-fetch") as executor:
+                partitions = [
+                    executor.submit(self._fetch_partition, partition_file, service_id, stats, resume)
+                    for partition_file, service_id in zip(partition_files, service_ids)
+                ]
+                try:
+                    for partition in partitions:
+                        for sku in read_spool(partition.result()):
+                            if sku["id"] in seen:
+                                continue
+                            seen.add(sku["id"])
+                            if on_sku is not None:
+                                on_sku(sku)
+                            writer.write(sku)
+                except BaseException:
+                    # Don't start partitions that are still queued
+                    executor.shutdown(cancel_futures=True)
+                    raise
+        except BaseException:
+            writer.abort()
+            raise
+
+        # Everything is in the merged spool now
+        for partition_file, partition in zip(partition_files, partitions):
+            FetchCheckpoint(partition_file).clear()
+            os.unlink(partition.result())
+        return writer, stats
+
+    def _perform_request(self, params=None, url=None):
+        """Perform a request to the API with retries, return the parsed body and its size in bytes"""
+        url = url or self.api_url
+        retry = self.retry
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(url, params=params, timeout=retry.timeout)
+                if response.status_code == 200:
+                    return response.json(), len(response.content)
+                logging.error(f"API request failed with status code {response.status_code}")
+                if response.status_code not in retry.RETRY_STATUSES:
+                    response.raise_for_status()
+                    raise requests.HTTPError(f"Unexpected status code {response.status_code}", response=response)
+                error = requests.HTTPError(f"{response.status_code} Server Error for url: {response.url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                logging.error(f"API request failed: {e}")
+                error = e
+
+            attempt += 1
+            delay = retry.backoff(attempt)
+            if attempt >= retry.attempts or time.monotonic() - started + delay > retry.budget:
+                logging.error(f"Giving up after {attempt} attempt(s)")
+                raise error
+            logging.warning(f"Retrying in {delay:.2f} s (attempt {attempt + 1} of {retry.attempts})")
+            time.sleep(delay)
@@ -1,20 +1,71 @@
 import argparse
+import json
 import logging
+import sys
+from core.price_book import build_price_book, write_price_book, write_shards
 from core.sku_fetcher import SkuFetcher
+from service.sku_catalog import compile_catalog
 from util.logging import configure_logging
 
 def main():
     parser = argparse.ArgumentParser(description="Yandex Cloud IAM token")
-    parser.add_argument("token", help="IAM token")
+    parser.add_argument("token", nargs="?", help="IAM token")
     parser.add_argument("--output", default="sku.json", help="Output file path")
+    parser.add_argument("--input", help="Use an existing sku.json instead of fetching SKUs")
+    parser.add_argument("--refresh", action="store_true", help="Rewrite the output file only if SKUs were added, removed or repriced")
+    parser.add_argument("--changelog", metavar="PATH", help="Write the added, removed and repriced SKU IDs as JSON (with --refresh)")
+    parser.add_argument("--no-resume", action="store_true", help="Start over instead of resuming an interrupted download")
+    parser.add_argument("--workers", type=int, default=1, help="Download SKUs of this many services in parallel")
+    parser.add_argument("--api-url", default=SkuFetcher.API_URL, help="Billing API SKU list URL")
+    parser.add_argument("--price-book", metavar="PATH", help="Also write a price book with only the SKUs processors use (e.g. price_book.json)")
+    parser.add_argument("--shards", metavar="DIR", help="Also split the SKUs processors use into per-family shards with a manifest (e.g. catalog_shards)")
+    parser.add_argument("--compile", metavar="PATH", help="Also compile the SKUs (or the price book) into a binary catalog (e.g. sku.bin)")
     args = parser.parse_args()
 
+    if not args.token and not args.input:
+        parser.error("either an IAM token or --input is required")
+    if args.changelog and not args.refresh:
+        parser.error("--changelog requires --refresh")
+
     # Initialize logging
     configure_logging(logging.INFO)
     
-    # Create fetcher and fetch SKUs
-    fetcher = SkuFetcher(args.token)
-    fetcher.fetch_all_skus(args.output)
+    sku_path = args.input
+    if not sku_path:
+        # Create fetcher and stream SKUs to the output file
+        fetcher = SkuFetcher(args.token, args.api_url, workers=args.workers)
+        if args.refresh:
+            _, changes = fetcher.refresh(args.output, resume=not args.no_resume)
+            if args.changelog:
+                with open(args.changelog, "w") as f:
+                    json.dump(changes.to_dict(), f, indent=2)
+        else:
+            fetcher.fetch_all_skus(args.output, resume=not args.no_resume)
+        sku_path = args.output
+
+    if not args.price_book and not args.compile and not args.shards:
+        return
+
+    with open(sku_path) as f:
+        catalog = json.load(f)
+
+    if args.shards:
+        try:
+            write_shards(catalog, args.shards)
+        except ValueError as e:
+            logging.error(e)
+            sys.exit(1)
+    if args.price_book:
+        try:
+            catalog = build_price_book(catalog)
+        except ValueError as e:
+            # A SKU used by processors is missing from the catalog
+            logging.error(e)
+            sys.exit(1)
+        write_price_book(catalog, args.price_book)
+
+    if args.compile:
+        compile_catalog(catalog, args.compile)
 
 if __name__ == "__main__":
     main()
@@ -1,26 +1,63 @@
+import time
+_import_started = time.perf_counter()
+
 import json
 from core.container import Container
+from service.pricing import parse_timestamp
+from util import cold_start, profiling
 from util.logging import configure_logging
 import logging
 
 # Initialize logging
 configure_logging(logging.INFO)
 
+cold_start.record("import", time.perf_counter() - _import_started)
+
+# Start loading the catalog now, the first request decodes its plan meanwhile
+if Container.BACKGROUND_LOAD:
+    try:
+        Container.get_instance().initialize(background=True)
+    except Exception:
+        # Already logged, the first request retries and reports the error
+        pass
+
 def handler(event, context):
     plan = json.loads(event["body"])
-    param_full = event.get("queryStringParameters", {}).get("full")
+    query = event.get("queryStringParameters") or {}
+    param_full = query.get("full")
+    as_of = query.get("as_of")
+    price_list = query.get("price_list") or None
 
     if param_full and param_full.lower() == "true":
         param_full = True
     else:
         param_full = False
 
-    # Get container and estimator
+    if as_of:
+        try:
+            parse_timestamp(as_of)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({"error": f"Invalid as_of timestamp '{as_of}'"})
+            }
+
+    # Get container and the estimator of the requested price list
     container = Container.get_instance()
     container.initialize()
-    estimator = container.get('estimator')
+    try:
+        estimator = container.get_estimator(price_list)
+    except (ValueError, FileNotFoundError) as e:
+        return {
+            'statusCode': 400 if isinstance(e, ValueError) else 404,
+            'body': json.dumps({"error": str(e)})
+        }
     
-    result = estimator.process_plan(plan, param_full)
+    with cold_start.measure("first_estimate"):
+        if profiling.ENABLED:
+            result = profiling.profile_plan(estimator, profiling.default_prefix(), plan, param_full, as_of or None)
+        else:
+            result = estimator.process_plan(plan, param_full, as_of or None)
 
     return {
         'statusCode': 200,
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from functools import lru_cache
+
+# Below this many usage rows converting to NumPy arrays costs more than it saves
+VECTORIZE_MIN_ROWS = 2000
+
+class PythonCostEngine:
+    """Prices usage columns with plain Python loops"""
+
+    def __init__(self, pricing_service, as_of=None):
+        self.pricing_service = pricing_service
+        self.as_of = as_of
+
+    def sku_costs(self, sku_ids, sku_indices, amounts):
+        """Get total amount and cost per SKU, aligned to `sku_ids`"""
+        totals = [0] * len(sku_ids)
+        for index, amount in zip(sku_indices, amounts):
+            totals[index] += amount
+        costs = [self.pricing_service.get_cost(sku_id, total, self.as_of) for sku_id, total in zip(sku_ids, totals)]
+        return totals, costs
+
+    def group_costs(self, sku_ids, sku_indices, amounts, group_ids, group_count):
+        """Get total amount and cost per group, each group must belong to a single SKU"""
+        group_amounts = [0] * group_count
+        group_skus = [0] * group_count
+        for index, amount, group in zip(sku_indices, amounts, group_ids):
+            group_amounts[group] += amount
+            group_skus[group] = index
+
+        # Quantity tiers apply to the total of a SKU, groups get a proportional share
+        groups_by_sku = defaultdict(list)
+        for group, index in enumerate(group_skus):
+            groups_by_sku[index].append(group)
+        group_costs = [0.0] * group_count
+        for index, groups in groups_by_sku.items():
+            costs = self.pricing_service.get_costs(sku_ids[index], [group_amounts[group] for group in groups], self.as_of)
+            for group, cost in zip(groups, costs):
+                group_costs[group] = cost
+
+        return group_amounts, group_costs
+
+
+class NumpyCostEngine:
+    """Prices usage columns with NumPy, one pricing call per distinct SKU"""
+
+    def __init__(self, pricing_service, as_of=None):
+        import numpy
+        self.np = numpy
+        self.pricing_service = pricing_service
+        self.as_of = as_of
+
+    def _sku_costs(self, sku_ids, sku_indices, amounts):
+        np = self.np
+        totals = np.bincount(sku_indices, weights=amounts, minlength=len(sku_ids))
+        costs = np.fromiter(
+            (self.pricing_service.get_cost(sku_id, float(total), self.as_of) for sku_id, total in zip(sku_ids, totals)),
+            dtype=np.float64,
+            count=len(sku_ids)
+        )
+        return totals, costs
+
+    def sku_costs(self, sku_ids, sku_indices, amounts):
+        """Get total amount and cost per SKU, aligned to `sku_ids`"""
+        np = self.np
+        totals, costs = self._sku_costs(sku_ids, np.asarray(sku_indices, dtype=np.intp), np.asarray(amounts, dtype=np.float64))
+        return totals.tolist(), costs.tolist()
+
+    def group_costs(self, sku_ids, sku_indices, amounts, group_ids, group_count):
+        """Get total amount and cost per group, each group must belong to a single SKU"""
+        np = self.np
+        # array("q")/array("d") columns are wrapped without copying
+        sku_indices = np.asarray(sku_indices, dtype=np.intp)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        group_ids = np.asarray(group_ids, dtype=np.intp)
+
+        # Dense per-SKU effective unit price, tiers applied to the SKU total
+        totals, costs = self._sku_costs(sku_ids, sku_indices, amounts)
+        unit_prices = np.divide(costs, totals, out=np.zeros_like(costs), where=totals != 0)
+
+        group_amounts = np.bincount(group_ids, weights=amounts, minlength=group_count)
+        group_costs = np.zeros(group_count, dtype=np.float64)
+        np.add.at(group_costs, group_ids, amounts * unit_prices[sku_indices])
+        return group_amounts.tolist(), group_costs.tolist()
+
+
+@lru_cache(maxsize=None)
+def has_numpy():
+    """Check whether the vectorized engine can be used"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def create_cost_engine(pricing_service, as_of=None, row_count=0, vectorized=None):
+    """Create a cost engine, vectorized when NumPy is installed and the usage is large enough
+
+    `vectorized` forces the choice, NumPy missing always falls back to pure Python.
+    """
+    if vectorized is None:
+        vectorized = row_count >= VECTORIZE_MIN_ROWS
+    if vectorized and has_numpy():
+        return NumpyCostEngine(pricing_service, as_of)
+    return PythonCostEngine(pricing_service, as_of)
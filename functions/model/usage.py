@@ -1,54 +1,120 @@
-from collections import defaultdict
 import logging
+from array import array
+from model.cost_engine import create_cost_engine
+from model.usage_store import UsageStore
+from service.pricing import DEFAULT_CURRENCY
+
+# Group key packs the interned IDs into one int, far smaller than a tuple per group
+_SKU_BITS = 24
+_TYPE_BITS = 16
+_NAME_BITS = 32
+
+def _group_key(sku_id, name_id, type_id, module_id):
+    return (((((module_id << _NAME_BITS) | name_id) << _TYPE_BITS) | type_id) << _SKU_BITS) | sku_id
+
+def _split_group_key(key):
+    sku_id = key & ((1 << _SKU_BITS) - 1)
+    key >>= _SKU_BITS
+    type_id = key & ((1 << _TYPE_BITS) - 1)
+    key >>= _TYPE_BITS
+    return sku_id, key & ((1 << _NAME_BITS) - 1), type_id, key >> _NAME_BITS
+
+def _plain_number(value):
+    """Amounts are stored as floats, report whole ones as int"""
+    return int(value) if float(value).is_integer() else value
+
+class UsageSummary:
+    """Priced usage aggregated by SKU and resource"""
+
+    __slots__ = ("rows", "total")
+
+    def __init__(self, rows, total):
+        self.rows = rows
+        self.total = total
+
 
 class UsageCollector:
     """Collects and manages resource usage data"""
     
-    def __init__(self, pricing_service):
-        self.usage = []
+    def __init__(self, pricing_service, as_of=None, vectorized=None):
+        self.usage = UsageStore()
         self.pricing_service = pricing_service
+        # POSIX timestamp the prices are taken at, None means now
+        self.as_of = as_of
+        # None picks the NumPy engine for large usage when NumPy is installed
+        self.vectorized = vectorized
+        # Address of the module of the resources being processed, "" for the root module
+        self.module = ""
+        self._reset_aggregates()
+    
+    def _reset_aggregates(self):
+        # Running aggregate by (sku, resource name, resource type) in order of appearance
+        self._group_positions = {}
+        self._group_sku_ids = array("q")
+        self._group_amounts = array("d")
+        # Running total amount per interned SKU ID
+        self._sku_totals = array("d")
+        self._summary = None
     
     def add_usage(self, sku, amount, resource_name, resource_type):
         """Add a usage record to the collector"""
-        self.usage.append({
-            "sku": sku, 
-            "amount": amount, 
-            "resource_name": resource_name, 
-            "resource_type": resource_type
-        })
+        sku_id, name_id, type_id, module_id = self.usage.append(sku, amount, resource_name, resource_type, self.module)
+        key = _group_key(sku_id, name_id, type_id, module_id)
+
+        group = self._group_positions.get(key)
+        if group is None:
+            self._group_positions[key] = len(self._group_amounts)
+            self._group_sku_ids.append(sku_id)
+            self._group_amounts.append(amount)
+        else:
+            self._group_amounts[group] += amount
+
+        if sku_id == len(self._sku_totals):
+            self._sku_totals.append(amount)
+        else:
+            self._sku_totals[sku_id] += amount
+
+        self._summary = None
+
+    def summary(self):
+        """Get the priced summary, computed once until more usage is added"""
+        if self._summary is None:
+            self._summary = self._materialize()
+        return self._summary
     
-    def get_usage(self):
-        """Get a summarized view of usage data"""
-        summary = defaultdict(lambda: {"amount": 0, "cost": 0.0})
-
-        for item in self.usage:
-            sku = item.get("sku")
-            full_name = self.pricing_service.get_sku_name(sku)
-            amount = item.get("amount")
-            cost = self.pricing_service.get_latest_price(sku) * amount
-            unit = self.pricing_service.get_sku_unit(sku)
-            resource_name = item.get("resource_name")
-            resource_type = item.get("resource_type")
-
-            key = (sku, full_name, unit, resource_name, resource_type)
-            summary[key]["amount"] += amount
-            summary[key]["cost"] += cost
-        
-        # Convert the summary to a list of dictionaries with lowercase keys
-        result = []
-        for key, value in summary.items():
-            sku, full_name, unit, resource_name, resource_type = key
-            result.append({
-                "sku_id": sku,
-                "sku_name": full_name,
-                "amount": value["amount"],
-                "cost": value["cost"],
+    def _materialize(self):
+        store = self.usage
+        sku_ids = store.skus.values
+        group_count = len(self._group_amounts)
+        engine = create_cost_engine(self.pricing_service, self.as_of, group_count, self.vectorized)
+
+        # Quantity tiers apply to the total of a SKU across the plan, not to each row
+        _, sku_costs = engine.sku_costs(sku_ids, range(len(sku_ids)), self._sku_totals)
+        _, group_costs = engine.group_costs(sku_ids, self._group_sku_ids, self._group_amounts, range(group_count), group_count)
+
+        sku_details = [(self.pricing_service.get_sku_name(sku), self.pricing_service.get_sku_unit(sku)) for sku in sku_ids]
+        rows = []
+        for key, group in self._group_positions.items():
+            sku_id, name_id, type_id, module_id = _split_group_key(key)
+            sku_name, unit = sku_details[sku_id]
+            rows.append({
+                "sku_id": sku_ids[sku_id],
+                "sku_name": sku_name,
+                "amount": _plain_number(self._group_amounts[group]),
+                "cost": group_costs[group],
                 "unit": unit,
-                "resource_name": resource_name,
-                "resource_type": resource_type
+                "resource_name": store.resource_names.values[name_id],
+                "resource_type": store.resource_types.values[type_id],
+                "module": store.modules.values[module_id]
             })
 
-        return result
+        total = sum(sku_costs)
+        logging.info(f"Usage summary: {len(store)} rows, {len(sku_ids)} SKUs, {total:.2f} per hour")
+        return UsageSummary(rows, total)
+    
+    def get_usage(self):
+        """Get a summarized view of usage data"""
+        return list(self.summary().rows)
     
     def print_usage(self):
         """Print usage data in a tabular format"""
@@ -56,53 +122,32 @@ class UsageCollector:
             from tabulate import tabulate
             
             table_data = []
-            headers = ["SKU", "Description", "Amount", "Cost(RUB)", "Unit", "Resource Name", "Resource Type"]
-
-            summary = defaultdict(lambda: {"amount": 0, "cost": 0.0})
-
-            for item in self.usage:
-                sku = item.get("sku")
-                full_name = self.pricing_service.get_sku_name(sku)
-                amount = item.get("amount")
-                cost = self.pricing_service.get_latest_price(sku) * amount
-                unit = self.pricing_service.get_sku_unit(sku)
-                resource_name = item.get("resource_name")
-                resource_type = item.get("resource_type")
-
-                key = (sku, full_name, unit, resource_name, resource_type)
-                summary[key]["amount"] += amount
-                summary[key]["cost"] += cost
+            headers = ["SKU", "Description", "Amount", f"Cost({self.pricing_service.currency or DEFAULT_CURRENCY})", "Unit", "Resource Name", "Resource Type", "Module"]
 
-            for key, value in summary.items():
-                sku, full_name, unit, resource_name, resource_type = key
+            for item in self.summary().rows:
                 row = [
-                    sku,
-                    full_name,
-                    value["amount"],
-                    f"{value['cost']:.2f}",
-                    unit,
-                    resource_name,
-                    resource_type
+                    item["sku_id"],
+                    item["sku_name"],
+                    item["amount"],
+                    f"{item['cost']:.2f}",
+                    item["unit"],
+                    item["resource_name"],
+                    item["resource_type"],
+                    item["module"]
                 ]
                 table_data.append(row)
 
             print(tabulate(table_data, headers=headers, tablefmt="grid"))
         except ImportError:
             logging.warning("tabulate package not found, using simple print instead")
-            for item in self.get_usage():
+            for item in self.summary().rows:
                 print(item)
     
     def calculate_total(self):
         """Calculate the total cost of all usage"""
-        total = 0
-        for item in self.usage:
-            sku_id = item['sku']
-            amount = item['amount']
-            latest_price = self.pricing_service.get_latest_price(sku_id)
-            total += amount * latest_price
-            logging.info(f"{sku_id} - {amount * latest_price * 24 * 30}")
-        return total
+        return self.summary().total
     
     def clear(self):
         """Clear all usage data"""
         self.usage.clear()
+        self._reset_aggregates()
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+# Resources whose usage rows are kept, least recently used are dropped, 0 disables the cache
+DEFAULT_SIZE = int(os.environ.get("USAGE_CACHE_SIZE", "10000"))
+# Part of every cache version, bump when the cached rows or how they are replayed change
+FORMAT_VERSION = 1
+
+def resource_fingerprint(resource, version=""):
+    """Hash the type and values of a resource, with the version of the data its usage is derived from"""
+    encoded = json.dumps([resource["type"], resource.get("values")], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(f"{version}\0{encoded}".encode("utf-8"), digest_size=16).hexdigest()
+
+class UsageRecorder:
+    """Forwards the usage of one resource to a collector and keeps its rows for the cache"""
+
+    __slots__ = ("collector", "resource_name", "resource_type", "rows", "cacheable")
+
+    def __init__(self, collector, resource_name, resource_type):
+        self.collector = collector
+        self.resource_name = resource_name
+        self.resource_type = resource_type
+        self.rows = []
+        self.cacheable = True
+
+    def add_usage(self, sku, amount, resource_name, resource_type):
+        self.collector.add_usage(sku, amount, resource_name, resource_type)
+        # Rows are replayed under the name of the resource, other names can't be cached
+        if resource_name != self.resource_name or resource_type != self.resource_type:
+            self.cacheable = False
+        self.rows.append((sku, amount))
+
+
+class UsageCache:
+    """LRU of the usage rows of processed resources, keyed by resource fingerprint"""
+
+    def __init__(self, max_size=DEFAULT_SIZE, version=""):
+        self.max_size = max_size
+        # Catalog and preset version, part of every key, a callable is resolved on first use
+        self._version = version
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def version(self):
+        if callable(self._version):
+            self._version = self._version()
+        return self._version
+
+    def key(self, resource):
+        return resource_fingerprint(resource, self.version)
+
+    def get(self, key):
+        """Get the cached (sku, amount) rows of a resource, None on a miss"""
+        rows = self._entries.get(key)
+        if rows is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return rows
+
+    def put(self, key, rows):
+        self._entries[key] = tuple(rows)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path):
+        """Write the entries to a file, least recently used first"""
+        data = {"version": self.version, "entries": [[key, rows] for key, rows in self._entries.items()]}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """Add the entries of a saved cache, ignored if it was saved for another version"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except ValueError as e:
+            logging.warning(f"Usage cache {path} can't be read: {e}")
+            return 0
+        if data.get("version") != self.version:
+            logging.info(f"Usage cache {path} was saved for another catalog version, ignored")
+            return 0
+        for key, rows in data.get("entries", []):
+            self.put(key, (tuple(row) for row in rows))
+        return len(data.get("entries", []))
@@ -0,0 +1,115 @@
+from array import array
+
+class StringInterner:
+    """Maps repeated strings to small integer IDs"""
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self):
+        self.values = []
+        self._ids = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def intern(self, value):
+        """Get the ID of a string, assigning the next one if it is new"""
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def clear(self):
+        self.values.clear()
+        self._ids.clear()
+
+
+class UsageRow:
+    """Read-only view of one stored usage row, indexable like the former row dicts"""
+
+    __slots__ = ("_store", "_position")
+
+    FIELDS = ("sku", "amount", "resource_name", "resource_type", "module")
+
+    def __init__(self, store, position):
+        self._store = store
+        self._position = position
+
+    def __getitem__(self, field):
+        store = self._store
+        position = self._position
+        if field == "sku":
+            return store.skus.values[store.sku_ids[position]]
+        if field == "amount":
+            return store.amounts[position]
+        if field == "resource_name":
+            return store.resource_names.values[store.resource_name_ids[position]]
+        if field == "resource_type":
+            return store.resource_types.values[store.resource_type_ids[position]]
+        if field == "module":
+            return store.modules.values[store.module_ids[position]]
+        raise KeyError(field)
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self):
+        return {field: self[field] for field in self.FIELDS}
+
+    def __repr__(self):
+        return f"UsageRow({self.to_dict()})"
+
+
+class UsageStore:
+    """Columnar usage storage: array-backed amounts and interned string IDs"""
+
+    def __init__(self):
+        self.skus = StringInterner()
+        self.resource_names = StringInterner()
+        self.resource_types = StringInterner()
+        # Module addresses, "" for the root module
+        self.modules = StringInterner()
+        # One entry per row, 8 bytes each
+        self.sku_ids = array("q")
+        self.resource_name_ids = array("q")
+        self.resource_type_ids = array("q")
+        self.module_ids = array("q")
+        self.amounts = array("d")
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("usage row index out of range")
+        return UsageRow(self, position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield UsageRow(self, position)
+
+    def append(self, sku, amount, resource_name, resource_type, module=""):
+        """Store a usage row and return its interned (sku, resource name, resource type, module) IDs"""
+        key = (self.skus.intern(sku), self.resource_names.intern(resource_name), self.resource_types.intern(resource_type), self.modules.intern(module))
+        self.sku_ids.append(key[0])
+        self.resource_name_ids.append(key[1])
+        self.resource_type_ids.append(key[2])
+        self.module_ids.append(key[3])
+        self.amounts.append(amount)
+        return key
+
+    def clear(self):
+        """Remove all rows"""
+        for interner in (self.skus, self.resource_names, self.resource_types, self.modules):
+            interner.clear()
+        for column in (self.sku_ids, self.resource_name_ids, self.resource_type_ids, self.module_ids, self.amounts):
+            del column[:]
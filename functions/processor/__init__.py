@@ -1,44 +1,154 @@
+import importlib
+import logging
 from processor.base import ResourceProcessor
-from processor.compute import ComputeInstanceProcessor, ComputeDiskProcessor, ComputeFilesystemProcessor, ComputeInstanceGroupProcessor
-from processor.database import MDBMySQLProcessor, MDBPostgreProcessor, MDBClickhouseProcessor, MDBGreenplumProcessor, MDBKafkaProcessor, MDBRedisProcessor, MDBOpensearchProcessor, MDBYDBProcessor
-from processor.kubernetes import KubernetesClusterProcessor, KubernetesNodeGroupProcessor
-from processor.network import VPCAddressProcessor
+
+# Entry point group for third-party processors, entry point name is the resource type:
+#   [project.entry-points."tfcost.processors"]
+#   yandex_lockbox_secret = "my_package.lockbox:LockboxSecretProcessor"
+ENTRY_POINT_GROUP = "tfcost.processors"
+
+# Processor modules by resource type prefix, imported when a matching type first appears
+PROCESSOR_FAMILIES = (
+    ("yandex_compute_", "processor.compute"),
+    ("yandex_mdb_", "processor.database"),
+    ("yandex_ydb_", "processor.database"),
+    ("yandex_kubernetes_", "processor.kubernetes"),
+    ("yandex_vpc_", "processor.network"),
+)
+
+def family_module(resource_type):
+    """Get the name of the processor module for a resource type, None if there is none"""
+    for prefix, module_name in PROCESSOR_FAMILIES:
+        if resource_type.startswith(prefix):
+            return module_name
+    return None
+
+def family_classes(module_name):
+    """Import a processor module and get its processor classes in definition order"""
+    module = importlib.import_module(module_name)
+    return [
+        value for value in vars(module).values()
+        if isinstance(value, type) and issubclass(value, ResourceProcessor) and value.__module__ == module_name
+    ]
+
+def processor_classes():
+    """Get all processor classes, importing every processor module"""
+    classes = []
+    for module_name in dict.fromkeys(module_name for _, module_name in PROCESSOR_FAMILIES):
+        classes.extend(family_classes(module_name))
+    return tuple(classes)
+
+def __getattr__(name):
+    # PROCESSOR_CLASSES imports every processor module, so it is only built on access
+    if name == "PROCESSOR_CLASSES":
+        return processor_classes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def builtin_processor_class(resource_type):
+    """Get the built-in processor class of a resource type, None if there is none"""
+    module_name = family_module(resource_type)
+    if module_name is None:
+        return None
+    for processor_class in family_classes(module_name):
+        if resource_type in processor_class.resource_types:
+            return processor_class
+    return None
+
+def referenced_sku_ids():
+    """Get all SKU IDs the built-in and plugin processors can emit"""
+    sku_ids = set()
+    for processor_class in processor_classes():
+        sku_ids |= processor_class.sku_ids()
+    for processor_class in plugin_classes().values():
+        sku_ids |= processor_class.sku_ids()
+    return sku_ids
+
+def plugin_entry_points():
+    """Get third-party processor entry points by resource type"""
+    # importlib.metadata scans installed distributions, only done once a type is not built in
+    from importlib.metadata import entry_points
+    return {entry_point.name: entry_point for entry_point in entry_points(group=ENTRY_POINT_GROUP)}
+
+def load_plugin(resource_type, entry_point):
+    """Load the processor class of a plugin entry point, None if it fails or doesn't declare the resource type"""
+    try:
+        processor_class = entry_point.load()
+    except Exception as e:
+        logging.error(f"Failed to load processor plugin '{entry_point.value}' for {resource_type}: {e}")
+        return None
+    if resource_type not in processor_class.resource_types:
+        logging.error(f"Processor plugin '{entry_point.value}' does not declare {resource_type} in resource_types")
+        return None
+    return processor_class
+
+def plugin_classes():
+    """Load the third-party processor classes by resource type, types with a built-in processor are left out"""
+    classes = {}
+    for resource_type, entry_point in plugin_entry_points().items():
+        # Built-in processors win over plugins, as in ProcessorRegistry
+        if builtin_processor_class(resource_type) is not None:
+            continue
+        processor_class = load_plugin(resource_type, entry_point)
+        if processor_class is not None:
+            classes[resource_type] = processor_class
+    return classes
 
 class ProcessorRegistry:
     """Registry for resource processors"""
-    
+
     def __init__(self, pricing_service, resource_spec_service):
+        self.pricing_service = pricing_service
+        self.resource_spec_service = resource_spec_service
         self.processors = []
-        self._register_processors(pricing_service, resource_spec_service)
-    
-    def _register_processors(self, pricing_service, resource_spec_service):
-        """Register all available processors"""
-        # Compute processors
-        self.processors.append(ComputeInstanceProcessor(pricing_service, resource_spec_service))
-        self.processors.append(ComputeDiskProcessor(pricing_service, resource_spec_service))
-        self.processors.append(ComputeFilesystemProcessor(pricing_service, resource_spec_service))
-        self.processors.append(ComputeInstanceGroupProcessor(pricing_service, resource_spec_service))
-        
-        # Database processors
-        self.processors.append(MDBMySQLProcessor(pricing_service, resource_spec_service))
-        self.processors.append(MDBPostgreProcessor(pricing_service, resource_spec_service))
-        self.processors.append(MDBClickhouseProcessor(pricing_service, resource_spec_service))
-        self.processors.append(MDBGreenplumProcessor(pricing_service, resource_spec_service))
-        self.processors.append(MDBKafkaProcessor(pricing_service, resource_spec_service))
-        self.processors.append(MDBRedisProcessor(pricing_service, resource_spec_service))
-        self.processors.append(MDBOpensearchProcessor(pricing_service, resource_spec_service))
-        self.processors.append(MDBYDBProcessor(pricing_service, resource_spec_service))
-        
-        # Kubernetes processors
-        self.processors.append(KubernetesClusterProcessor(pricing_service, resource_spec_service))
-        self.processors.append(KubernetesNodeGroupProcessor(pricing_service, resource_spec_service))
-        
-        # Network processors
-        self.processors.append(VPCAddressProcessor(pricing_service, resource_spec_service))
-    
+        self._loaded_modules = set()
+        self._plugins = None
+        # Resource type -> processor, None for types nothing can process
+        self._by_type = {}
+
+    def register(self, processor_class):
+        """Instantiate a processor class and dispatch its resource types to it"""
+        processor = processor_class(self.pricing_service, self.resource_spec_service)
+        self.processors.append(processor)
+        for resource_type in processor_class.resource_types:
+            # Built-in processors win over plugins, the first registration wins
+            if self._by_type.get(resource_type) is None:
+                self._by_type[resource_type] = processor
+        return processor
+
+    def _load_family(self, module_name):
+        """Register the processors of a module on first use"""
+        if module_name in self._loaded_modules:
+            return
+        self._loaded_modules.add(module_name)
+        for processor_class in family_classes(module_name):
+            self.register(processor_class)
+        logging.debug(f"Processor module {module_name} loaded")
+
+    def _load_plugin(self, resource_type):
+        """Register the third-party processor of a resource type, if one is installed"""
+        if self._plugins is None:
+            self._plugins = plugin_entry_points()
+        entry_point = self._plugins.get(resource_type)
+        if entry_point is None:
+            return
+        processor_class = load_plugin(resource_type, entry_point)
+        if processor_class is None:
+            return
+        self.register(processor_class)
+        logging.info(f"Processor plugin '{entry_point.value}' loaded for {resource_type}")
+
     def get_processor(self, resource_type):
         """Get a processor for the given resource type"""
-        for processor in self.processors:
-            if processor.can_process(resource_type):
-                return processor
-        return None
+        try:
+            return self._by_type[resource_type]
+        except KeyError:
+            pass
+
+        module_name = family_module(resource_type)
+        if module_name is not None:
+            self._load_family(module_name)
+        if resource_type not in self._by_type:
+            self._load_plugin(resource_type)
+
+        # Unsupported types are remembered, later resources of the type cost one dict lookup
+        return self._by_type.setdefault(resource_type, None)
@@ -1,14 +1,35 @@
+import json
+import logging
+
+# Placeholder used by processors for resources without a SKU in the billing catalog
+NO_SKU_ID = "no_sku_id"
+
 class ResourceProcessor:
     """Base class for all resource processors"""
     
+    # Terraform resource types handled by the processor, used for dispatch
+    resource_types = ()
+    # Every SKU ID process() can add, processors pricing from rule tables override sku_ids() instead
+    emitted_sku_ids = ()
+    
     def __init__(self, pricing_service, resource_spec_service):
         self.pricing_service = pricing_service
         self.resource_spec_service = resource_spec_service
     
     def can_process(self, resource_type):
         """Check if this processor can handle the given resource type"""
-        return False
+        return resource_type in self.resource_types
     
     def process(self, resource, usage_collector):
         """Process a resource and add usage to the collector"""
         pass
+    
+    def log_values(self, resource_values):
+        """Log the values of a processed resource, formatted only when DEBUG is enabled"""
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(json.dumps(resource_values, indent=4).replace('\n', '\r'))
+    
+    @classmethod
+    def sku_ids(cls):
+        """Get the SKU IDs this processor can emit, used to build price books"""
+        return set(cls.emitted_sku_ids) - {NO_SKU_ID}
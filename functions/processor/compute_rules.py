@@ -0,0 +1,163 @@
+from processor.base import NO_SKU_ID
+
+# Rule key for vCPU SKUs that do not depend on the core fraction
+ANY_FRACTION = None
+
+# Instance components in emission order, named after the keys of the Terraform resources block
+COMPONENTS = ("cores", "memory", "gpus")
+
+# Platform -> component -> (regular SKU, preemptible SKU).
+# vCPU SKUs are keyed by core fraction where the price depends on it, fractions missing here are not billed.
+COMPUTE_RULES = {
+    "standard-v3": {
+        "cores": {
+            100: ("dn2k3vqlk9snp1jv351u", "dn2e2fphfupugm21k4hv"), # Intel Ice Lake. 100% vCPU [core*hour]
+            50: ("dn2f0q0d6gtpcom4b1p6", "dn2333h2iv190t06bon8"), # Intel Ice Lake. 50% vCPU [core*hour]
+            20: ("dn2r8aklo79bmpkd87l3", "dn2pdedm5fon78kbl0fh"), # Intel Ice Lake. 20% vCPU [core*hour]
+        },
+        "memory": ("dn2ilq72mjc3bej6j74p", "dn26ur5frjbgdek2a0g5"), # Intel Ice Lake. RAM [gbyte*hour]
+    },
+    "standard-v2": {
+        "cores": {
+            100: ("dn218a07u143r9v1r5ms", "dn2ipnaa10sls6i7osfv"), # Intel Cascade Lake. 100% vCPU [core*hour]
+            50: ("dn2qbqi1am9oq6oc9s05", "dn20jng1b3a6ggtn52bo"), # Intel Cascade Lake. 50% vCPU [core*hour]
+            20: ("dn26skitjdon841jqit7", "dn2krclp8uj3432vmpre"), # Intel Cascade Lake. 20% vCPU [core*hour]
+            5: ("dn2l09d8brnv9s8m5p2r", "dn292ebti5dcjio7vh2s"), # Intel Cascade Lake. 5% vCPU [core*hour]
+        },
+        "memory": ("dn2fhtcoocq50j1uj4tg", "dn26ur5frjbgdek2a0g5"), # Intel Cascade Lake. RAM [gbyte*hour]
+    },
+    "standard-v1": {
+        "cores": {
+            100: ("dn299ll54t5jt2gojh7e", "dn247qigcq66fq6t3tk5"), # Intel Broadwell. 100% vCPU [core*hour]
+            20: ("dn2vmq6na03r9vlds7j8", "dn24sf8vh5cvj53voa7k"), # Intel Broadwell. 20% vCPU [core*hour]
+            5: ("dn2pm2gap1cc09a33s06", "dn2g5qo1211n5k8i1s3v"), # Intel Broadwell. 5% vCPU [core*hour]
+        },
+        "memory": ("dn2dka206olokggsieuu", "dn2u497ok1kl70on0ta2"), # Intel Broadwell. RAM [gbyte*hour]
+    },
+    "highfreq-v3": {
+        "cores": (NO_SKU_ID, NO_SKU_ID), # Intel Ice Lake (Compute Optimized). 100% vCPU [core*hour]
+        "memory": (NO_SKU_ID, NO_SKU_ID), # Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+    },
+    "standard-v3-t4": {
+        "cores": ("dn24b7m6qol7tb7tukga", "dn2lsfskfirek2985fnd"), # Intel Ice Lake with Nvidia T4. 100% vCPU [core*hour]
+        "memory": ("dn2lg2hrvbn5b8lm7em4", "dn2im0g43iedeohe4sac"), # Intel Ice Lake with Nvidia T4. RAM [gbyte*hour]
+        "gpus": ("dn20ml8ifdps6m7048an", "dn2cpk4mc82b1vib72e5"), # Intel Ice Lake with Nvidia T4. GPU [gpus*hour]
+    },
+    "standard-v3-t4i": {
+        "cores": ("dn242l2ivnhdd5so2oga", "dn2960mi7268n67o8iae"), # Intel Ice lake with t4i. 100% vCPU [core*hour]
+        "memory": ("dn290pbmohupnus9ajb7", "dn25rffeums4j1ku5649"), # Intel Ice lake with t4i. RAM [gbyte*hour]
+        "gpus": ("dn2hql9evci880d8jq7i", "dn2qlml2u48bng4jgilh"), # Intel Ice lake with t4i. GPU [gpus*hour]
+    },
+    "gpu-standard-v3": {
+        "cores": ("dn28c1erut6m9f9uem08", "dn2tvs05nnrib706hgnt"), # AMD Epyc with Nvidia A100. 100% vCPU [core*hour]
+        "memory": ("dn21jcm82510bfa6is22", "dn2m4gusa7m7t4hl6vo2"), # AMD Epyc with Nvidia A100. RAM [gbyte*hour]
+        "gpus": ("dn2395q10bihjmm2b0v6", "dn211dses9ju3abvq0bs"), # AMD Epyc with Nvidia A100. GPU [gpus*hour]
+    },
+    "gpu-standard-v3i": {
+        "cores": ("dn2fd3g50rub98vfprlt", "dn2o9fiqemifmch1dq7c"), # AMD Epyc 9474F with Gen2. 100% vCPU [core*hour]
+        "memory": ("dn2h5gi2u2l3bdclrput", "dn2mgiub24223fh5mvgv"), # AMD Epyc 9474F with Gen2. RAM [gbyte*hour]
+        "gpus": ("dn2jfrjoic5h3nh7e6jh", "dn2qvcfe8i5vqlrvterc"), # AMD Epyc 9474F with Gen2. GPU [gpus*hour]
+    },
+    "gpu-standard-v2": {
+        "cores": ("dn2udmu2aa9jm5a8f4ug", "dn2h4u30djq3jhh8dqh8"), # Intel Cascade Lake with Nvidia Tesla v100. 100% vCPU [core*hour]
+        "memory": ("dn2qtp90p3r8l8vakmm6", "dn2hotj7skno0turhbq1"), # Intel Cascade Lake with Nvidia Tesla v100. RAM [gbyte*hour]
+        "gpus": ("dn2dlvuk2ecf6hu0kjtl", "dn23ppvthcls7rjt5pol"), # Intel Cascade Lake with Nvidia Tesla v100. GPU [gpus*hour]
+    },
+    "gpu-standard-v1": {
+        "cores": ("dn2sfcnkn3jlhmq568ac", "dn2t7aa68lehsmvo5mss"), # Intel Broadwell with Nvidia Tesla v100. 100% vCPU [core*hour]
+        "memory": ("dn2nccae8nra81iqphdn", "dn2k0omvmglh857u60vu"), # Intel Broadwell with Nvidia Tesla v100. RAM [gbyte*hour]
+        "gpus": ("dn2oroscvvtb6sqtt83i", "dn2lov15qqamcimfv84q"), # Intel Broadwell with Nvidia Tesla v100. GPU [gpus*hour]
+    },
+}
+
+# Disk type -> SKU, shared by disks, filesystems and boot disks
+DISK_RULES = {
+    "network-hdd": "dn2al287u6jr3a710u8g", # Standard network storage (HDD) [gbyte*hour]
+    "network-ssd": "dn27ajm6m8mnfcshbi61", # Fast network storage (SSD) [gbyte*hour]
+    "network-ssd-nonreplicated": "dn24kdllggk8ahsol15g", # Non-replicated fast network storage (SSD) [gbyte*hour]
+    "network-ssd-io-m3": "dn25ksor7p112bvs2qts", # Ultra fast network storage with 3 replicas (SSD) [gbyte*hour]
+}
+
+# Filesystems are only offered on HDD and SSD storage
+FILESYSTEM_DISK_TYPES = ("network-hdd", "network-ssd")
+
+PUBLIC_IP_SKU = "dn229q5mnmp58t58tfel" # Public IP address [fip*hour]
+
+DEFAULT_DISK_TYPE = "network-hdd"
+
+def compile_rules(rules):
+    """Flatten a rule table into a (platform, preemptible, core fraction, component) -> SKU dict"""
+    compiled = {}
+    for platform_id, components in rules.items():
+        for component, rule in components.items():
+            by_fraction = rule if isinstance(rule, dict) else {ANY_FRACTION: rule}
+            for core_fraction, (regular_sku, preemptible_sku) in by_fraction.items():
+                compiled[(platform_id, False, core_fraction, component)] = regular_sku
+                compiled[(platform_id, True, core_fraction, component)] = preemptible_sku
+    return compiled
+
+COMPUTE_SKUS = compile_rules(COMPUTE_RULES)
+
+def instance_usage(platform_id, preemptible, core_fraction, resources):
+    """Get (SKU ID, amount) pairs for the vCPUs, RAM and GPUs of one instance"""
+    preemptible = bool(preemptible)
+    usage = []
+    for component in COMPONENTS:
+        sku_id = COMPUTE_SKUS.get((platform_id, preemptible, core_fraction, component))
+        if sku_id is None:
+            sku_id = COMPUTE_SKUS.get((platform_id, preemptible, ANY_FRACTION, component))
+        if sku_id is not None:
+            usage.append((sku_id, resources.get(component, 0)))
+    return usage
+
+def disk_sku(disk_type, allowed_types=None):
+    """Get the SKU ID of a disk type, None if it is not billed"""
+    if allowed_types is not None and disk_type not in allowed_types:
+        return None
+    return DISK_RULES.get(disk_type)
+
+def boot_disk_params(boot_disk):
+    """Get the size and type block of a boot disk, instances nest it under initialize_params"""
+    initialize_params = boot_disk.get("initialize_params")
+    return initialize_params[0] if initialize_params else boot_disk
+
+def add_instance_usage(usage_collector, resource_name, resource_type, template, instance_num=1):
+    """Add the usage of instance_num instances built from an instance or instance template block"""
+    resources = template["resources"][0]
+    scheduling_policy = template.get("scheduling_policy") or [{}]
+    for sku_id, amount in instance_usage(
+        template.get("platform_id", "standard-v3"),
+        scheduling_policy[0].get("preemptible", False),
+        resources.get("core_fraction", 100),
+        resources,
+    ):
+        usage_collector.add_usage(sku_id, amount * instance_num, resource_name, resource_type)
+
+    boot_disk = template.get("boot_disk")
+    if boot_disk:
+        params = boot_disk_params(boot_disk[0])
+        boot_disk_size = params.get("size", 0)
+        sku_id = disk_sku(params.get("type", DEFAULT_DISK_TYPE))
+        if boot_disk_size > 0 and sku_id is not None:
+            usage_collector.add_usage(sku_id, boot_disk_size * instance_num, resource_name, resource_type)
+
+    network_interface = template.get("network_interface") or [{}]
+    if network_interface[0].get("nat", False):
+        usage_collector.add_usage(PUBLIC_IP_SKU, instance_num, resource_name, resource_type)
+
+def scale_size(scale_policy, min_size=0):
+    """Get the instance count of a scale policy block, the initial size for auto scaling"""
+    policy = scale_policy[0] if scale_policy else {}
+    if policy.get("auto_scale"):
+        return max(policy["auto_scale"][0]["initial"], min_size)
+    if policy.get("fixed_scale"):
+        return policy["fixed_scale"][0]["size"]
+    return 1
+
+def instance_sku_ids():
+    """Get the SKU IDs instances can emit"""
+    return (set(COMPUTE_SKUS.values()) | set(DISK_RULES.values()) | {PUBLIC_IP_SKU}) - {NO_SKU_ID}
+
+def disk_sku_ids(allowed_types=None):
+    """Get the SKU IDs disks of the allowed types can emit"""
+    return {sku_id for disk_type, sku_id in DISK_RULES.items() if allowed_types is None or disk_type in allowed_types}
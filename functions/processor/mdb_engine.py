@@ -0,0 +1,571 @@
+import logging
+from processor.base import NO_SKU_ID, ResourceProcessor
+
+# Rule keys for SKUs that do not depend on the platform or the core fraction
+ANY_PLATFORM = None
+ANY_FRACTION = None
+
+BYTES_IN_GIGABYTE = 1024 * 1024 * 1024
+
+# Host SKU tables: platform -> component -> SKU, vCPU SKUs keyed by core fraction where the price depends on it
+MDB_HOST_SKUS = {
+    "mysql": {
+        "standard-v3": {
+            "cores": {
+                100: "dn2mfa1c935rjc6t4eek", # MySQL. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn2lo0l3birckqii0kpd", # MySQL. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2nhjlpvll7kron0lv0", # MySQL. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn26hjuqup86h8g2dc4o", # MySQL. Intel Ice Lake (Compute Optimised). 100% vCPU [core*hour]
+            "memory": "dn2afr14vhrtu5rgvtvj", # MySQL. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn2ekqj88rk6cj186bgv", # MySQL. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn23em5ur8pmc5oe1ugg", # MySQL. Intel Cascade Lake. 50% vCPU [core*hour]
+                20: "dn29qcell9096oecia43", # MySQL. Intel Cascade Lake. 20% vCPU [core*hour]
+                5: "dn2ikmrgbcfqnq0e89rh", # MySQL. Intel Cascade Lake. 5% vCPU [core*hour]
+            },
+            "memory": "dn2q9cgq04cl6ju1j2k7", # MySQL. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+        "standard-v1": {
+            "cores": {
+                100: "dn2hi38l2amv53lnkudh", # MySQL. Intel Broadwell. 100% vCPU [core*hour]
+                50: "dn234519saji1v5gtbk7", # MySQL. Intel Broadwell. 50% vCPU [core*hour]
+                20: "dn24fhsc8h68f51o549s", # MySQL. Intel Broadwell. 20% vCPU [core*hour]
+                5: "dn2manmpat7cv2ge9kbm", # MySQL. Intel Broadwell. 5% vCPU [core*hour]
+            },
+            "memory": "dn2s8tj0qdakj5c49e5o", # MySQL. Intel Broadwell. RAM [gbyte*hour]
+        },
+    },
+    "postgresql": {
+        "standard-v3": {
+            "cores": {
+                100: "dn232gunmdllqdl5cicd", # PostgreSQL. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn20phj76ak2oh3m4sgn", # PostgreSQL. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2snd5f5rifj49dhovh", # PostgreSQL. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn2878t3j92nm7ht5tlq", # PostgreSQL. Intel Ice Lake (Compute Optimised). 100% vCPU [core*hour]
+            "memory": "dn2dflbiele6g9he24ee", # PostgreSQL. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn2foiqm6aoaghmjcr38", # PostgreSQL. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn2ac5geuj2i95lkh5te", # PostgreSQL. Intel Cascade Lake. 50% vCPU [core*hour]
+                20: "dn2k4nll5o0unlnnn0hf", # PostgreSQL. Intel Cascade Lake. 20% vCPU [core*hour]
+                5: "dn217kngosua0ige7glr", # PostgreSQL. Intel Cascade Lake. 5% vCPU [core*hour]
+            },
+            "memory": "dn2b1ve4tifofkbpqtlo", # PostgreSQL. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+        "standard-v1": {
+            "cores": {
+                100: "dn2n5qctucuvrif2l6v2", # PostgreSQL. Intel Broadwell. 100% vCPU [core*hour]
+                50: "dn24saqltp4lsu0kgc6a", # PostgreSQL. Intel Broadwell. 50% vCPU [core*hour]
+                20: "dn24heoov30dnk16kvqi", # PostgreSQL. Intel Broadwell. 20% vCPU [core*hour]
+                5: "dn26tqk6cr5ocu7v3j5i", # PostgreSQL. Intel Broadwell. 5% vCPU [core*hour]
+            },
+            "memory": "dn2i2qka7e75bh6ok7he", # PostgreSQL. Intel Broadwell. RAM [gbyte*hour]
+        },
+    },
+    "clickhouse": {
+        "standard-v3": {
+            "cores": {
+                100: "dn2h2fne3qa9bjv2mm0b", # ClickHouse. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn2slkf8qnvg3lohvlnk", # ClickHouse. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2cvuiesm49elnni1a5", # ClickHouse. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn277ac8ru4ub394msu1", # ClickHouse. Intel Ice Lake (Compute Optimised). 100% vCPU [core*hour]
+            "memory": "dn2co8sk8cldl5on3ckf", # ClickHouse. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn2bo4tud2qeo60gr008", # ClickHouse. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn2qjtq7ee80fj9c2ot0", # ClickHouse. Intel Cascade Lake. 50% vCPU [core*hour]
+                20: "dn24kods372d64lhijmn", # ClickHouse. Intel Cascade Lake. 20% vCPU [core*hour]
+                5: "dn2ro2rucgm410h34tiu", # ClickHouse. Intel Cascade Lake. 5% vCPU [core*hour]
+            },
+            "memory": "dn2fol5odat55iak187k", # ClickHouse. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+        "standard-v1": {
+            "cores": {
+                100: "dn23nulcgejjcs3a5k6c", # ClickHouse. Intel Broadwell. 100% vCPU [core*hour]
+                50: "dn27d2sdttppcok68ikt", # ClickHouse. Intel Broadwell. 50% vCPU [core*hour]
+                20: "dn20nfs6nvqmsnvjdd5r", # ClickHouse. Intel Broadwell. 20% vCPU [core*hour]
+                5: "dn2bl87f2dv7shnmistk", # ClickHouse. Intel Broadwell. 5% vCPU [core*hour]
+            },
+            "memory": "dn2ci1m71mcpuans0njt", # ClickHouse. Intel Broadwell. RAM [gbyte*hour]
+        },
+    },
+    "clickhouse_zookeeper": {
+        "standard-v3": {
+            "cores": {
+                100: "dn270b41ltvr4qs6fdu0", # ZooKeeper. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn28oel39sj8kmfr78lk", # ZooKeeper. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2tg9g6pi4k18isqcq7", # ZooKeeper. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn29tpsi73qabnq4m9kb", # ZooKeeper for ClickHouse. Intel Ice Lake (Compute Optimized). 100% vCPU [core*hour]
+            "memory": "dn2i1lhi7dqj2nah4i2n", # ZooKeeper for ClickHouse. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn2g6deavckbovip5uu5", # ZooKeeper. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn2b40gt80iuh70kfpqc", # ZooKeeper. Intel Cascade Lake. 50% vCPU [core*hour]
+                20: "dn2iv9kja0ntvt3uocjm", # ZooKeeper. Intel Cascade Lake. 20% vCPU [core*hour]
+                5: "dn2ud13pi583kt52h4jv", # ZooKeeper. Intel Cascade Lake. 5% vCPU [core*hour]
+            },
+            "memory": "dn2hhsaqch2o4tkn1qnk", # ZooKeeper. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+        "standard-v1": {
+            "cores": {
+                100: "dn2a5pb4kkrvk6ra5vhk", # ZooKeeper. Intel Broadwell. 100% vCPU [core*hour]
+                50: "dn29aeejuka6vtvul02s", # ZooKeeper. Intel Broadwell. 50% vCPU [core*hour]
+                20: "dn2m7d3nj7qtfhi14gjv", # ZooKeeper. Intel Broadwell. 20% vCPU [core*hour]
+                5: "dn2vh46ucftq2ponpe4c", # ZooKeeper. Intel Broadwell. 5% vCPU [core*hour]
+            },
+            "memory": "dn2fg67mc3h26dqfs2s9", # ZooKeeper. Intel Broadwell. RAM [gbyte*hour]
+        },
+    },
+    # Greenplum hosts are billed the same for every core fraction
+    "greenplum": {
+        "standard-v3": {
+            "cores": "dn22vrmol6tmlqmnflh0", # Greenplum. Intel Ice Lake. 100% vCPU [core*hour]
+            "memory": "dn2fkkqvmd2dhlo7b07m", # Greenplum. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn21dgdltqrgdsodkm4i", # Greenplum. Intel Ice Lake (Compute Optimized). 100% vCPU [core*hour]
+            "memory": "dn2hom6ljm6s2js93o40", # Greenplum. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": "dn27vfbvh9mtobabcvd3", # Greenplum. Intel Cascade Lake. 100% vCPU [core*hour]
+            "memory": "dn2gbhl2hc3aun6t7dgm", # Greenplum. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+    },
+    "kafka": {
+        "standard-v3": {
+            "cores": {
+                100: "dn24mf6m837qdtfaus9o", # Apache Kafka®. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn2j1e6ag4ebi1lqhpb5", # Apache Kafka®. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2ftqohv8psorjabi12", # Apache Kafka®. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn2u61ode72vg51luvm5", # Apache Kafka®. Intel Ice Lake (Compute Optimized). 100% vCPU [core*hour]
+            "memory": "dn2u83rsns5m0bdk8pra", # Apache Kafka®. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn20mtnp2jnjj4km7u5g", # Apache Kafka®. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn25ij9c6ncskqe2v804", # Apache Kafka®. Intel Cascade Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn29ei2iq0joi59033pb", # Apache Kafka®. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+    },
+    "kafka_zookeeper": {
+        "standard-v3": {
+            "cores": {
+                100: "dn2nhhb7jic2747airrn", # ZooKeeper for Apache Kafka®. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn2gsmai0ju430119mqj", # ZooKeeper for Apache Kafka®. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2r01fpbih17tae9m00", # ZooKeeper for Apache Kafka®. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn2prkfjerh1oh1km220", # ZooKeeper for Apache Kafka®. Intel Ice Lake (Compute Optimized). 100% vCPU [core*hour]
+            "memory": "dn2un2g6tou5jrg18j3d", # ZooKeeper for Apache Kafka®. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn2rqdpeh829k7prtfng", # ZooKeeper for Apache Kafka®. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn2oobqd83ld4uucdr5g", # ZooKeeper for Apache Kafka®. Intel Cascade Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2kd8egpcfqmm4b9f1m", # ZooKeeper for Apache Kafka®. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+    },
+    "redis": {
+        "standard-v3": {
+            "cores": {
+                100: "dn2qrqp6uho94a80hgr3", # Redis. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn2olfc9i989aj43sdh9xx", # Redis. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2i5hfnisk3mg4rkl0v", # Redis. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn2p5vd4ccc8i53ia6bi", # Redis. Intel Ice Lake (Compute Optimized). 100% vCPU [core*hour]
+            "memory": "dn2sf9026ldfpoaflvju", # Redis. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn266b8r1i07682ojiiq", # Redis. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn26opl99hcbjqvo87gf", # Redis. Intel Cascade Lake. 50% vCPU [core*hour]
+                5: "dn2qgqnuuucr2uat9be2", # Redis. Intel Cascade Lake. 5% vCPU [core*hour]
+            },
+            "memory": "dn2gac3fpk1bsurdkf0h", # Redis. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+        "standard-v1": {
+            "cores": {
+                100: "dn2ta4lgerp02btumaic", # Redis. Intel Broadwell. 100% vCPU [core*hour]
+                20: "dn29cjcghhc5ihatrc35", # Redis. Intel Broadwell. 20% vCPU [core*hour]
+                5: "dn2gvhqj7nimn9jaofi0", # Redis. Intel Broadwell. 5% vCPU [core*hour]
+            },
+            "memory": "dn24sref9ucjdo6ut46k", # Redis. Intel Broadwell. RAM [gbyte*hour]
+        },
+    },
+    "opensearch": {
+        "standard-v3": {
+            "cores": {
+                100: "dn2rf1bupkvgk646cpqo", # OpenSearch. Intel Ice Lake. 100% vCPU [core*hour]
+                50: "dn2jeuof2ujtjeadau6i", # OpenSearch. Intel Ice Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn22dhakdgfrijul4v1f", # OpenSearch. Intel Ice Lake. RAM [gbyte*hour]
+        },
+        "highfreq-v3": {
+            "cores": "dn2p79o9d7r4tdm1s1jr", # OpenSearch. Intel Ice Lake (Compute Optimised). 100% vCPU [core*hour]
+            "memory": "dn2ko90o5lnvcgc0u6km", # OpenSearch. Intel Ice Lake (Compute Optimized). RAM [gbyte*hour]
+        },
+        "standard-v2": {
+            "cores": {
+                100: "dn211hvm5bgm4dl0gblv", # OpenSearch. Intel Cascade Lake. 100% vCPU [core*hour]
+                50: "dn2l6h3sovqem675uih2", # OpenSearch. Intel Cascade Lake. 50% vCPU [core*hour]
+            },
+            "memory": "dn2uga61a66rcda0igtk", # OpenSearch. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+    },
+    # YDB hosts are billed the same on every platform
+    "ydb": {
+        ANY_PLATFORM: {
+            "cores": "dn2uh84ab9ga5954i807", # YDB. Intel Cascade Lake. 100% vCPU [core*hour]
+            "memory": "dn24ok7m82d8uhe9g725", # YDB. Intel Cascade Lake. RAM [gbyte*hour]
+        },
+    },
+    # Not in the billing catalog yet, hosts are listed without a price
+    "mongodb": {
+        ANY_PLATFORM: {
+            "cores": NO_SKU_ID, # MongoDB. 100% vCPU [core*hour]
+            "memory": NO_SKU_ID, # MongoDB. RAM [gbyte*hour]
+        },
+    },
+}
+
+# Disk SKU tables: disk type -> SKU, types missing here are not billed
+MDB_DISK_SKUS = {
+    "mysql": {
+        "network-ssd": "dn2j7e6hs2j2ugni50lq", # Fast network storage — MySQL [gbyte*hour]
+        "network-hdd": "dn2thbds4400ckbijvch", # Standard network storage — MySQL [gbyte*hour]
+        "network-ssd-nonreplicated": "dn286bla0e9c7d2fnqst", # Non-replicated fast network storage — MySQL [gbyte*hour]
+        "network-ssd-io-m3": "dn2po189eb088u6kpa9o", # Ultra fast network storage with 3 replicas (SSD) — MySQL [gbyte*hour]
+        "local-ssd": "dn28goa6h2rkk2skokee", # Fast local storage — MySQL [gbyte*hour]
+    },
+    "postgresql": {
+        "network-ssd": "dn2euvjs01kht9oftfji", # Fast network storage — PostgreSQL [gbyte*hour]
+        "network-hdd": "dn2l0lh2aon42b2d7jb9", # Standard network storage — PostgreSQL [gbyte*hour]
+        "network-ssd-nonreplicated": "dn2t1rhogdm8t0gtao1s", # Non-replicated fast network storage — PostgreSQL [gbyte*hour]
+        "network-ssd-io-m3": "dn2vi9oeraem9ptu27ad", # Ultra fast network storage with 3 replicas (SSD) — PostgreSQL [gbyte*hour]
+        "local-ssd": "dn2nr78ch39birtq8cud", # Fast local storage — PostgreSQL [gbyte*hour]
+    },
+    "clickhouse": {
+        "network-ssd": "dn2mvvhqdpp24tm36ks4", # Fast network storage — ClickHouse [gbyte*hour]
+        "network-hdd": "dn2utn4rqnas617dfa2q", # Standard network storage — ClickHouse [gbyte*hour]
+        "network-ssd-nonreplicated": "dn2e0j7ko5l58njegum8", # Non-replicated fast network storage — ClickHouse [gbyte*hour]
+        "network-ssd-io-m3": "dn2lou40il2st50oh4pd", # Ultra fast network storage with 3 replicas (SSD) — ClickHouse [gbyte*hour]
+        "local-ssd": "dn222q64f5mcjm36ed4q", # Fast local storage — ClickHouse [gbyte*hour]
+    },
+    "greenplum": {
+        "network-ssd": "dn24ljti6nor6rm64n98", # Fast network storage — Greenplum [gbyte*hour]
+        "network-hdd": "dn2amtenb2bmhm5r3t26", # Standard network storage — Greenplum [gbyte*hour]
+        "network-ssd-nonreplicated": "dn281sknb94nk6dhg5f1", # Non-replicated fast network storage — Greenplum [gbyte*hour]
+        "network-ssd-io-m3": "dn2q30eprodapfghra4q", # Ultra fast network storage with 3 replicas (SSD) — Greenplum [gbyte*hour]
+        "local-ssd": "dn23vk0nguhc9qe9v30c", # Fast local storage — Greenplum [gbyte*hour]
+    },
+    "kafka": {
+        "network-ssd": "dn2du1uuuvjdqdpmsmsd", # Fast network storage — Apache Kafka® [gbyte*hour]
+        "network-hdd": "dn28vvrfmvdd2a9vhfus", # Standard network storage — Apache Kafka® [gbyte*hour]
+        "network-ssd-nonreplicated": "dn278mhc61kqavrjh26u", # Non-replicated fast network storage — Apache Kafka® [gbyte*hour]
+        "network-ssd-io-m3": "dn25ksor7p112bvs2qts", # Ultra fast network storage with 3 replicas (SSD) — Apache Kafka® [gbyte*hour]
+        "local-ssd": "dn26m07r3n3lfhu0sshg", # Fast local storage — Apache Kafka® [gbyte*hour]
+    },
+    "redis": {
+        "network-ssd": "dn2brvmhtb2i0o7gchn6", # Fast network storage — Redis [gbyte*hour]
+        "network-ssd-nonreplicated": "dn265o7f5n5dh8pcdes5", # Non-replicated fast network storage — Redis [gbyte*hour]
+        "network-ssd-io-m3": "dn2jbe8pp30806tb8dev", # Ultra fast network storage with 3 replicas (SSD) — Redis [gbyte*hour]
+        "local-ssd": "dn2b2d8c9e60npmqq41k", # Fast local storage — Redis [gbyte*hour]
+    },
+    "opensearch": {
+        "network-ssd": "dn28u08us0otvnpd7tiu", # Fast network storage — OpenSearch [gbyte*hour]
+        "network-hdd": "dn217fio8e4jq2bb93va", # Standard network storage — OpenSearch [gbyte*hour]
+        "network-ssd-nonreplicated": "dn2gt4e75hm80bpgk8i7", # Non-replicated fast network storage — OpenSearch [gbyte*hour]
+        "network-ssd-io-m3": "dn2690d7uj1the1vaggf", # Ultra fast network storage with 3 replicas (SSD) — OpenSearch [gbyte*hour]
+        "local-ssd": "dn2dnba7orfgdag64gmh", # Fast local storage — OpenSearch [gbyte*hour]
+    },
+    "ydb": {
+        "ydb-storage": "dn26b206u8r13m8go6d2", # YDB. Fast storage [gbyte*hour]
+    },
+    "mongodb": {
+        "network-ssd": NO_SKU_ID, # Fast network storage — MongoDB [gbyte*hour]
+        "network-hdd": NO_SKU_ID, # Standard network storage — MongoDB [gbyte*hour]
+        "network-ssd-nonreplicated": NO_SKU_ID, # Non-replicated fast network storage — MongoDB [gbyte*hour]
+        "network-ssd-io-m3": NO_SKU_ID, # Ultra fast network storage with 3 replicas (SSD) — MongoDB [gbyte*hour]
+        "local-ssd": NO_SKU_ID, # Fast local storage — MongoDB [gbyte*hour]
+    },
+}
+
+# Engine descriptors. Every engine names its presets in mdb.json ("presets"), its public IP SKU and its host
+# roles. Paths are key/index sequences into the cluster values, or into each node group for roles with "groups".
+# Role keys:
+#   host_skus, disk_skus  -- tables the role is billed from
+#   resources             -- path of the block holding the preset and the disk, default ("resources", 0)
+#   preset, disk_size, disk_type -- paths inside the resources block
+#   disk_type_default     -- disk type when the plan has none
+#   disk_scale            -- gigabytes per disk_size unit
+#   hosts, host_type      -- host list to count, only hosts of host_type if given
+#   host_count            -- path of the host count, or a fixed count; host_count_default when it is unset
+#   public_ip             -- "host" for per-host assign_public_ip flags, or the path of a flag covering all hosts
+#   groups                -- paths of node group lists, every node group is billed as one role
+#   optional              -- the role block may be missing from the plan
+MDB_ENGINES = {
+    "mysql": {
+        "presets": "mysql",
+        "public_ip_sku": "dn2non93sh0grnlrjb7m", # Public IP address - MySQL [fip*hour]
+        "roles": (
+            {"host_skus": "mysql", "disk_skus": "mysql", "hosts": ("host",), "public_ip": "host"},
+        ),
+    },
+    "postgresql": {
+        "presets": "postgresql",
+        "public_ip_sku": "dn2cc943s27vr5gviq0k", # Public IP address - PostgreSQL [fip*hour]
+        "roles": (
+            {"host_skus": "postgresql", "disk_skus": "postgresql", "resources": ("config", 0, "resources", 0),
+             "hosts": ("host",), "public_ip": "host"},
+        ),
+    },
+    "clickhouse": {
+        "presets": "clickhouse",
+        "public_ip_sku": "dn2riv150c97qbgpik5k", # Public IP address - ClickHouse [fip*hour]
+        "roles": (
+            {"host_skus": "clickhouse", "disk_skus": "clickhouse", "resources": ("clickhouse", 0, "resources", 0),
+             "hosts": ("host",), "host_type": "CLICKHOUSE", "public_ip": "host"},
+            # ZooKeeper hosts use ClickHouse storage SKUs and get no public IP
+            {"host_skus": "clickhouse_zookeeper", "disk_skus": "clickhouse", "resources": ("zookeeper", 0, "resources", 0),
+             "hosts": ("host",), "host_type": "ZOOKEEPER", "optional": True},
+        ),
+    },
+    "greenplum": {
+        "presets": "greenplum",
+        "public_ip_sku": "dn2gikj1nkrl5epq2ivi", # Public IP address - Greenplum [fip*hour]
+        "roles": (
+            {"host_skus": "greenplum", "disk_skus": "greenplum", "resources": ("master_subcluster", 0, "resources", 0),
+             "host_count": ("master_host_count",), "host_count_default": 0, "public_ip": ("assign_public_ip",)},
+            {"host_skus": "greenplum", "disk_skus": "greenplum", "resources": ("segment_subcluster", 0, "resources", 0),
+             "host_count": ("segment_host_count",), "host_count_default": 0},
+        ),
+    },
+    "kafka": {
+        "presets": "kafka",
+        "public_ip_sku": "dn2kol05hvp3tj76pqep", # Public IP address - Apache Kafka® [fip*hour]
+        "roles": (
+            {"host_skus": "kafka", "disk_skus": "kafka", "resources": ("config", 0, "kafka", 0, "resources", 0),
+             "host_count": ("config", 0, "brokers_count"), "public_ip": ("config", 0, "assign_public_ip")},
+            # Kafka runs three ZooKeeper hosts when they are not co-located with the brokers
+            {"host_skus": "kafka_zookeeper", "disk_skus": "kafka", "resources": ("config", 0, "zookeeper", 0, "resources", 0),
+             "host_count": 3, "optional": True},
+        ),
+    },
+    "redis": {
+        "presets": "redis",
+        "public_ip_sku": "dn21adn8pgvr7hr9jhh3", # Public IP address - Redis [fip*hour]
+        "roles": (
+            {"host_skus": "redis", "disk_skus": "redis", "disk_type_default": "network-ssd", "hosts": ("host",), "public_ip": "host"},
+        ),
+    },
+    "opensearch": {
+        "presets": "opensearch",
+        "public_ip_sku": "dn2mqb0g06ogqnsinbt2", # Public IP address - OpenSearch [fip*hour]
+        "roles": (
+            # OpenSearch and Dashboards node groups, disk sizes are given in bytes
+            {"host_skus": "opensearch", "disk_skus": "opensearch", "groups": (("config", "opensearch", "node_groups"), ("config", "dashboards", "node_groups")),
+             "resources": ("resources",), "disk_scale": 1 / BYTES_IN_GIGABYTE, "host_count": ("hosts_count",), "public_ip": ("assign_public_ip",)},
+        ),
+    },
+    "ydb": {
+        "presets": "ydb",
+        "public_ip_sku": None,
+        "roles": (
+            # Storage is requested in groups of 100 GB
+            {"host_skus": "ydb", "disk_skus": "ydb", "resources": (), "disk_size": ("storage_config", 0, "group_count"), "disk_scale": 100,
+             "disk_type": None, "disk_type_default": "ydb-storage", "host_count": ("scale_policy", 0, "fixed_scale", 0, "size")},
+        ),
+    },
+    "mongodb": {
+        "presets": "mongo",
+        "public_ip_sku": NO_SKU_ID, # Public IP address - MongoDB [fip*hour]
+        "roles": (
+            {"host_skus": "mongodb", "disk_skus": "mongodb", "resources": ("resources_mongod", 0),
+             "hosts": ("host",), "host_type": "MONGOD", "public_ip": "host"},
+            {"host_skus": "mongodb", "disk_skus": "mongodb", "resources": ("resources_mongocfg", 0),
+             "hosts": ("host",), "host_type": "MONGOCFG", "public_ip": "host", "optional": True},
+            {"host_skus": "mongodb", "disk_skus": "mongodb", "resources": ("resources_mongos", 0),
+             "hosts": ("host",), "host_type": "MONGOS", "public_ip": "host", "optional": True},
+            {"host_skus": "mongodb", "disk_skus": "mongodb", "resources": ("resources_mongoinfra", 0),
+             "hosts": ("host",), "host_type": "MONGOINFRA", "public_ip": "host", "optional": True},
+        ),
+        # Hosts without a type are mongod hosts
+        "default_host_type": "MONGOD",
+    },
+}
+
+ROLE_DEFAULTS = {
+    "resources": ("resources", 0),
+    "preset": ("resource_preset_id",),
+    "disk_size": ("disk_size",),
+    "disk_type": ("disk_type_id",),
+    "disk_type_default": "network-hdd",
+    "disk_scale": 1,
+    "hosts": None,
+    "host_type": None,
+    "host_count": None,
+    "host_count_default": 1,
+    "public_ip": None,
+    "groups": None,
+    "optional": False,
+}
+
+def compile_host_skus(tables):
+    """Flatten host SKU tables into a (table, platform, core fraction, component) -> SKU dict"""
+    compiled = {}
+    for table, platforms in tables.items():
+        for platform_id, components in platforms.items():
+            for component, rule in components.items():
+                by_fraction = rule if isinstance(rule, dict) else {ANY_FRACTION: rule}
+                for core_fraction, sku_id in by_fraction.items():
+                    compiled[(table, platform_id, core_fraction, component)] = sku_id
+    return compiled
+
+def compile_engines(engines):
+    """Fill in role defaults so processing does no per-key fallbacks"""
+    return {
+        engine: dict(descriptor, roles=tuple(dict(ROLE_DEFAULTS, **role) for role in descriptor["roles"]))
+        for engine, descriptor in engines.items()
+    }
+
+HOST_SKUS = compile_host_skus(MDB_HOST_SKUS)
+DISK_SKUS = {(table, disk_type): sku_id for table, disks in MDB_DISK_SKUS.items() for disk_type, sku_id in disks.items()}
+ENGINES = compile_engines(MDB_ENGINES)
+
+def host_sku(table, platform_id, core_fraction, component):
+    """Get the SKU ID of a host component, None if the platform or core fraction is not billed"""
+    for key in (
+        (table, platform_id, core_fraction, component),
+        (table, platform_id, ANY_FRACTION, component),
+        (table, ANY_PLATFORM, ANY_FRACTION, component),
+    ):
+        sku_id = HOST_SKUS.get(key)
+        if sku_id is not None:
+            return sku_id
+    return None
+
+def get_path(values, path, default=None):
+    """Follow a key/index path through plan values, default if any step is missing"""
+    for step in path:
+        try:
+            values = values[step]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return default if values is None else values
+
+def engine_sku_ids(engine):
+    """Get the SKU IDs an engine can emit"""
+    descriptor = ENGINES[engine]
+    sku_ids = {descriptor["public_ip_sku"]}
+    for role in descriptor["roles"]:
+        sku_ids |= {sku_id for key, sku_id in HOST_SKUS.items() if key[0] == role["host_skus"]}
+        sku_ids |= set(MDB_DISK_SKUS[role["disk_skus"]].values())
+    return sku_ids - {None, NO_SKU_ID}
+
+
+class MDBClusterProcessor(ResourceProcessor):
+    """Processor for managed database clusters described by an engine descriptor"""
+
+    # Key of the engine descriptor in ENGINES
+    engine = None
+
+    @classmethod
+    def sku_ids(cls):
+        return engine_sku_ids(cls.engine)
+
+    def _role_bases(self, role, resource_values):
+        """Get the plan blocks a role is billed for, the cluster itself or each of its node groups"""
+        if role["groups"] is None:
+            return [resource_values]
+        bases = []
+        for path in role["groups"]:
+            bases.extend(get_path(resource_values, path, []))
+        return bases
+
+    def _host_count(self, role, base, descriptor):
+        """Get the number of hosts of a role and how many of them have a public IP"""
+        hosts = role["hosts"]
+        if hosts is not None:
+            hosts = get_path(base, hosts, [])
+            if role["host_type"] is not None:
+                default_type = descriptor.get("default_host_type")
+                hosts = [host for host in hosts if host.get("type", default_type) == role["host_type"]]
+            public_ip_num = sum(1 for host in hosts if host.get("assign_public_ip") is True) if role["public_ip"] == "host" else 0
+            return len(hosts), public_ip_num
+
+        host_count = role["host_count"]
+        if not isinstance(host_count, int):
+            host_count = get_path(base, host_count, role["host_count_default"])
+        public_ip = role["public_ip"]
+        public_ip_num = host_count if public_ip is not None and get_path(base, public_ip, False) else 0
+        return host_count, public_ip_num
+
+    def process(self, resource, usage_collector):
+        resource_type = resource["type"]
+        resource_name = resource["name"]
+        resource_values = resource["values"]
+        descriptor = ENGINES[self.engine]
+
+        # Resolve every role first, a preset error bills nothing for the cluster
+        hosts = []
+        for role in descriptor["roles"]:
+            for base in self._role_bases(role, resource_values):
+                resources = get_path(base, role["resources"])
+                if resources is None:
+                    if role["optional"]:
+                        continue
+                    resources = {}
+                try:
+                    preset = self.resource_spec_service.get_mdb_preset(descriptor["presets"], get_path(resources, role["preset"]))
+                except ValueError as e:
+                    logging.error(e)
+                    return 1
+                hosts.append((role, resources, preset, self._host_count(role, base, descriptor)))
+
+        for role, resources, (cores, core_fraction, memory, platform_id), (host_num, _) in hosts:
+            for component, amount in (("cores", cores), ("memory", memory)):
+                sku_id = host_sku(role["host_skus"], platform_id, core_fraction, component)
+                if sku_id is not None:
+                    usage_collector.add_usage(sku_id, amount * host_num, resource_name, resource_type)
+
+        public_ip_num = sum(public_ip_num for _, _, _, (_, public_ip_num) in hosts)
+        if public_ip_num > 0 and descriptor["public_ip_sku"] is not None:
+            usage_collector.add_usage(descriptor["public_ip_sku"], public_ip_num, resource_name, resource_type)
+
+        for role, resources, _, (host_num, _) in hosts:
+            disk_type = get_path(resources, role["disk_type"], role["disk_type_default"]) if role["disk_type"] else role["disk_type_default"]
+            sku_id = DISK_SKUS.get((role["disk_skus"], disk_type))
+            if sku_id is None:
+                continue
+            disk_size = get_path(resources, role["disk_size"], 0)
+            if role["disk_scale"] != 1:
+                disk_size = round(disk_size * role["disk_scale"])
+            usage_collector.add_usage(sku_id, disk_size * host_num, resource_name, resource_type)
+
+        self.log_values(resource_values)
+        return 0
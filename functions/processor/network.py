@@ -1,10 +1,13 @@
 from processor.base import ResourceProcessor
 
+# Public IP address [gbyte*hour]
+ADDRESS_SKU = "dn229q5mnmp58t58tfel"
+
 class VPCAddressProcessor(ResourceProcessor):
     """Processor for VPC Address resources"""
     
-    def can_process(self, resource_type):
-        return resource_type == "yandex_vpc_address"
+    resource_types = ("yandex_vpc_address",)
+    emitted_sku_ids = (ADDRESS_SKU,)
     
     def process(self, resource, usage_collector):
         resource_type = resource["type"]
@@ -12,6 +15,6 @@ class VPCAddressProcessor(ResourceProcessor):
         resource_values = resource["values"]
 
         if resource_values.get("external_ipv4_address"):
-            usage_collector.add_usage("dn229q5mnmp58t58tfel", 1, resource_name, resource_type) # Public IP address [gbyte*hour]
+            usage_collector.add_usage(ADDRESS_SKU, 1, resource_name, resource_type)
 
         return 0
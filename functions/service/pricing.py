@@ -1,28 +1,218 @@
+import bisect
+import logging
+import time
+from datetime import datetime, timezone
+
+# Reported when the price list has no currency on its rates
+DEFAULT_CURRENCY = "RUB"
+
+def parse_timestamp(value):
+    """Convert an ISO 8601 string or a datetime into a POSIX timestamp"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        # Billing API uses the "Z" suffix, older Python versions don't accept it
+        value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class PriceTiers:
+    """Quantity tiers of one pricing version compiled into breakpoint arrays"""
+
+    __slots__ = ("starts", "unit_prices", "base_costs")
+
+    def __init__(self, rates):
+        rates = sorted((float(rate.get('startPricingQuantity', 0)), float(rate['unitPrice'])) for rate in rates)
+        self.starts = [start for start, _ in rates]
+        self.unit_prices = [unit_price for _, unit_price in rates]
+        # Cost of the quantity below each breakpoint, so pricing is one bisect
+        self.base_costs = [0.0]
+        for position in range(1, len(rates)):
+            width = self.starts[position] - self.starts[position - 1]
+            self.base_costs.append(self.base_costs[-1] + width * self.unit_prices[position - 1])
+
+    @property
+    def unit_price(self):
+        """Price of the first tier"""
+        return self.unit_prices[0] if self.unit_prices else 0
+
+    def is_flat(self):
+        """Check whether every unit costs the same"""
+        return len(self.starts) == 1 and self.starts[0] == 0
+
+    def cost(self, quantity):
+        """Get the cost of a total quantity spread across the tiers"""
+        position = bisect.bisect_right(self.starts, quantity) - 1
+        if position < 0:
+            return 0.0
+        return self.base_costs[position] + (quantity - self.starts[position]) * self.unit_prices[position]
+
+
+class SkuRecord:
+    """Pricing data of a single SKU resolved at index build time"""
+
+    __slots__ = ("name", "unit", "currency", "effective_times", "tiers")
+
+    def __init__(self, name, unit, effective_times, tiers, currency=None):
+        self.name = name
+        self.unit = unit
+        self.currency = currency
+        # Sorted by effective time, tiers[i] applies from effective_times[i]
+        self.effective_times = effective_times
+        self.tiers = tiers
+
+    def tiers_at(self, as_of):
+        """Get the price tiers effective at the given POSIX timestamp"""
+        position = bisect.bisect_right(self.effective_times, as_of) - 1
+        return self.tiers[position] if position >= 0 else None
+
+
 class PricingService:
     """Service for retrieving pricing information"""
-    
+
     def __init__(self, prices_data):
         self.prices_data = prices_data
-    
-    def get_latest_price(self, sku_id):
-        """Get the latest price for a SKU"""
+        self._index = {}
+        self._missing = set()
+        # Currency of the price list, taken from the rates of the first priced SKU
+        self.currency = None
+        self.index_build_time = 0.0
+        # prices_data is either parsed sku.json or a catalog backend with get(sku_id),
+        # e.g. MappedSkuCatalog, whose records are compiled on first lookup
+        self._backend = None if isinstance(prices_data, dict) else prices_data
+        if self._backend is None:
+            self._build_index()
+
+    def _build_index(self):
+        """Index SKUs by ID so that every lookup is a single dict access"""
+        started = time.perf_counter()
         for sku in self.prices_data['skus']:
-            if sku['id'] == sku_id:
-                latest_pricing_version = max(sku['pricingVersions'], key=lambda x: x['effectiveTime'])
-                latest_price = latest_pricing_version['pricingExpressions'][0]['rates'][0]['unitPrice']
-                return float(latest_price)
-        return 0
-    
+            # Keep the first occurrence, same as the former linear scan did
+            if sku['id'] not in self._index:
+                self._index[sku['id']] = self._add_currency(self._compile_sku(sku))
+        self.index_build_time = time.perf_counter() - started
+        logging.info(f"Pricing index built for {len(self._index)} SKUs in {self.index_build_time * 1000:.1f} ms")
+
+    @staticmethod
+    def _compile_sku(sku):
+        """Resolve name, unit and the pricing versions of a SKU sorted by effective time"""
+        versions = sorted(
+            (
+                (parse_timestamp(version['effectiveTime']), PriceTiers(version['pricingExpressions'][0]['rates']))
+                for version in sku.get('pricingVersions', [])
+            ),
+            key=lambda version: version[0]
+        )
+        currency = next(
+            (
+                rate['currency']
+                for version in sku.get('pricingVersions', [])
+                for rate in version['pricingExpressions'][0]['rates']
+                if 'currency' in rate
+            ),
+            None
+        )
+        return SkuRecord(
+            sku['name'],
+            sku['pricingUnit'],
+            [effective_time for effective_time, _ in versions],
+            [tiers for _, tiers in versions],
+            currency
+        )
+
+    def _add_currency(self, record):
+        if record.currency:
+            if self.currency is None:
+                self.currency = record.currency
+            elif record.currency != self.currency:
+                logging.warning(f"Price list mixes currencies {self.currency} and {record.currency}")
+        return record
+
+    def prepare(self, resource_types):
+        """Let a sharded catalog load what the given resource types need in one go"""
+        if hasattr(self._backend, "prepare"):
+            self._backend.prepare(resource_types)
+
+    def _tiers(self, sku_id, as_of):
+        record = self._lookup(sku_id)
+        if not record:
+            return None
+        return record.tiers_at(time.time() if as_of is None else as_of)
+
+    def _lookup(self, sku_id):
+        """Get the indexed record of a SKU or None if it is unknown"""
+        record = self._index.get(sku_id)
+        if record is not None or sku_id in self._missing:
+            return record
+
+        sku = self._backend.get(sku_id) if self._backend is not None else None
+        if sku is None:
+            # Remember unknown IDs (e.g. "no_sku_id") so they are reported only once
+            self._missing.add(sku_id)
+            logging.warning(f"SKU '{sku_id}' not found in the price list")
+            return None
+
+        record = self._index[sku_id] = self._add_currency(self._compile_sku(sku))
+        return record
+
+    def get_latest_price(self, sku_id, as_of=None):
+        """Get the first tier price of a SKU effective at `as_of` (POSIX timestamp, now by default)"""
+        tiers = self._tiers(sku_id, as_of)
+        return tiers.unit_price if tiers else 0
+
+    def get_cost(self, sku_id, quantity, as_of=None):
+        """Get the cost of a total quantity of a SKU, quantity tiers applied"""
+        tiers = self._tiers(sku_id, as_of)
+        return tiers.cost(quantity) if tiers else 0
+
+    def get_costs(self, sku_id, amounts, as_of=None):
+        """Price all amounts of one SKU together and split the cost between them
+
+        Tiers apply to the sum of the amounts, each amount gets a share of the
+        total cost proportional to its size.
+        """
+        tiers = self._tiers(sku_id, as_of)
+        if not tiers:
+            return [0] * len(amounts)
+        if tiers.is_flat():
+            unit_price = tiers.unit_price
+            return [amount * unit_price for amount in amounts]
+
+        total_amount = sum(amounts)
+        if total_amount == 0:
+            return [0.0] * len(amounts)
+        average_price = tiers.cost(total_amount) / total_amount
+        return [amount * average_price for amount in amounts]
+
     def get_sku_name(self, sku_id):
         """Get the name of a SKU"""
-        for sku in self.prices_data['skus']:
-            if sku['id'] == sku_id:
-                return sku['name']
-        return 0
-    
+        record = self._lookup(sku_id)
+        return record.name if record else 0
+
     def get_sku_unit(self, sku_id):
         """Get the pricing unit of a SKU"""
-        for sku in self.prices_data['skus']:
-            if sku['id'] == sku_id:
-                return sku['pricingUnit']
-        return 0
+        record = self._lookup(sku_id)
+        return record.unit if record else 0
+
+
+class DeferredPricingService:
+    """Stands in for a PricingService whose catalog is still loading
+
+    Usage can be collected meanwhile, the first price lookup blocks until the
+    catalog is loaded and re-raises any error the load ended with.
+    """
+
+    def __init__(self, future):
+        self._future = future
+
+    def ready(self):
+        return self._future.done()
+
+    def failed(self):
+        """Check whether the load has finished with an error"""
+        return self._future.done() and self._future.exception() is not None
+
+    def __getattr__(self, name):
+        return getattr(self._future.result(), name)
@@ -0,0 +1,223 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+
+# File layout:
+#   header     magic, version, SKU count, ID width, section offsets
+#   ID table   SKU IDs sorted and padded to ID width, each followed by its record number
+#   records    fixed-width references into the string pool
+#   pool       UTF-8 names and units, pricing versions as compact JSON
+MAGIC = b"YCSKUBIN"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<8sIIIQQQ")
+RECORD = struct.Struct("<IHIHII")
+RECORD_NUMBER = struct.Struct("<I")
+
+
+def compile_catalog(prices_data, output_path):
+    """Compile a sku.json structure into the binary catalog format"""
+    pool = bytearray()
+    pool_offsets = {}
+
+    def intern(value):
+        data = value.encode("utf-8")
+        offset = pool_offsets.get(data)
+        if offset is None:
+            offset = len(pool)
+            pool_offsets[data] = offset
+            pool.extend(data)
+        return offset, len(data)
+
+    skus = {}
+    for sku in prices_data["skus"]:
+        # Keep the first occurrence of a duplicated ID, same as PricingService
+        skus.setdefault(sku["id"], sku)
+
+    records = bytearray()
+    ids = []
+    for number, (sku_id, sku) in enumerate(skus.items()):
+        name_offset, name_length = intern(sku["name"])
+        unit_offset, unit_length = intern(sku["pricingUnit"])
+        versions = json.dumps(sku.get("pricingVersions", []), separators=(",", ":"))
+        versions_offset, versions_length = intern(versions)
+        records += RECORD.pack(name_offset, name_length, unit_offset, unit_length, versions_offset, versions_length)
+        ids.append((sku_id.encode("utf-8"), number))
+
+    ids.sort()
+    id_width = max((len(sku_id) for sku_id, _ in ids), default=0)
+    id_table = bytearray()
+    for sku_id, number in ids:
+        id_table += sku_id.ljust(id_width, b"\0") + RECORD_NUMBER.pack(number)
+
+    id_table_offset = HEADER.size
+    records_offset = id_table_offset + len(id_table)
+    pool_offset = records_offset + len(records)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(ids), id_width, id_table_offset, records_offset, pool_offset)
+
+    # Write next to the target and swap, so a running function never maps a half-written file
+    # Only needed when compiling, kept out of the handler import path
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".sku-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(id_table)
+            f.write(records)
+            f.write(pool)
+        os.replace(tmp_path, output_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+    logging.info(f"Compiled {len(ids)} SKUs into {output_path}")
+    return len(ids)
+
+
+class _IdTableView:
+    """Sequence of SKU IDs stored in the ID table, used for bisecting"""
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def __len__(self):
+        return self._catalog.count
+
+    def __getitem__(self, position):
+        return self._catalog._id_at(position)
+
+
+class MappedSkuCatalog:
+    """Read-only SKU catalog backed by a memory-mapped binary snapshot"""
+
+    def __init__(self, path):
+        self.path = path
+        # The mapping keeps its own descriptor and is released when the catalog is garbage collected
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, id_width, id_table_offset, records_offset, pool_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"File '{path}' is not a compiled SKU catalog")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported SKU catalog version {version} in '{path}'")
+
+        self.count = count
+        self._id_width = id_width
+        self._id_entry_size = id_width + RECORD_NUMBER.size
+        self._id_table_offset = id_table_offset
+        self._records_offset = records_offset
+        self._pool_offset = pool_offset
+
+    def __len__(self):
+        return self.count
+
+    def _id_at(self, position):
+        offset = self._id_table_offset + position * self._id_entry_size
+        return self._mm[offset:offset + self._id_width].rstrip(b"\0")
+
+    def _string(self, offset, length):
+        start = self._pool_offset + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _find(self, sku_id):
+        """Binary search the ID table, return the record number or None"""
+        key = sku_id.encode("utf-8")
+        if len(key) > self._id_width:
+            return None
+        position = bisect.bisect_left(_IdTableView(self), key)
+        if position < self.count and self._id_at(position) == key:
+            offset = self._id_table_offset + position * self._id_entry_size + self._id_width
+            return RECORD_NUMBER.unpack_from(self._mm, offset)[0]
+        return None
+
+    def get(self, sku_id):
+        """Decode a SKU in the sku.json shape, or None if it is not in the catalog"""
+        number = self._find(sku_id)
+        if number is None:
+            return None
+
+        name_offset, name_length, unit_offset, unit_length, versions_offset, versions_length = \
+            RECORD.unpack_from(self._mm, self._records_offset + number * RECORD.size)
+        return {
+            "id": sku_id,
+            "name": self._string(name_offset, name_length),
+            "pricingUnit": self._string(unit_offset, unit_length),
+            "pricingVersions": json.loads(self._string(versions_offset, versions_length))
+        }
+
+    def close(self):
+        """Release the mapping"""
+        self._mm.close()
+
+
+def is_compiled_catalog(path):
+    """Check whether a file is a compiled binary catalog"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class ShardedSkuCatalog:
+    """SKU catalog split into per-family shards, each shard is loaded on first use
+
+    The manifest written by `get-sku.py --shards` maps resource types and SKU
+    IDs to shard files, so only the shards a plan needs are ever parsed.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, self.MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        self._shard_files = manifest["shards"]
+        self._resource_types = manifest["resource_types"]
+        self._sku_shards = manifest["skus"]
+        self._skus = {}
+        self.loaded_shards = set()
+
+    def __len__(self):
+        return len(self._sku_shards)
+
+    def _load_shard(self, shard):
+        if shard in self.loaded_shards:
+            return
+        self.loaded_shards.add(shard)
+        with open(os.path.join(self.directory, self._shard_files[shard])) as f:
+            for sku in json.load(f)["skus"]:
+                self._skus.setdefault(sku["id"], sku)
+        logging.info(f"Catalog shard '{shard}' loaded")
+
+    def prepare(self, resource_types):
+        """Load the shards pricing the given resource types"""
+        for resource_type in resource_types:
+            shard = self._resource_types.get(resource_type)
+            if shard is not None:
+                self._load_shard(shard)
+
+    def get(self, sku_id):
+        """Get a SKU in the sku.json shape, loading its shard if needed, or None if it is unknown"""
+        sku = self._skus.get(sku_id)
+        if sku is None:
+            shard = self._sku_shards.get(sku_id)
+            if shard is None:
+                return None
+            self._load_shard(shard)
+            sku = self._skus.get(sku_id)
+        return sku
+
+
+def load_catalog(path):
+    """Load a price list from a shard directory, a compiled snapshot or sku.json"""
+    if os.path.isdir(path):
+        return ShardedSkuCatalog(path)
+    if is_compiled_catalog(path):
+        return MappedSkuCatalog(path)
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,124 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+
+SKUS_PATH = "/billing/v1/skus"
+SERVICES_PATH = "/billing/v1/services"
+
+def make_sku(sku_id, unit_price="1.0", service_id="test-service"):
+    """Build a SKU shaped like the Billing API response"""
+    return {
+        "id": sku_id,
+        "name": f"Test SKU {sku_id}",
+        "serviceId": service_id,
+        "pricingUnit": "hour",
+        "pricingVersions": [
+            {
+                "type": "STREET_PRICE",
+                "effectiveTime": "2023-01-01T00:00:00Z",
+                "pricingExpressions": [{"rates": [{"unitPrice": unit_price, "currency": "RUB"}]}]
+            }
+        ]
+    }
+
+
+class FakeBillingApi:
+    """Local stand-in for the Billing API SKU list, served over HTTP"""
+
+    def __init__(self, skus, page_size=2, latency=0.0):
+        self.skus = skus
+        self.page_size = page_size
+        # Seconds every response is delayed by
+        self.latency = latency
+        self.requests = []
+        # Client addresses seen, one per TCP connection
+        self.connections = set()
+        # Page token ("0" for the first page) -> status codes to answer before the page succeeds
+        self.failures = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        # Don't wait for kept-alive client connections on shutdown
+        self.server.daemon_threads = True
+        self.server.block_on_close = False
+        self.url = f"http://127.0.0.1:{self.server.server_port}{SKUS_PATH}"
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 so the client can keep the connection alive
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one write, otherwise Nagle delays every response
+            wbufsize = -1
+
+            def do_GET(self):
+                api.requests.append(self.path)
+                api.connections.add(self.client_address)
+                if api.latency:
+                    time.sleep(api.latency)
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path not in (SKUS_PATH, SERVICES_PATH):
+                    self._send(404, {"message": "not found"})
+                elif self.headers.get("Authorization") != "Bearer test-token":
+                    self._send(401, {"message": "unauthorized"})
+                elif url.path == SERVICES_PATH:
+                    self._send(200, api.services_page(query))
+                else:
+                    failures = api.failures.get(query.get("pageToken", ["0"])[0])
+                    if failures:
+                        self._send(failures.pop(0), {"message": "injected failure"})
+                        return
+                    self._send(200, api.page(query))
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _paginate(self, items, query, key):
+        """Page tokens are offsets into the item list"""
+        start = int(query.get("pageToken", ["0"])[0])
+        end = start + self.page_size
+        page = {key: items[start:end]}
+        if end < len(items):
+            page["nextPageToken"] = str(end)
+        return page
+
+    def page(self, query):
+        """Build the response for one page of SKUs, optionally filtered by service"""
+        skus = self.skus
+        match = re.fullmatch(r'serviceId="([^"]*)"', query.get("filter", [""])[0])
+        if match:
+            skus = [sku for sku in skus if sku["serviceId"] == match.group(1)]
+        return self._paginate(skus, query, "skus")
+
+    def services_page(self, query):
+        service_ids = list(dict.fromkeys(sku["serviceId"] for sku in self.skus))
+        return self._paginate([{"id": service_id, "name": service_id} for service_id in service_ids], query, "services")
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def billing_api():
+    api = FakeBillingApi([make_sku(f"test-sku-{i}") for i in range(5)])
+    api.start()
+    yield api
+    api.stop()
@@ -0,0 +1,79 @@
+import json
+import os
+import pytest
+import shutil
+import subprocess
+import sys
+from core.price_book import build_price_book, write_price_book
+from processor import referenced_sku_ids
+from tests.unit.conftest import make_sku
+from util.cold_start import BUDGET_MS
+
+FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+PLAN = {
+    "planned_values": {
+        "root_module": {
+            "resources": [{
+                "type": "yandex_compute_instance",
+                "name": "vm",
+                "values": {
+                    "platform_id": "standard-v3",
+                    "resources": [{"cores": 2, "memory": 4, "core_fraction": 100, "gpus": 0}],
+                    "network_interface": [{"nat": True}],
+                    "boot_disk": [{"initialize_params": [{"size": 20, "type": "network-ssd"}]}]
+                }
+            }]
+        }
+    }
+}
+
+# Runs in a fresh interpreter, so imports and loading are really cold
+COLD_START_SCRIPT = """
+import json, sys
+LAZY = ("processor.compute", "processor.database", "tabulate", "numpy", "requests", "tempfile")
+# Site hooks of the interpreter may have loaded some of them already, only imports by the handler count
+for name in LAZY:
+    sys.modules.pop(name, None)
+import main
+lazy = [name for name in LAZY if name in sys.modules]
+response = main.handler({"body": sys.argv[1], "queryStringParameters": {}}, None)
+from util import cold_start
+print(json.dumps({"status": response["statusCode"], "imported_early": lazy, "stages": cold_start.stages(),
+                  "loaded": [name for name in ("processor.compute", "processor.database") if name in sys.modules]}))
+"""
+
+# Budgets are multiplied by this factor so noisy runners don't fail on jitter, 0 skips the budget check
+BUDGET_TOLERANCE = float(os.environ.get("COLD_START_BUDGET_TOLERANCE", "2"))
+
+def run_cold_start(tmp_path):
+    """Run one request in a fresh interpreter against a price book, return its result and log output"""
+    catalog = {"skus": [make_sku(sku_id) for sku_id in sorted(referenced_sku_ids())]}
+    write_price_book(build_price_book(catalog), str(tmp_path / "price_book.json"))
+    shutil.copy(os.path.join(FUNCTIONS_DIR, "mdb.json"), tmp_path / "mdb.json")
+
+    env = dict(os.environ, PYTHONPATH=FUNCTIONS_DIR, COLD_START_TIMING="1")
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT, json.dumps(PLAN)],
+        cwd=tmp_path, env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(output.stdout.splitlines()[-1]), output.stderr
+
+class TestColdStart:
+    def test_cold_start_stages(self, tmp_path):
+        result, log = run_cold_start(tmp_path)
+
+        assert result["status"] == 200
+        # Optional and per-family modules stay out of the handler import path
+        assert result["imported_early"] == []
+        assert result["loaded"] == ["processor.compute"]
+        assert "Cold start: import took" in log
+        assert sorted(result["stages"]) == sorted(BUDGET_MS)
+
+    @pytest.mark.skipif(BUDGET_TOLERANCE <= 0, reason="COLD_START_BUDGET_TOLERANCE=0 disables the budget check")
+    def test_cold_start_budget(self, tmp_path):
+        result, _ = run_cold_start(tmp_path)
+
+        for stage, budget in BUDGET_MS.items():
+            limit = budget * BUDGET_TOLERANCE
+            assert result["stages"][stage] <= limit, f"{stage} took {result['stages'][stage]:.1f} ms, budget {budget} ms x {BUDGET_TOLERANCE}"
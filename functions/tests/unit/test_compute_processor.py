@@ -1,5 +1,6 @@
 import pytest
-from processor.compute import ComputeInstanceProcessor
+from processor.compute import ComputeDiskProcessor, ComputeFilesystemProcessor, ComputeInstanceGroupProcessor, ComputeInstanceProcessor
+from processor.compute_rules import ANY_FRACTION, COMPUTE_SKUS, instance_usage
 from unittest.mock import Mock
 
 class TestComputeInstanceProcessor:
@@ -82,3 +83,46 @@ class TestComputeInstanceProcessor:
         usage_collector_mock.add_usage.assert_any_call(
             "dn229q5mnmp58t58tfel", 1, "test-instance", "yandex_compute_instance"
         )
+
+
+class TestComputeRules:
+    def test_rules_compiled(self):
+        assert COMPUTE_SKUS[("standard-v2", True, 5, "cores")] == "dn292ebti5dcjio7vh2s"
+        assert COMPUTE_SKUS[("gpu-standard-v3", False, ANY_FRACTION, "gpus")] == "dn2395q10bihjmm2b0v6"
+        # Core fractions a platform does not offer are not billed, RAM still is
+        assert instance_usage("standard-v3", False, 5, {"cores": 2, "memory": 4}) == [("dn2ilq72mjc3bej6j74p", 4)]
+        assert instance_usage("unknown", False, 100, {"cores": 2, "memory": 4}) == []
+
+    def test_instance_group_all_platforms(self):
+        resource = {
+            "type": "yandex_compute_instance_group",
+            "name": "test-group",
+            "values": {
+                "scale_policy": [{"fixed_scale": [{"size": 3}]}],
+                "instance_template": [
+                    {
+                        "platform_id": "gpu-standard-v3",
+                        "resources": [{"cores": 28, "memory": 119, "gpus": 1}],
+                        "scheduling_policy": [{"preemptible": True}],
+                        "network_interface": [{"nat": False}],
+                        "boot_disk": [{"initialize_params": [{"size": 100, "type": "network-ssd"}]}]
+                    }
+                ]
+            }
+        }
+        usage_collector = Mock()
+        ComputeInstanceGroupProcessor(Mock(), Mock()).process(resource, usage_collector)
+
+        assert [c.args[:2] for c in usage_collector.add_usage.call_args_list] == [
+            ("dn2tvs05nnrib706hgnt", 84), ("dn2m4gusa7m7t4hl6vo2", 357), ("dn211dses9ju3abvq0bs", 3), ("dn27ajm6m8mnfcshbi61", 300)
+        ]
+
+    def test_filesystem_disk_types(self):
+        processor = ComputeFilesystemProcessor(Mock(), Mock())
+        usage_collector = Mock()
+        processor.process({"type": "yandex_compute_filesystem", "name": "fs", "values": {"size": 10, "type": "network-ssd-io-m3"}}, usage_collector)
+        usage_collector.add_usage.assert_not_called()
+        assert processor.sku_ids() == {"dn2al287u6jr3a710u8g", "dn27ajm6m8mnfcshbi61"}
+
+        ComputeDiskProcessor(Mock(), Mock()).process({"type": "yandex_compute_disk", "name": "disk", "values": {"size": 10, "type": "network-ssd-io-m3"}}, usage_collector)
+        usage_collector.add_usage.assert_called_once_with("dn25ksor7p112bvs2qts", 10, "disk", "yandex_compute_disk")
@@ -0,0 +1,150 @@
+import json
+import os
+import pytest
+import shutil
+from core import container as container_module
+from core.container import Container
+from service.sku_catalog import compile_catalog
+from tests.unit.conftest import make_sku
+
+MDB_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "mdb.json")
+
+class TestContainer:
+    @pytest.fixture
+    def container(self, tmp_path, monkeypatch):
+        price_lists = tmp_path / "price_lists"
+        price_lists.mkdir()
+        for name, currency in (("rub", "RUB"), ("usd", "USD"), ("kzt", "KZT")):
+            sku = make_sku("test-sku")
+            sku["pricingVersions"][0]["pricingExpressions"][0]["rates"][0]["currency"] = currency
+            with open(price_lists / f"{name}.json", "w") as f:
+                json.dump({"skus": [sku]}, f)
+
+        monkeypatch.setattr(Container, "PRICE_LISTS_DIR", str(price_lists))
+        monkeypatch.setattr(Container, "PRICE_LIST_CACHE_SIZE", 2)
+        container = Container()
+        container.initialize(str(price_lists / "rub.json"), MDB_PATH)
+        return container
+
+    def test_named_price_lists(self, container):
+        usd = container.get_estimator("usd")
+        assert usd is not container.get_estimator()
+        assert usd.process_plan({}, False)["currency"] == "USD"
+        assert container.get_estimator().process_plan({}, False)["currency"] == "RUB"
+        # Loaded once, the same indexed pricing service is reused
+        assert container.get_estimator("usd") is usd
+
+    def test_lru_eviction(self, container):
+        usd = container.get_estimator("usd")
+        container.get_estimator("rub")
+        container.get_estimator("usd")
+        container.get_estimator("kzt")
+        assert list(container._price_lists) == ["usd", "kzt"]
+        assert container.get_estimator("usd") is usd
+
+    def test_evicted_price_list_stays_usable(self, container):
+        compile_catalog({"skus": [make_sku("test-sku", unit_price="4.0")]}, os.path.join(container.PRICE_LISTS_DIR, "mapped.bin"))
+        in_flight = container.get_estimator("mapped")
+        container.get_estimator("usd")
+        container.get_estimator("kzt")
+        assert "mapped" not in container._price_lists
+        # An estimate holding the evicted estimator still reads the memory-mapped catalog
+        assert in_flight.pricing_service.get_latest_price("test-sku") == 4.0
+
+    def test_invalid_price_list(self, container):
+        with pytest.raises(ValueError):
+            container.get_estimator("../sku")
+        with pytest.raises(FileNotFoundError):
+            container.get_estimator("eur")
+
+    def test_hot_reload(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Container, "RELOAD_INTERVAL", 3600)
+        sku_path = tmp_path / "sku.json"
+        with open(sku_path, "w") as f:
+            json.dump({"skus": [make_sku("test-sku", unit_price="1.0")]}, f)
+        container = Container()
+        container.initialize(str(sku_path), MDB_PATH)
+        in_flight = container.get('pricing_service')
+
+        with open(sku_path, "w") as f:
+            json.dump({"skus": [make_sku("test-sku", unit_price="2.50")]}, f)
+        # Throttled: nothing is checked before the interval passes
+        assert container.check_for_updates() is None
+
+        container.check_for_updates(force=True).join()
+        assert container.get('pricing_service').get_latest_price("test-sku") == 2.5
+        assert container.get('estimator').pricing_service is container.get('pricing_service')
+        # The snapshot taken before the swap is left intact
+        assert in_flight.get_latest_price("test-sku") == 1.0
+        assert container.check_for_updates(force=True) is None
+
+    def test_background_load(self, tmp_path):
+        sku_path = tmp_path / "sku.json"
+        with open(sku_path, "w") as f:
+            json.dump({"skus": [make_sku("test-sku", unit_price="2.0")]}, f)
+        container = Container()
+        container.initialize(str(sku_path), MDB_PATH, background=True)
+
+        # The first lookup waits for the catalog
+        assert container.get('pricing_service').get_latest_price("test-sku") == 2.0
+        assert container.get('pricing_service').ready()
+        assert container.get_estimator().process_plan({}, False)["currency"] == "RUB"
+
+    def test_background_load_error(self, tmp_path):
+        sku_path = tmp_path / "sku.json"
+        sku_path.write_text("{truncated")
+        container = Container()
+        container.initialize(str(sku_path), MDB_PATH, background=True)
+        with pytest.raises(ValueError):
+            container.get('pricing_service').get_latest_price("test-sku")
+
+    def test_background_load_retried(self, tmp_path):
+        sku_path = tmp_path / "sku.json"
+        sku_path.write_text("{truncated")
+        container = Container()
+        container.initialize(str(sku_path), MDB_PATH, background=True)
+        with pytest.raises(ValueError):
+            container.get('pricing_service').get_latest_price("test-sku")
+        # Once the load has failed, get() retries it synchronously
+        with pytest.raises(ValueError):
+            container.get('pricing_service')
+
+        with open(sku_path, "w") as f:
+            json.dump({"skus": [make_sku("test-sku", unit_price="3.0")]}, f)
+        # The next request loads the catalog again instead of re-raising the first error
+        container.initialize()
+        assert container.get('pricing_service').get_latest_price("test-sku") == 3.0
+
+    def test_usage_cache_version(self, tmp_path, monkeypatch):
+        sku_path = tmp_path / "sku.json"
+        with open(sku_path, "w") as f:
+            json.dump({"skus": [make_sku("test-sku")]}, f)
+        mdb_path = tmp_path / "mdb.json"
+        shutil.copy(MDB_PATH, mdb_path)
+        cache_path = str(tmp_path / "usage_cache.json")
+        disk = {"type": "yandex_compute_disk", "name": "disk", "values": {"size": 10, "type": "network-hdd"}}
+        plan = {"planned_values": {"root_module": {"resources": [disk]}}}
+
+        def estimator():
+            container = Container()
+            container.initialize(str(sku_path), str(mdb_path))
+            return container.get_estimator()
+
+        first = estimator()
+        first.process_plan(plan, False)
+        first.usage_cache.save(cache_path)
+
+        # A fresh checkout of the same files has new timestamps
+        for path in (sku_path, mdb_path):
+            os.utime(path, ns=(1, 1))
+        assert estimator().usage_cache.load(cache_path) == 1
+
+        # Changed processor code invalidates the cache
+        os.mkdir(tmp_path / "processor")
+        with monkeypatch.context() as patch:
+            patch.setattr(container_module, "PROCESSOR_DIR", str(tmp_path / "processor"))
+            assert estimator().usage_cache.load(cache_path) == 0
+
+        with open(sku_path, "w") as f:
+            json.dump({"skus": [make_sku("test-sku", unit_price="2.0")]}, f)
+        assert estimator().usage_cache.load(cache_path) == 0
@@ -0,0 +1,56 @@
+import pytest
+from model.cost_engine import NumpyCostEngine, PythonCostEngine, create_cost_engine
+from service.pricing import PricingService
+
+class TestCostEngine:
+    @pytest.fixture
+    def pricing_service(self):
+        def sku(sku_id, rates):
+            return {
+                "id": sku_id,
+                "name": sku_id,
+                "pricingUnit": "gbyte*hour",
+                "pricingVersions": [{"effectiveTime": "2023-01-01T00:00:00Z", "pricingExpressions": [{"rates": rates}]}]
+            }
+        return PricingService({"skus": [
+            sku("flat", [{"unitPrice": "0.5"}]),
+            sku("tiered", [{"startPricingQuantity": "0", "unitPrice": "0"}, {"startPricingQuantity": "10", "unitPrice": "2"}])
+        ]})
+    
+    @pytest.fixture
+    def columns(self):
+        # (sku index, amount, group) for SKUs ["flat", "tiered", "unknown"]
+        rows = [(0, 4, 0), (1, 6, 1), (0, 2, 2), (1, 14, 3), (2, 3, 4), (0, 1, 0)]
+        return ["flat", "tiered", "unknown"], [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], 5
+    
+    def test_python_engine(self, pricing_service, columns):
+        sku_ids, sku_indices, amounts, group_ids, group_count = columns
+        engine = PythonCostEngine(pricing_service)
+        
+        totals, costs = engine.sku_costs(sku_ids, sku_indices, amounts)
+        assert totals == [7, 20, 3]
+        assert costs == [3.5, 20.0, 0]
+        
+        group_amounts, group_costs = engine.group_costs(sku_ids, sku_indices, amounts, group_ids, group_count)
+        assert group_amounts == [5, 6, 2, 14, 3]
+        # Tiers apply to the 20 units of "tiered" in total, not to 6 and 14 separately
+        assert group_costs == pytest.approx([2.5, 6.0, 1.0, 14.0, 0])
+    
+    def test_numpy_engine_matches_python(self, pricing_service, columns):
+        pytest.importorskip("numpy")
+        python_engine = PythonCostEngine(pricing_service)
+        numpy_engine = NumpyCostEngine(pricing_service)
+        
+        python_totals, python_costs = python_engine.sku_costs(*columns[:3])
+        numpy_totals, numpy_costs = numpy_engine.sku_costs(*columns[:3])
+        assert numpy_totals == python_totals
+        assert numpy_costs == pytest.approx(python_costs)
+        
+        python_amounts, python_group_costs = python_engine.group_costs(*columns)
+        numpy_amounts, numpy_group_costs = numpy_engine.group_costs(*columns)
+        assert numpy_amounts == python_amounts
+        assert numpy_group_costs == pytest.approx(python_group_costs)
+    
+    def test_create_cost_engine(self, pricing_service):
+        assert isinstance(create_cost_engine(pricing_service, row_count=10), PythonCostEngine)
+        assert isinstance(create_cost_engine(pricing_service, vectorized=False), PythonCostEngine)
@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import Mock
+from processor.database import MDBClickhouseProcessor, MDBKafkaProcessor, MDBMongoProcessor, MDBMySQLProcessor
+from processor.mdb_engine import ENGINES, HOST_SKUS, engine_sku_ids, host_sku
+from service.resource_spec import ResourceSpecService
+
+def usage_calls(usage_collector):
+    return [call.args[:2] for call in usage_collector.add_usage.call_args_list]
+
+class TestMDBClusterProcessor:
+    @pytest.fixture
+    def resource_spec_service(self):
+        preset = {"cores": 2, "memory": 8, "core_fraction": 100}
+        return ResourceSpecService({
+            "mysql": {"s3-c2-m8": preset},
+            "clickhouse": {"s3-c2-m8": preset, "b2.medium": {"cores": 2, "memory": 4, "core_fraction": 50}},
+            "kafka": {"s3-c2-m8": preset},
+            "mongo": {"s3-c2-m8": preset},
+        })
+
+    def test_tables_compiled(self):
+        assert HOST_SKUS[("mysql", "standard-v2", 5, "cores")] == "dn2ikmrgbcfqnq0e89rh"
+        # Greenplum ignores the core fraction, YDB the platform
+        assert host_sku("greenplum", "standard-v3", 50, "cores") == "dn22vrmol6tmlqmnflh0"
+        assert host_sku("ydb", "standard-v2", 100, "memory") == "dn24ok7m82d8uhe9g725"
+        assert host_sku("mysql", "standard-v3", 5, "cores") is None
+        assert all(role["disk_skus"] for engine in ENGINES.values() for role in engine["roles"])
+
+    def test_mysql(self, resource_spec_service):
+        resource = {
+            "type": "yandex_mdb_mysql_cluster",
+            "name": "db",
+            "values": {
+                "resources": [{"resource_preset_id": "s3-c2-m8", "disk_size": 20, "disk_type_id": "network-ssd"}],
+                "host": [{"assign_public_ip": True}, {}],
+            }
+        }
+        usage_collector = Mock()
+        assert MDBMySQLProcessor(Mock(), resource_spec_service).process(resource, usage_collector) == 0
+        assert usage_calls(usage_collector) == [
+            ("dn2mfa1c935rjc6t4eek", 4), ("dn2nhjlpvll7kron0lv0", 16), ("dn2non93sh0grnlrjb7m", 1), ("dn2j7e6hs2j2ugni50lq", 40)
+        ]
+
+    def test_clickhouse_roles(self, resource_spec_service):
+        resource = {
+            "type": "yandex_mdb_clickhouse_cluster",
+            "name": "ch",
+            "values": {
+                "clickhouse": [{"resources": [{"resource_preset_id": "s3-c2-m8", "disk_size": 100, "disk_type_id": "network-ssd"}]}],
+                "zookeeper": [{"resources": [{"resource_preset_id": "b2.medium", "disk_size": 10, "disk_type_id": "network-hdd"}]}],
+                "host": [{"type": "CLICKHOUSE", "assign_public_ip": True}] + [{"type": "ZOOKEEPER", "assign_public_ip": True}] * 3,
+            }
+        }
+        usage_collector = Mock()
+        MDBClickhouseProcessor(Mock(), resource_spec_service).process(resource, usage_collector)
+        assert usage_calls(usage_collector) == [
+            ("dn2h2fne3qa9bjv2mm0b", 2), ("dn2cvuiesm49elnni1a5", 8),
+            ("dn2b40gt80iuh70kfpqc", 6), ("dn2hhsaqch2o4tkn1qnk", 12),
+            # ZooKeeper hosts get no public IP
+            ("dn2riv150c97qbgpik5k", 1),
+            ("dn2mvvhqdpp24tm36ks4", 100), ("dn2utn4rqnas617dfa2q", 30),
+        ]
+
+    def test_kafka_zookeeper_memory(self, resource_spec_service):
+        resources = [{"resource_preset_id": "s3-c2-m8", "disk_size": 10, "disk_type_id": "network-ssd"}]
+        resource = {
+            "type": "yandex_mdb_kafka_cluster",
+            "name": "kafka",
+            "values": {"config": [{"kafka": [{"resources": resources}], "zookeeper": [{"resources": resources}], "brokers_count": 1}]}
+        }
+        usage_collector = Mock()
+        MDBKafkaProcessor(Mock(), resource_spec_service).process(resource, usage_collector)
+        # ZooKeeper RAM is billed by memory, three hosts
+        assert ("dn2r01fpbih17tae9m00", 24) in usage_calls(usage_collector)
+
+    def test_unknown_preset(self, resource_spec_service):
+        resource = {"type": "yandex_mdb_mysql_cluster", "name": "db", "values": {"resources": [{"resource_preset_id": "unknown"}], "host": [{}]}}
+        usage_collector = Mock()
+        assert MDBMySQLProcessor(Mock(), resource_spec_service).process(resource, usage_collector) == 1
+        usage_collector.add_usage.assert_not_called()
+
+    def test_mongodb_from_descriptor(self, resource_spec_service):
+        resource = {
+            "type": "yandex_mdb_mongodb_cluster",
+            "name": "mongo",
+            "values": {
+                "resources_mongod": [{"resource_preset_id": "s3-c2-m8", "disk_size": 20, "disk_type_id": "network-ssd"}],
+                "host": [{"assign_public_ip": True}, {"type": "MONGOD"}],
+            }
+        }
+        usage_collector = Mock()
+        assert MDBMongoProcessor(Mock(), resource_spec_service).process(resource, usage_collector) == 0
+        assert usage_calls(usage_collector) == [("no_sku_id", 4), ("no_sku_id", 16), ("no_sku_id", 1), ("no_sku_id", 40)]
+        assert engine_sku_ids("mongodb") == set()
@@ -0,0 +1,51 @@
+import logging
+from unittest.mock import Mock
+from core.estimator import TerraformCostEstimator, module_resources
+from service.pricing import PricingService
+from tests.unit.conftest import make_sku
+
+def network(name):
+    return {"type": "yandex_vpc_address", "name": name, "values": {"external_ipv4_address": [{}]}}
+
+class TestModuleResources:
+    def test_plan_order(self):
+        root = {
+            "resources": [network("a")],
+            "child_modules": [
+                {"address": "module.x", "resources": [network("b")], "child_modules": [
+                    {"address": "module.x.module.y", "resources": [network("c")]}
+                ]},
+                {"address": "module.z", "resources": [network("d")]}
+            ]
+        }
+        assert [(address, resource["name"]) for address, resource in module_resources(root)] == [
+            ("", "a"), ("module.x", "b"), ("module.x.module.y", "c"), ("module.z", "d")
+        ]
+
+    def test_deep_nesting(self):
+        root = module = {"resources": []}
+        for depth in range(5000):
+            child = {"address": f"module.m{depth}", "resources": [network("ip")]}
+            module["child_modules"] = [child]
+            module = child
+        assert sum(1 for _ in module_resources(root)) == 5000
+
+    def test_usage_rows_carry_module(self):
+        catalog = {"skus": [make_sku("dn229q5mnmp58t58tfel")]}
+        estimator = TerraformCostEstimator(PricingService(catalog), Mock(), cache_size=0)
+        plan = {"planned_values": {"root_module": {
+            "resources": [network("ip")],
+            "child_modules": [{"address": "module.edge", "resources": [network("ip")]}]
+        }}}
+        rows = estimator.process_plan(plan, True)["planned_usage"]
+        assert [(row["module"], row["resource_name"], row["amount"]) for row in rows] == [("", "ip", 1), ("module.edge", "ip", 1)]
+
+    def test_one_summary_line_per_section(self, caplog):
+        estimator = TerraformCostEstimator(PricingService({"skus": [make_sku("dn229q5mnmp58t58tfel")]}), Mock(), cache_size=0)
+        plan = {"planned_values": {"root_module": {"resources": [
+            network("a"), network("b"), {"type": "yandex_unsupported_resource", "name": "c", "values": {}}
+        ]}}}
+        with caplog.at_level(logging.INFO):
+            estimator.process_plan(plan, False)
+        sections = [record.getMessage() for record in caplog.records if record.getMessage().startswith(("Prior state", "Planned values"))]
+        assert sections == ["Prior state: 0 resources processed", "Planned values: 2 resources processed, ignored types: yandex_unsupported_resource"]
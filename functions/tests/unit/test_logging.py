@@ -0,0 +1,47 @@
+import io
+import logging
+import logging.handlers
+from unittest.mock import Mock
+from processor import base
+from processor.base import ResourceProcessor
+from util import logging as log_config
+
+class TestLogging:
+    def test_values_formatted_only_for_debug(self, monkeypatch):
+        dumps = Mock(return_value="{}")
+        monkeypatch.setattr(base.json, "dumps", dumps)
+        processor = ResourceProcessor(Mock(), Mock())
+        root = logging.getLogger()
+        level = root.level
+        try:
+            root.setLevel(logging.INFO)
+            processor.log_values({"name": "vm"})
+            dumps.assert_not_called()
+            root.setLevel(logging.DEBUG)
+            processor.log_values({"name": "vm"})
+            dumps.assert_called_once()
+        finally:
+            root.setLevel(level)
+
+    def test_queue_handler(self):
+        root = logging.getLogger()
+        handlers, level = list(root.handlers), root.level
+        for handler in handlers:
+            root.removeHandler(handler)
+        stream = io.StringIO()
+        try:
+            log_config.configure_logging(logging.INFO, use_queue=True, stream=stream)
+            assert [type(handler) for handler in root.handlers] == [logging.handlers.QueueHandler]
+            # A second call keeps the running listener
+            log_config.configure_logging(logging.INFO, use_queue=True)
+            assert len(root.handlers) == 1
+            logging.info("queued record")
+            log_config._stop_listener()
+            assert "INFO - queued record" in stream.getvalue()
+        finally:
+            log_config._stop_listener()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            for handler in handlers:
+                root.addHandler(handler)
+            root.setLevel(level)
@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import pytest
+from core import parallel
+from core.estimator import TerraformCostEstimator
+from processor import referenced_sku_ids
+from service.pricing import PricingService
+from service.resource_spec import ResourceSpecService
+from tests.unit.conftest import make_sku
+from util import logging as log_config
+
+FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+def plan_resources(count, offset=0):
+    resources = []
+    for number in range(offset, offset + count):
+        resources.append({
+            "type": "yandex_compute_instance",
+            "name": f"vm-{number % 7}",
+            "values": {
+                "platform_id": ("standard-v3", "standard-v2")[number % 2],
+                "resources": [{"cores": 2 + number % 3, "memory": 0.5 * (number % 5 + 1), "core_fraction": 100, "gpus": 0}],
+                "network_interface": [{"nat": number % 3 == 0}],
+                "boot_disk": [{"initialize_params": [{"size": 20, "type": "network-ssd"}]}]
+            }
+        })
+        resources.append({"type": "yandex_mdb_mysql_cluster", "name": f"db-{number % 3}", "values": {
+            "resources": [{"resource_preset_id": "s2.micro", "disk_size": 10, "disk_type_id": "network-hdd"}],
+            "host": [{"assign_public_ip": True}, {}]
+        }})
+        resources.append({"type": "yandex_unsupported_resource", "name": f"other-{number}", "values": {}})
+    return resources
+
+@pytest.mark.skipif(not parallel.parallel_available(), reason="needs the fork start method")
+class TestParallelEstimator:
+    def make_estimator(self, cache_size=0):
+        catalog = {"skus": [make_sku(sku_id, unit_price=f"{len(sku_id) % 7 + 0.13}") for sku_id in sorted(referenced_sku_ids())]}
+        with open(os.path.join(FUNCTIONS_DIR, "mdb.json")) as f:
+            return TerraformCostEstimator(PricingService(catalog), ResourceSpecService(json.load(f)), cache_size=cache_size)
+
+    @pytest.fixture
+    def estimator(self):
+        return self.make_estimator()
+
+    def test_matches_serial(self, estimator, monkeypatch):
+        monkeypatch.setattr(parallel, "MIN_PARALLEL_RESOURCES", 0)
+        monkeypatch.setattr(parallel, "CHUNK_SIZE", 7)
+        plan = {
+            "prior_state": {"values": {"root_module": {"resources": plan_resources(20)}}},
+            "planned_values": {"root_module": {"resources": plan_resources(30, offset=5), "child_modules": [
+                {"address": "module.app", "resources": plan_resources(10), "child_modules": [
+                    {"address": "module.app.module.db", "resources": plan_resources(4, offset=2)}
+                ]}
+            ]}},
+        }
+
+        serial = estimator.process_plan(plan, True, workers=0)
+        assert estimator.process_plan(plan, True, workers=3) == serial
+        assert serial["planned_usage"]
+        assert {row["module"] for row in serial["planned_usage"]} == {"", "module.app", "module.app.module.db"}
+
+    def test_usage_cache(self, estimator, monkeypatch):
+        monkeypatch.setattr(parallel, "MIN_PARALLEL_RESOURCES", 0)
+        monkeypatch.setattr(parallel, "CHUNK_SIZE", 7)
+        plan = {"planned_values": {"root_module": {"resources": plan_resources(30)}}}
+        serial = estimator.process_plan(plan, True, workers=0)
+
+        cached = self.make_estimator(cache_size=1000)
+        assert cached.process_plan(plan, True, workers=3) == serial
+        misses = cached.usage_cache.misses
+        assert len(cached.usage_cache) > 0
+        # Everything is cached now, no resource is sent to the workers
+        monkeypatch.setattr(parallel.ParallelProcessor, "submit", lambda pool, resources: [] if not resources else pytest.fail("sent to workers"))
+        assert cached.process_plan(plan, True, workers=3) == serial
+        assert cached.usage_cache.misses == misses
+
+    def test_small_plans_stay_serial(self, estimator):
+        assert estimator._use_workers(4, parallel.MIN_PARALLEL_RESOURCES - 1) == 0
+        assert estimator._use_workers(1, parallel.MIN_PARALLEL_RESOURCES) == 0
+        assert estimator._use_workers(4, parallel.MIN_PARALLEL_RESOURCES) == 4
+
+    def test_worker_logs_are_written(self, estimator, monkeypatch, tmp_path):
+        monkeypatch.setattr(parallel, "MIN_PARALLEL_RESOURCES", 0)
+        resources = plan_resources(4)
+        resources.append({"type": "yandex_mdb_mysql_cluster", "name": "db", "values": {
+            "resources": [{"resource_preset_id": "nonexistent-preset", "disk_size": 10, "disk_type_id": "network-hdd"}],
+            "host": [{}]
+        }})
+        root = logging.getLogger()
+        handlers, level = list(root.handlers), root.level
+        for handler in handlers:
+            root.removeHandler(handler)
+        log_path = tmp_path / "estimate.log"
+        try:
+            with open(log_path, "a") as stream:
+                log_config.configure_logging(logging.INFO, use_queue=True, stream=stream)
+                estimator.process_plan({"planned_values": {"root_module": {"resources": resources}}}, False, workers=2)
+                log_config._stop_listener()
+        finally:
+            log_config._stop_listener()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            for handler in handlers:
+                root.addHandler(handler)
+            root.setLevel(level)
+        assert "Preset ID 'nonexistent-preset' not found in service type 'mysql'" in log_path.read_text()
@@ -0,0 +1,212 @@
+import itertools
+import json
+import os
+import processor
+import pytest
+from unittest.mock import Mock
+from core.price_book import build_price_book, resource_type_sku_ids, write_shards
+from processor import processor_classes, referenced_sku_ids
+from processor.base import ResourceProcessor
+from processor.compute import ComputeInstanceProcessor
+from processor.compute_rules import COMPUTE_RULES, DISK_RULES
+from processor.mdb_engine import ENGINES, MDB_DISK_SKUS, MDBClusterProcessor
+from service.resource_spec import ResourceSpecService
+from service.pricing import PricingService
+from service.sku_catalog import ShardedSkuCatalog, load_catalog
+from tests.unit.conftest import make_sku
+
+FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+class LockboxSecretProcessor(ResourceProcessor):
+    resource_types = ("yandex_lockbox_secret",)
+    emitted_sku_ids = ("lockbox-secret-sku",)
+
+
+class ShadowInstanceProcessor(ResourceProcessor):
+    resource_types = ("yandex_compute_instance",)
+    emitted_sku_ids = ("shadow-instance-sku",)
+
+
+def stub_plugins(monkeypatch):
+    """Install a Lockbox plugin and one shadowed by the built-in compute instance processor"""
+    entry_points = {}
+    for resource_type, processor_class in (("yandex_lockbox_secret", LockboxSecretProcessor), ("yandex_compute_instance", ShadowInstanceProcessor)):
+        entry_point = Mock(value=f"tests.unit.test_price_book:{processor_class.__name__}")
+        entry_point.load.return_value = processor_class
+        entry_points[resource_type] = entry_point
+    monkeypatch.setattr(processor, "plugin_entry_points", lambda: entry_points)
+
+def set_path(values, path, value):
+    """Set a value at a get_path key/index path, creating the blocks on the way"""
+    for step, next_step in zip(path, path[1:]):
+        if isinstance(step, int):
+            while len(values) <= step:
+                values.append([] if isinstance(next_step, int) else {})
+        elif step not in values:
+            values[step] = [] if isinstance(next_step, int) else {}
+        values = values[step]
+    if isinstance(path[-1], int):
+        while len(values) <= path[-1]:
+            values.append(None)
+    values[path[-1]] = value
+
+def instance_templates():
+    """Instance blocks for every platform, scheduling, core fraction, GPU count and boot disk type"""
+    for platform_id, preemptible, core_fraction, gpus, disk_type in itertools.product(COMPUTE_RULES, (False, True), (5, 20, 50, 100), (0, 1), DISK_RULES):
+        yield {
+            "platform_id": platform_id,
+            "scheduling_policy": [{"preemptible": preemptible}],
+            "resources": [{"cores": 2, "memory": 4, "core_fraction": core_fraction, "gpus": gpus}],
+            "boot_disk": [{"initialize_params": [{"size": 20, "type": disk_type}]}],
+            "network_interface": [{"nat": True}],
+        }
+
+def mdb_values(descriptor, preset_id, disk_type):
+    """Cluster values with every role of an engine descriptor on one preset and disk type"""
+    values = {}
+    for role in descriptor["roles"]:
+        bases = [values]
+        if role["groups"] is not None:
+            bases = [{} for _ in role["groups"]]
+            for path, base in zip(role["groups"], bases):
+                set_path(values, path, [base])
+        for base in bases:
+            resources = {"resource_preset_id": preset_id, "disk_type_id": disk_type}
+            if role["resources"]:
+                set_path(base, role["resources"], resources)
+            else:
+                base.update(resources)
+            set_path(base, role["disk_size"], 10)
+            if role["hosts"] is not None:
+                base.setdefault("host", []).append({"type": role["host_type"], "assign_public_ip": True})
+            elif not isinstance(role["host_count"], int):
+                set_path(base, role["host_count"], 1)
+            if role["public_ip"] not in (None, "host"):
+                set_path(base, role["public_ip"], True)
+    return values
+
+def sample_resources(processor_class, mdb):
+    """Resources exercising every SKU rule of a processor"""
+    resource_type = processor_class.resource_types[0]
+    if issubclass(processor_class, MDBClusterProcessor):
+        descriptor = ENGINES[processor_class.engine]
+        disk_types = {disk_type for role in descriptor["roles"] for disk_type in MDB_DISK_SKUS[role["disk_skus"]]}
+        for preset_id, disk_type in itertools.product(mdb[descriptor["presets"]], disk_types):
+            yield {"type": resource_type, "name": "db", "values": mdb_values(descriptor, preset_id, disk_type)}
+    elif resource_type == "yandex_compute_instance":
+        for template in instance_templates():
+            yield {"type": resource_type, "name": "vm", "values": template}
+    elif resource_type in ("yandex_compute_instance_group", "yandex_kubernetes_node_group"):
+        for template in instance_templates():
+            yield {"type": resource_type, "name": "group", "values": {"instance_template": [template], "scale_policy": [{"fixed_scale": [{"size": 2}]}]}}
+    elif resource_type in ("yandex_compute_disk", "yandex_compute_filesystem"):
+        for disk_type in DISK_RULES:
+            yield {"type": resource_type, "name": "disk", "values": {"size": 10, "type": disk_type}}
+    elif resource_type == "yandex_kubernetes_cluster":
+        for master in ({"zonal": [{}]}, {"regional": [{}]}):
+            yield {"type": resource_type, "name": "k8s", "values": {"master": [master]}}
+    elif resource_type == "yandex_vpc_address":
+        yield {"type": resource_type, "name": "ip", "values": {"external_ipv4_address": [{}]}}
+    else:
+        pytest.fail(f"No sample resources for {resource_type}")
+
+class TestPriceBook:
+    @pytest.fixture
+    def sample_prices_data(self):
+        return {
+            "skus": [
+                {
+                    "id": sku_id,
+                    "name": f"Test SKU {sku_id}",
+                    "pricingUnit": "hour",
+                    "serviceId": "test-service",
+                    "pricingVersions": [
+                        {
+                            "type": "STREET_PRICE",
+                            "effectiveTime": "2023-01-01T00:00:00Z",
+                            "pricingExpressions": [{"rates": [{"unitPrice": "10.0", "currency": "RUB"}]}]
+                        }
+                    ]
+                }
+                for sku_id in ("test-sku-1", "test-sku-2", "test-sku-3")
+            ]
+        }
+    
+    def test_processor_sku_ids(self):
+        sku_ids = ComputeInstanceProcessor.sku_ids()
+        assert "dn2k3vqlk9snp1jv351u" in sku_ids
+        assert "no_sku_id" not in sku_ids
+        assert sku_ids <= referenced_sku_ids()
+    
+    def test_emitted_skus_in_price_book(self):
+        with open(os.path.join(FUNCTIONS_DIR, "mdb.json")) as f:
+            mdb = json.load(f)
+        price_book = build_price_book({"skus": [make_sku(sku_id) for sku_id in sorted(referenced_sku_ids())]})
+        book_ids = {sku["id"] for sku in price_book["skus"]}
+
+        for processor_class in processor_classes():
+            usage_collector = Mock()
+            processor = processor_class(Mock(), ResourceSpecService(mdb))
+            for resource in sample_resources(processor_class, mdb):
+                processor.process(resource, usage_collector)
+            emitted = {call.args[0] for call in usage_collector.add_usage.call_args_list} - {"no_sku_id"}
+            assert usage_collector.add_usage.called, processor_class.__name__
+            # Declared for the processor's own shard, and kept in the pruned book
+            assert emitted <= resource_type_sku_ids(processor_class.resource_types[0]), processor_class.__name__
+            assert emitted <= book_ids, processor_class.__name__
+
+    def test_build_price_book(self, sample_prices_data):
+        price_book = build_price_book(sample_prices_data, {"test-sku-1", "test-sku-3"})
+        assert [sku["id"] for sku in price_book["skus"]] == ["test-sku-1", "test-sku-3"]
+        assert price_book["skus"][0] == {
+            "id": "test-sku-1",
+            "name": "Test SKU test-sku-1",
+            "pricingUnit": "hour",
+            "pricingVersions": [
+                {
+                    "effectiveTime": "2023-01-01T00:00:00Z",
+                    "pricingExpressions": [{"rates": [{"unitPrice": "10.0", "currency": "RUB"}]}]
+                }
+            ]
+        }
+    
+    def test_missing_sku(self, sample_prices_data):
+        with pytest.raises(ValueError, match="missing from the catalog: unknown-sku"):
+            build_price_book(sample_prices_data, {"test-sku-1", "unknown-sku"})
+
+    def test_catalog_shards(self, tmp_path):
+        catalog = {"skus": [make_sku(sku_id) for sku_id in sorted(referenced_sku_ids())]}
+        manifest = write_shards(catalog, str(tmp_path))
+        assert manifest["resource_types"]["yandex_mdb_mysql_cluster"] == "mdb_mysql"
+
+        sharded = load_catalog(str(tmp_path))
+        assert isinstance(sharded, ShardedSkuCatalog)
+        pricing_service = PricingService(sharded)
+        pricing_service.prepare(["yandex_compute_instance", "unknown_resource"])
+        assert sharded.loaded_shards == {"compute"}
+
+        compute_sku = sorted(resource_type_sku_ids("yandex_compute_instance"))[0]
+        assert pricing_service.get_latest_price(compute_sku) == 1.0
+        assert sharded.loaded_shards == {"compute"}
+        # A SKU outside the prepared shards still resolves, loading its shard
+        mysql_sku = sorted(resource_type_sku_ids("yandex_mdb_mysql_cluster") - resource_type_sku_ids("yandex_compute_instance"))[0]
+        assert pricing_service.get_latest_price(mysql_sku) == 1.0
+        assert "mdb_mysql" in sharded.loaded_shards
+        assert pricing_service.get_latest_price("unknown-sku") == 0
+
+    def test_plugin_skus(self, monkeypatch, tmp_path):
+        stub_plugins(monkeypatch)
+        sku_ids = referenced_sku_ids()
+        assert "lockbox-secret-sku" in sku_ids
+        # Built-in processors win, the SKUs of a shadowed plugin are not needed
+        assert "shadow-instance-sku" not in sku_ids
+
+        catalog = {"skus": [make_sku(sku_id) for sku_id in sorted(sku_ids)]}
+        assert "lockbox-secret-sku" in {sku["id"] for sku in build_price_book(catalog)["skus"]}
+
+        manifest = write_shards(catalog, str(tmp_path))
+        assert manifest["resource_types"]["yandex_lockbox_secret"] == "plugins"
+        assert manifest["skus"]["lockbox-secret-sku"] == "plugins"
+        pricing_service = PricingService(load_catalog(str(tmp_path)))
+        pricing_service.prepare(["yandex_lockbox_secret"])
+        assert pricing_service.get_latest_price("lockbox-secret-sku") == 1.0
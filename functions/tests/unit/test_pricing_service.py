@@ -1,5 +1,5 @@
 import pytest
-from service.pricing import PricingService
+from service.pricing import PricingService, parse_timestamp
 
 class TestPricingService:
     @pytest.fixture
@@ -48,3 +48,44 @@ class TestPricingService:
         assert service.get_latest_price("nonexistent") == 0
         assert service.get_sku_name("nonexistent") == 0
         assert service.get_sku_unit("nonexistent") == 0
+    
+    def test_latest_version_is_indexed(self, sample_prices_data):
+        sample_prices_data["skus"][0]["pricingVersions"].append({
+            "effectiveTime": "2024-01-01T00:00:00Z",
+            "pricingExpressions": [{"rates": [{"unitPrice": "12.5"}]}]
+        })
+        service = PricingService(sample_prices_data)
+        assert service.get_latest_price("test-sku-1") == 12.5
+        assert service.index_build_time >= 0
+    
+    def test_unknown_sku_is_cached(self, sample_prices_data):
+        service = PricingService(sample_prices_data)
+        service.get_latest_price("no_sku_id")
+        service.get_sku_name("no_sku_id")
+        assert "no_sku_id" in service._missing
+        assert "no_sku_id" not in service._index
+    
+    def test_price_as_of(self, sample_prices_data):
+        sample_prices_data["skus"][0]["pricingVersions"].append({
+            "effectiveTime": "2999-01-01T00:00:00Z",
+            "pricingExpressions": [{"rates": [{"unitPrice": "20.0"}]}]
+        })
+        service = PricingService(sample_prices_data)
+        # Scheduled price is not effective yet
+        assert service.get_latest_price("test-sku-1") == 10.0
+        assert service.get_latest_price("test-sku-1", parse_timestamp("2999-06-01T00:00:00Z")) == 20.0
+        assert service.get_latest_price("test-sku-1", parse_timestamp("2022-01-01T00:00:00Z")) == 0
+    
+    def test_tiered_cost(self, sample_prices_data):
+        sample_prices_data["skus"][0]["pricingVersions"][0]["pricingExpressions"][0]["rates"] = [
+            {"startPricingQuantity": "100", "unitPrice": "1.0"},
+            {"startPricingQuantity": "0", "unitPrice": "0"},
+            {"startPricingQuantity": "10", "unitPrice": "2.0"}
+        ]
+        service = PricingService(sample_prices_data)
+        assert service.get_cost("test-sku-1", 5) == 0
+        assert service.get_cost("test-sku-1", 50) == 80.0
+        assert service.get_cost("test-sku-1", 150) == 230.0
+        # Tiers apply to the total, not to each amount
+        assert service.get_costs("test-sku-1", [25, 25]) == [40.0, 40.0]
+        assert service.get_costs("nonexistent", [1, 2]) == [0, 0]
@@ -0,0 +1,34 @@
+import processor
+from processor import ProcessorRegistry
+from processor.base import ResourceProcessor
+from processor.compute import ComputeInstanceProcessor
+from unittest.mock import Mock
+
+class LockboxSecretProcessor(ResourceProcessor):
+    resource_types = ("yandex_lockbox_secret",)
+
+
+class TestProcessorRegistry:
+    def test_dispatch_by_resource_type(self):
+        registry = ProcessorRegistry(Mock(), Mock())
+        assert isinstance(registry.get_processor("yandex_compute_instance"), ComputeInstanceProcessor)
+        assert registry.get_processor("yandex_compute_instance") is registry.get_processor("yandex_compute_instance")
+        assert "processor.database" not in registry._loaded_modules
+
+    def test_plugin_entry_points(self, monkeypatch):
+        entry_point = Mock(value="tests.unit.test_processor_registry:LockboxSecretProcessor")
+        entry_point.load.return_value = LockboxSecretProcessor
+        scans = []
+        def plugin_entry_points():
+            scans.append(1)
+            return {"yandex_lockbox_secret": entry_point}
+        monkeypatch.setattr(processor, "plugin_entry_points", plugin_entry_points)
+
+        registry = ProcessorRegistry(Mock(), Mock())
+        assert registry.get_processor("yandex_vpc_network") is None
+        assert isinstance(registry.get_processor("yandex_lockbox_secret"), LockboxSecretProcessor)
+        assert entry_point.load.call_count == 1
+        # Entry points are scanned once, unsupported types are cached as misses
+        assert registry.get_processor("yandex_vpc_network") is None
+        assert registry.get_processor("yandex_lockbox_secret") is registry.get_processor("yandex_lockbox_secret")
+        assert len(scans) == 1
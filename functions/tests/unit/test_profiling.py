@@ -0,0 +1,40 @@
+import pstats
+import re
+import threading
+import time
+from unittest.mock import Mock
+from core.estimator import TerraformCostEstimator
+from service.pricing import PricingService
+from tests.unit.conftest import make_sku
+from util.profiling import StackSampler, pricing_calls, profile_plan
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+class TestProfiling:
+    def test_profile_plan(self, tmp_path):
+        estimator = TerraformCostEstimator(PricingService({"skus": [make_sku("dn229q5mnmp58t58tfel")]}), Mock(), cache_size=0)
+        plan = {"planned_values": {"root_module": {"resources": [
+            {"type": "yandex_vpc_address", "name": f"ip-{number}", "values": {"external_ipv4_address": [{}]}} for number in range(50)
+        ]}}}
+        prefix = str(tmp_path / "estimate")
+
+        result = profile_plan(estimator, prefix, plan, True)
+        assert result == estimator.process_plan(plan, True)
+        assert estimator.processor_timings is None
+
+        stats = pstats.Stats(f"{prefix}.pstats")
+        assert "get_cost" in {function for function, _, _ in pricing_calls(stats)}
+        with open(f"{prefix}.folded") as f:
+            assert all(re.fullmatch(r".+ \d+\n", line) for line in f)
+
+    def test_stack_sampler(self):
+        sampler = StackSampler(threading.get_ident(), interval=0.001)
+        sampler.start()
+        busy(0.1)
+        sampler.stop()
+        # A few samples may land in start() or stop(), most are in the busy loop
+        stack, _ = sampler.stacks.most_common(1)[0]
+        assert stack.split(";")[-1].startswith("busy (test_profiling.py")
@@ -0,0 +1,52 @@
+import pytest
+from service.pricing import PricingService
+from service.sku_catalog import MappedSkuCatalog, compile_catalog, load_catalog
+
+class TestMappedSkuCatalog:
+    @pytest.fixture
+    def sample_prices_data(self):
+        return {
+            "skus": [
+                {
+                    "id": sku_id,
+                    "name": f"Test SKU {sku_id}",
+                    "pricingUnit": "core*hour",
+                    "pricingVersions": [
+                        {
+                            "effectiveTime": "2023-01-01T00:00:00Z",
+                            "pricingExpressions": [{"rates": [{"unitPrice": price}]}]
+                        }
+                    ]
+                }
+                for sku_id, price in (("sku-b", "2.5"), ("sku-a", "1.0"), ("sku-c", "0.25"))
+            ]
+        }
+    
+    @pytest.fixture
+    def catalog_path(self, sample_prices_data, tmp_path):
+        path = tmp_path / "sku.bin"
+        compile_catalog(sample_prices_data, str(path))
+        return str(path)
+    
+    def test_get(self, catalog_path, sample_prices_data):
+        catalog = MappedSkuCatalog(catalog_path)
+        assert len(catalog) == 3
+        for sku in sample_prices_data["skus"]:
+            assert catalog.get(sku["id"]) == sku
+        assert catalog.get("sku-0") is None
+        assert catalog.get("sku-d") is None
+        catalog.close()
+    
+    def test_load_catalog_detects_format(self, catalog_path, tmp_path):
+        assert isinstance(load_catalog(catalog_path), MappedSkuCatalog)
+        
+        json_path = tmp_path / "sku.json"
+        json_path.write_text('{"skus": []}')
+        assert load_catalog(str(json_path)) == {"skus": []}
+    
+    def test_pricing_service_backend(self, catalog_path):
+        service = PricingService(load_catalog(catalog_path))
+        assert service.get_latest_price("sku-b") == 2.5
+        assert service.get_sku_name("sku-c") == "Test SKU sku-c"
+        assert service.get_sku_unit("sku-a") == "core*hour"
+        assert service.get_latest_price("no_sku_id") == 0
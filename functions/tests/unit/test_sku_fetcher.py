@@ -0,0 +1,145 @@
+import json
+import os
+import pytest
+import requests
+import time
+from core.sku_fetcher import RetryPolicy, SkuFetcher, diff_skus
+from tests.unit.conftest import FakeBillingApi, make_sku
+
+class TestSkuFetcher:
+    def test_fetch_all_skus(self, billing_api, tmp_path):
+        output = tmp_path / "sku.json"
+        fetcher = SkuFetcher("test-token", billing_api.url)
+        stats = fetcher.fetch_all_skus(str(output))
+
+        assert (stats.pages, stats.skus) == (3, 5)
+        assert stats.bytes > 0
+        assert len(billing_api.requests) == 3
+        # Pages are streamed to the file, which holds the same SKUs as the API
+        with open(output) as f:
+            assert json.load(f) == {"skus": billing_api.skus}
+        assert fetcher.fetch_skus() == billing_api.skus
+
+    def test_connection_reused(self, billing_api, tmp_path):
+        SkuFetcher("test-token", billing_api.url).fetch_all_skus(str(tmp_path / "sku.json"))
+        assert len(billing_api.connections) == 1
+
+    def test_diff_skus(self):
+        old = [make_sku("kept"), make_sku("removed"), make_sku("repriced")]
+        new = [make_sku("kept"), make_sku("repriced", unit_price="2.0"), make_sku("added")]
+
+        changes = diff_skus(old, new)
+        assert changes.to_dict() == {"added": ["added"], "removed": ["removed"], "repriced": ["repriced"]}
+        assert not diff_skus(old, old)
+
+    def test_refresh_writes_only_on_change(self, billing_api, tmp_path):
+        output = str(tmp_path / "sku.json")
+        fetcher = SkuFetcher("test-token", billing_api.url)
+
+        _, changes = fetcher.refresh(output)
+        assert len(changes.added) == 5
+
+        # Nothing changed: the snapshot must not be touched
+        os.utime(output, ns=(0, 0))
+        _, changes = fetcher.refresh(output)
+        assert not changes
+        assert os.stat(output).st_mtime_ns == 0
+
+        billing_api.skus[1] = make_sku("test-sku-1", unit_price="3.0")
+        del billing_api.skus[4]
+        _, changes = fetcher.refresh(output)
+        assert changes.to_dict() == {"added": [], "removed": ["test-sku-4"], "repriced": ["test-sku-1"]}
+        assert os.stat(output).st_mtime_ns != 0
+        assert os.listdir(tmp_path) == ["sku.json"]
+
+    def test_retry_transient_errors(self, billing_api, tmp_path):
+        billing_api.failures["2"] = [503, 429]
+        retry = RetryPolicy(base_delay=0.001, seed=1)
+        stats = SkuFetcher("test-token", billing_api.url, retry).fetch_all_skus(str(tmp_path / "sku.json"))
+
+        assert stats.skus == 5
+        assert len(billing_api.requests) == 5
+
+    def test_client_errors_are_not_retried(self, billing_api):
+        fetcher = SkuFetcher("wrong-token", billing_api.url, RetryPolicy(base_delay=0.001))
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch_skus()
+        assert len(billing_api.requests) == 1
+
+    def test_resume_from_checkpoint(self, billing_api, tmp_path):
+        output = str(tmp_path / "sku.json")
+        billing_api.failures["4"] = [500] * 3
+        fetcher = SkuFetcher("test-token", billing_api.url, RetryPolicy(attempts=3, base_delay=0.001))
+        with pytest.raises(requests.HTTPError):
+            fetcher.refresh(output)
+        assert not os.path.exists(output)
+        assert os.path.exists(output + ".checkpoint")
+
+        # The restart asks only for the page that failed
+        billing_api.requests.clear()
+        _, changes = fetcher.refresh(output)
+        assert billing_api.requests == ["/billing/v1/skus?pageToken=4"]
+        assert len(changes.added) == 5
+        with open(output) as f:
+            assert json.load(f) == {"skus": billing_api.skus}
+        assert os.listdir(tmp_path) == ["sku.json"]
+
+    def test_retry_budget(self, billing_api):
+        billing_api.failures["0"] = [503] * 100
+        fetcher = SkuFetcher("test-token", billing_api.url, RetryPolicy(attempts=100, base_delay=0.05, budget=0.2))
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch_skus()
+        assert 1 < len(billing_api.requests) < 100
+
+    def test_partitioned_download(self, tmp_path):
+        skus = [make_sku(f"test-sku-{i}", service_id=f"service-{i % 4}") for i in range(24)]
+        # Listed under two services, must be kept once
+        skus.append(make_sku("test-sku-0", service_id="service-3"))
+        api = FakeBillingApi(skus, latency=0.05)
+        api.start()
+        try:
+            started = time.perf_counter()
+            SkuFetcher("test-token", api.url).fetch_all_skus(str(tmp_path / "serial.json"))
+            serial_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            fetcher = SkuFetcher("test-token", api.url, workers=4)
+            stats = fetcher.fetch_all_skus(str(tmp_path / "parallel.json"))
+            parallel_time = time.perf_counter() - started
+        finally:
+            api.stop()
+
+        with open(tmp_path / "parallel.json") as f:
+            merged = json.load(f)["skus"]
+        assert sorted(sku["id"] for sku in merged) == sorted(f"test-sku-{i}" for i in range(24))
+        # Three pages per service, four for the one with the duplicate
+        assert stats.pages == 13
+        assert parallel_time < serial_time * 0.7
+        assert sorted(os.listdir(tmp_path)) == ["parallel.json", "serial.json"]
+
+    def test_partitioned_resume(self, tmp_path):
+        # Three pages of service-0, one page of each other service
+        skus = [make_sku(f"test-sku-{i}", service_id=f"service-{max(0, i // 2 - 2)}") for i in range(12)]
+        api = FakeBillingApi(skus)
+        api.start()
+        try:
+            output = str(tmp_path / "sku.json")
+            # The third page of service-0 fails every attempt
+            api.failures["4"] = [500] * 3
+            fetcher = SkuFetcher("test-token", api.url, RetryPolicy(attempts=3, base_delay=0.001), workers=4)
+            with pytest.raises(requests.HTTPError):
+                fetcher.fetch_all_skus(output)
+            assert not os.path.exists(output)
+
+            # Finished partitions are kept, the failed one restarts at its failed page
+            api.requests.clear()
+            stats = fetcher.fetch_all_skus(output)
+            sku_requests = [path for path in api.requests if path.startswith("/billing/v1/skus")]
+            assert len(sku_requests) == 1 and sku_requests[0].endswith("pageToken=4")
+            assert stats.pages == 1
+        finally:
+            api.stop()
+
+        with open(output) as f:
+            assert sorted(sku["id"] for sku in json.load(f)["skus"]) == sorted(sku["id"] for sku in skus)
+        assert os.listdir(tmp_path) == ["sku.json"]
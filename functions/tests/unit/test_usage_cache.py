@@ -0,0 +1,67 @@
+from unittest.mock import Mock
+from core.estimator import TerraformCostEstimator
+from model.usage_cache import UsageCache, resource_fingerprint
+from service.pricing import PricingService
+from tests.unit.conftest import make_sku
+
+def instance(name, cores=2):
+    return {
+        "type": "yandex_compute_instance",
+        "name": name,
+        "values": {
+            "platform_id": "standard-v3",
+            "resources": [{"cores": cores, "memory": 4, "core_fraction": 100, "gpus": 0}],
+            "network_interface": [{"nat": True}],
+            "boot_disk": [{"initialize_params": [{"size": 20, "type": "network-ssd"}]}]
+        }
+    }
+
+def plan(*resources):
+    return {"planned_values": {"root_module": {"resources": list(resources)}}}
+
+class TestUsageCache:
+    def test_fingerprint(self):
+        resource = instance("vm")
+        reordered = dict(resource, values=dict(reversed(list(resource["values"].items()))))
+        assert resource_fingerprint(resource) == resource_fingerprint(reordered)
+        # The name is not part of the fingerprint, the values and the version are
+        assert resource_fingerprint(resource) == resource_fingerprint(instance("other"))
+        assert resource_fingerprint(resource) != resource_fingerprint(instance("vm", cores=4))
+        assert resource_fingerprint(resource, "v1") != resource_fingerprint(resource, "v2")
+
+    def test_lru(self):
+        cache = UsageCache(max_size=2)
+        cache.put("a", [("sku", 1)])
+        cache.put("b", [("sku", 2)])
+        assert cache.get("a") == (("sku", 1),)
+        cache.put("c", [("sku", 3)])
+        assert cache.get("b") is None
+        assert cache.stats() == {"size": 2, "max_size": 2, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_estimator_skips_repeat_resources(self, monkeypatch):
+        catalog = {"skus": [make_sku(sku_id) for sku_id in ("dn2k3vqlk9snp1jv351u", "dn2ilq72mjc3bej6j74p", "dn27ajm6m8mnfcshbi61", "dn229q5mnmp58t58tfel")]}
+        estimator = TerraformCostEstimator(PricingService(catalog), Mock(), catalog_version="v1")
+        uncached = TerraformCostEstimator(PricingService(catalog), Mock(), cache_size=0)
+        tf_plan = plan(instance("vm-1"), instance("vm-2"), instance("vm-3", cores=4))
+
+        expected = uncached.process_plan(tf_plan, True)
+        assert estimator.process_plan(tf_plan, True) == expected
+        assert (estimator.usage_cache.hits, estimator.usage_cache.misses) == (1, 2)
+
+        processor = estimator.processor_registry.get_processor("yandex_compute_instance")
+        monkeypatch.setattr(processor, "process", Mock(side_effect=AssertionError("processed again")))
+        assert estimator.process_plan(tf_plan, True) == expected
+        assert estimator.usage_cache.hits == 4
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "usage_cache.json")
+        cache = UsageCache(version="v1")
+        cache.put("key", [("sku", 1.5)])
+        cache.save(path)
+
+        assert UsageCache(version="v1").load(path) == 1
+        loaded = UsageCache(version="v1")
+        loaded.load(path)
+        assert loaded.get("key") == (("sku", 1.5),)
+        # Entries of another catalog version are never used
+        assert UsageCache(version="v2").load(path) == 0
@@ -1,4 +1,5 @@
 import pytest
+import tracemalloc
 from model.usage import UsageCollector
 from unittest.mock import Mock
 
@@ -9,6 +10,8 @@ class TestUsageCollector:
         mock.get_sku_name.return_value = "Test SKU"
         mock.get_sku_unit.return_value = "hour"
         mock.get_latest_price.return_value = 10.0
+        mock.get_cost.side_effect = lambda sku_id, quantity, as_of=None: quantity * 10.0
+        mock.get_costs.side_effect = lambda sku_id, amounts, as_of=None: [amount * 10.0 for amount in amounts]
         return mock
     
     def test_add_usage(self, pricing_service_mock):
@@ -45,9 +48,44 @@ class TestUsageCollector:
         total = collector.calculate_total()
         assert total == 80.0  # (5 + 3) * 10.0
     
+    def test_summary_is_computed_once(self, pricing_service_mock):
+        collector = UsageCollector(pricing_service_mock)
+        collector.add_usage("test-sku", 5, "test-resource", "test-type")
+        collector.add_usage("test-sku", 3, "test-resource", "test-type")
+        
+        collector.get_usage()
+        collector.print_usage()
+        assert collector.calculate_total() == 80.0
+        assert pricing_service_mock.get_cost.call_count == 1
+        # Rows of the same SKU and resource are aggregated
+        assert collector.get_usage()[0]["amount"] == 8
+        
+        collector.add_usage("test-sku", 2, "other-resource", "test-type")
+        assert collector.calculate_total() == 100.0
+        assert len(collector.get_usage()) == 2
+    
     def test_clear(self, pricing_service_mock):
         collector = UsageCollector(pricing_service_mock)
         collector.add_usage("test-sku", 5, "test-resource", "test-type")
         collector.clear()
         
         assert len(collector.usage) == 0
+    
+    def test_memory_per_row(self, pricing_service_mock):
+        rows = 100000
+        # Resource names come from the plan and are already in memory
+        names = [f"test-resource-{i // 5}" for i in range(rows)]
+        collector = UsageCollector(pricing_service_mock)
+        
+        tracemalloc.start()
+        try:
+            for i in range(rows):
+                collector.add_usage(f"test-sku-{i % 7}", i % 64, names[i], "yandex_kubernetes_node_group")
+            used, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        # Every row here is its own (sku, resource) group, the worst case for the
+        # running aggregate; 500k rows per state must stay under the 128 MB of the Cloud Function
+        assert used / rows < 192
+        assert collector.usage[rows - 1]["resource_name"] == names[-1]
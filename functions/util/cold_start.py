@@ -0,0 +1,39 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+# Set COLD_START_TIMING=1 to log how long each cold start stage took
+ENABLED = os.environ.get("COLD_START_TIMING", "").lower() in ("1", "true")
+
+# Per-stage budget in milliseconds, tests/unit/test_cold_start.py and `benchmark.py cold-start` fail when a stage exceeds it
+BUDGET_MS = {
+    "import": 150,
+    "catalog_load": 250,
+    "first_estimate": 250,
+}
+
+_stages = {}
+
+def record(stage, seconds):
+    """Record the duration of a cold start stage, only the first measurement counts"""
+    if stage in _stages:
+        return
+    _stages[stage] = elapsed_ms = seconds * 1000
+    if ENABLED:
+        budget = BUDGET_MS.get(stage)
+        level = logging.WARNING if budget is not None and elapsed_ms > budget else logging.INFO
+        logging.log(level, f"Cold start: {stage} took {elapsed_ms:.1f} ms (budget {budget} ms)")
+
+@contextmanager
+def measure(stage):
+    """Time a block as a cold start stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+def stages():
+    """Get the recorded stage durations in milliseconds"""
+    return dict(_stages)
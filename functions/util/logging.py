@@ -1,9 +1,62 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 
-def configure_logging(level=logging.INFO):
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Records are written by a background thread, LOG_QUEUE=0 writes them from the calling thread
+USE_QUEUE = os.environ.get("LOG_QUEUE", "1") != "0"
+
+# Listener writing queued records, one per process
+_listener = None
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        # Writes the records still queued before the process exits
+        _listener.stop()
+        _listener = None
+
+def configure_logging(level=logging.INFO, use_queue=None, stream=None):
     """Configure logging for the application"""
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    return logging.getLogger()
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return root
+    if use_queue is None:
+        use_queue = USE_QUEUE
+    if not use_queue:
+        logging.basicConfig(level=level, format=LOG_FORMAT, stream=stream)
+        return root
+
+    # Handlers installed by the runtime are kept, they are moved behind the queue
+    handlers = list(root.handlers)
+    if not handlers:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(handler)
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    records = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+    return root
+
+def configure_forked_logging():
+    """Write records of a forked process directly, the queue listener thread of the parent isn't running in it"""
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    # The listener object is a copy of the parent's, there is nothing to stop here
+    _listener = None
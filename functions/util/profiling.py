@@ -0,0 +1,111 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Set ESTIMATOR_PROFILE=1 to profile every estimate of the Cloud Function
+ENABLED = os.environ.get("ESTIMATOR_PROFILE", "").lower() in ("1", "true")
+# Directory the handler writes profiles to, the temporary directory by default
+OUTPUT_DIR = os.environ.get("ESTIMATOR_PROFILE_DIR")
+# Seconds between stack samples, the GIL switch interval makes the effective interval at least 5 ms
+SAMPLE_INTERVAL = float(os.environ.get("ESTIMATOR_PROFILE_INTERVAL", "0.001"))
+# Source file of the pricing calls reported separately
+PRICING_MODULE = os.path.join("service", "pricing.py")
+
+class ProcessorTimings:
+    """Wall time spent on resources, per processor class"""
+
+    def __init__(self):
+        self.resources = Counter()
+        self.seconds = Counter()
+
+    def add(self, processor, seconds):
+        name = type(processor).__name__
+        self.resources[name] += 1
+        self.seconds[name] += seconds
+
+
+class StackSampler:
+    """Samples the stack of one thread in the background, counted as collapsed stacks for flamegraphs"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def write(self, path):
+        """Write 'frame;frame;frame count' lines, the input of flamegraph.pl and speedscope"""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def pricing_calls(stats):
+    """Get (function, calls, cumulative seconds) of the pricing service from pstats, slowest first"""
+    calls = [
+        (function, call_count, cumulative)
+        for (filename, _, function), (_, call_count, _, cumulative, _) in stats.stats.items()
+        if filename.endswith(PRICING_MODULE)
+    ]
+    return sorted(calls, key=lambda call: call[2], reverse=True)
+
+def default_prefix():
+    """Output path prefix of a handler profile, unique per estimate"""
+    import tempfile
+    return os.path.join(OUTPUT_DIR or tempfile.gettempdir(), f"estimate-{time.time_ns() // 1000000}")
+
+def profile_plan(estimator, output_prefix, tf_plan, param_full, as_of=None):
+    """Estimate a plan under cProfile and the stack sampler, write <prefix>.pstats and <prefix>.folded"""
+    # Only needed when profiling, kept out of the handler import path
+    import cProfile
+    import pstats
+
+    timings = ProcessorTimings()
+    sampler = StackSampler(threading.get_ident())
+    profiler = cProfile.Profile()
+    estimator.processor_timings = timings
+    started = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        # Worker processes are not profiled, the serial path keeps all time attributable
+        result = estimator.process_plan(tf_plan, param_full, as_of, workers=0)
+    finally:
+        profiler.disable()
+        sampler.stop()
+        estimator.processor_timings = None
+    elapsed = time.perf_counter() - started
+
+    profiler.dump_stats(f"{output_prefix}.pstats")
+    sampler.write(f"{output_prefix}.folded")
+    stats = pstats.Stats(profiler)
+
+    logging.info(f"Profile: estimate took {elapsed * 1000:.1f} ms, {sum(sampler.stacks.values())} stack samples, "
+                 f"saved to {output_prefix}.pstats and {output_prefix}.folded")
+    for name, seconds in timings.seconds.most_common():
+        logging.info(f"Profile: {name} {timings.resources[name]} resources, {seconds * 1000:.1f} ms")
+    for function, call_count, cumulative in pricing_calls(stats)[:10]:
+        logging.info(f"Profile: pricing {function} {call_count} calls, {cumulative * 1000:.1f} ms")
+    return result
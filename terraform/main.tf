@@ -2,7 +2,22 @@
 data "archive_file" "function" {
   type        = "zip"
   source_dir  = "${path.module}/../functions"
+  # The function ships a prebuilt catalog instead of the full sku.json, build one before deploying:
+  #   python get-sku.py --price-book price_book.json  (or --compile sku.bin, --shards catalog_shards)
+  # Spools and checkpoints of interrupted downloads, sku.json.N.* for each partition of `--workers` downloads
+  excludes    = ["sku.json", "sku.json.*"]
   output_path = "${path.module}/functions.zip"
+
+  lifecycle {
+    precondition {
+      condition = anytrue([
+        fileexists("${path.module}/../functions/price_book.json"),
+        fileexists("${path.module}/../functions/sku.bin"),
+        fileexists("${path.module}/../functions/catalog_shards/manifest.json"),
+      ])
+      error_message = "No prebuilt SKU catalog in functions/: run `python get-sku.py --price-book price_book.json` there before deploying, sku.json is not shipped."
+    }
+  }
 }
 
 resource "random_string" "suffix" {
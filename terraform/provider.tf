@@ -1,8 +1,16 @@
 terraform {
+  # Preconditions on data sources
+  required_version = ">= 1.2"
+
   required_providers {
     yandex = {
       source = "yandex-cloud/yandex"
     }
+    # Glob patterns in archive_file excludes
+    archive = {
+      source  = "hashicorp/archive"
+      version = ">= 2.4"
+    }
   }
 }
 